@@ -0,0 +1,51 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.offload import run_io
+from app.engine.anchor.anchor_log import get_anchor_log
+
+router = APIRouter(tags=["anchors"])
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+@router.get("")
+async def list_anchors(
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    min_height: Optional[int] = Query(None, ge=0),
+    max_height: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Recorded Merkle root anchors, oldest first.
+    - since / until: inclusive anchor timestamp bounds
+    - min_height / max_height: inclusive bounds on the anchored tree size
+    """
+    log = get_anchor_log()
+    anchors = await run_io(
+        log.query,
+        since=since,
+        until=until,
+        min_height=min_height,
+        max_height=max_height,
+        offset=offset,
+        limit=limit + 1,
+    )
+    more = len(anchors) > limit
+    return {
+        "total": len(log),
+        "anchors": anchors[:limit],
+        "next_offset": offset + limit if more else None,
+    }
+
+
+@router.get("/latest")
+async def latest_anchor():
+    anchor = await run_io(get_anchor_log().latest)
+    if anchor is None:
+        raise HTTPException(status_code=404, detail="No anchors recorded")
+    return anchor
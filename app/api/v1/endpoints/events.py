@@ -1,43 +1,21 @@
 # app/api/v1/endpoints/events.py
 
-import hashlib
-import uuid
-from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, HTTPException
-from nacl.signing import SigningKey
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from app.engine.state.event_chain import get_latest_hash, store_event
-from app.engine.validation.hash_validation import (
-    canonical_json_bytes,
-    filtered_for_hash,
-)
-from app.engine.validation.validator import EventValidator
+from app.core import config
+from app.core.offload import run_io
+from app.engine.ingest.pipeline import EventRejected, get_pipeline
 
 # Optional DB persistence helper (if available)
 try:
-    from app.db.event_db import add_event_db as store_event_db
+    from app.db.event_db import add_events_db as store_events_db
 except Exception:
-    try:
-        from app.db.event_db import store_event_db
-    except Exception:
-        store_event_db = None
+    store_events_db = None
 
 router = APIRouter()
-validator = EventValidator()
-
-
-# -------------------------------------------------------------------
-# Load signing key (hex-encoded Ed25519 private key)
-# -------------------------------------------------------------------
-def load_private_key(path="data/keys/truetrace_priv.bin") -> SigningKey:
-    try:
-        with open(path, "rb") as f:
-            return SigningKey(f.read())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to load private key: {e}")
 
 
 class CreateEventRequest(BaseModel):
@@ -45,78 +23,123 @@ class CreateEventRequest(BaseModel):
     payload: Dict[str, Any]
 
 
+class CreateEventBatchRequest(BaseModel):
+    # items are checked one by one so a malformed item is reported, not a 422
+    events: List[Dict[str, Any]]
+    atomic: bool = False
+
+
 @router.post("/create")
-def create_event(req: CreateEventRequest):
+async def create_event(req: CreateEventRequest):
     """
     Create a version 1.5 TrueTrace event with:
       - SHA256 canonical hash
       - Ed25519 signature (HEX)
       - Ed25519 public key (HEX)
-    """
-
-    # 1) Build base event (unsigned)
-    event_id = f"evt-{uuid.uuid4().hex[:12]}"
-    timestamp = int(datetime.now(timezone.utc).timestamp())
-    prev_hash = get_latest_hash() or ""
-
-    base_event = {
-        "event_id": event_id,
-        "event_version": "1.5",
-        "timestamp": timestamp,
-        "event_type": req.event_type,
-        "payload": req.payload,
-        "prev_hash": prev_hash,
-        "origin": "system",
-        "trace_id": uuid.uuid4().hex,
-    }
-
-    # 2) Prepare object for hashing
-    filtered = filtered_for_hash(base_event)
 
-    # 3) Canonical JSON → hash
-    canonical_bytes = canonical_json_bytes(filtered)
-    event_hash = hashlib.sha256(canonical_bytes).hexdigest()
+    The event is chained, signed and written by the ingestion pipeline's
+    single writer, batched with whatever else arrived at the same time.
+    """
+    try:
+        index, full_event = await get_pipeline().submit(
+            req.event_type, req.payload, indexed=True
+        )
+    except EventRejected as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": str(e),
+                "errors": e.errors,
+                "computed_hash": e.computed_hash,
+            },
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chain store failed: {e}")
 
-    # 4) Build full event
-    full_event = dict(filtered)
-    full_event["hash"] = event_hash
+    await _store_events_db([(index, full_event)])
+    return {"status": "created", "event": full_event}
 
-    # 5) Sign canonical bytes using Ed25519 (HEX)
-    try:
-        signing_key = load_private_key()
-        signature = signing_key.sign(canonical_bytes).signature.hex()
-        pubkey = signing_key.verify_key.encode().hex()
 
-        full_event["signature"] = signature
-        full_event["pubkey"] = pubkey
+@router.post("/batch")
+async def create_events_batch(req: CreateEventBatchRequest):
+    """
+    Create many events in one call.
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Signing failed: {e}")
+    Items are chained in request order and written as a single append group.
+    Each item reports "created" (with its event) or "rejected" (with errors).
+    With atomic=true any rejection writes nothing and the call fails with 400.
+    """
+    if len(req.events) > config.INGEST_MAX_REQUEST_EVENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"batch too large: max {config.INGEST_MAX_REQUEST_EVENTS} events",
+        )
 
-    # 6) Validate final event (hash + signature)
-    is_valid, result = validator.validate(full_event)
-    if not is_valid:
+    results: List[Dict[str, Any]] = [{} for _ in req.events]
+    items = []
+    positions = []
+    for i, raw in enumerate(req.events):
+        try:
+            item = CreateEventRequest.model_validate(raw)
+        except ValidationError as e:
+            results[i] = {
+                "index": i,
+                "status": "rejected",
+                "errors": [
+                    f"invalid_item:{'.'.join(map(str, err['loc']))}:{err['msg']}"
+                    for err in e.errors()
+                ],
+            }
+            continue
+        items.append((item.event_type, item.payload))
+        positions.append(i)
+
+    if req.atomic and len(items) < len(req.events):
+        outcomes = []
+    else:
+        try:
+            outcomes = await get_pipeline().submit_many(
+                items, atomic=req.atomic, indexed=True
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Chain store failed: {e}")
+
+    created = []
+    for i, (chain_index, outcome) in zip(positions, outcomes):
+        if isinstance(outcome, EventRejected):
+            results[i] = {"index": i, "status": "rejected", "errors": outcome.errors}
+        else:
+            results[i] = {"index": i, "status": "created", "event": outcome}
+            created.append((chain_index, outcome))
+    for i in positions[len(outcomes) :]:
+        results[i] = {"index": i, "status": "rejected", "errors": ["batch_aborted"]}
+
+    rejected = len(results) - len(created)
+    if req.atomic and rejected:
         raise HTTPException(
             status_code=400,
             detail={
-                "message": result["message"],
-                "errors": result["errors"],
-                "computed_hash": result.get("computed_hash"),
+                "message": "batch rejected, nothing was written",
+                "rejected": rejected,
+                "results": results,
             },
         )
 
-    # 7) Persist to JSON chain
-    try:
-        store_event(full_event)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chain store failed: {e}")
+    await _store_events_db(created)
+    return {
+        "status": "created" if not rejected else "partial",
+        "created": len(created),
+        "rejected": rejected,
+        "results": results,
+    }
 
-    # 8) Optional SQLite persistence
-    if store_event_db:
-        try:
-            store_event_db(full_event)
-        except Exception:
-            # DB errors don't block success, chain persistence already done
-            pass
 
-    return {"status": "created", "event": full_event}
+async def _store_events_db(indexed_events: List[Tuple[int, Dict[str, Any]]]) -> None:
+    """Optional SQLite persistence (one batched insert per request)."""
+    if not store_events_db or not indexed_events:
+        return
+    try:
+        await run_io(store_events_db, indexed_events)
+    except Exception:
+        # DB errors don't block success, chain persistence already done
+        pass
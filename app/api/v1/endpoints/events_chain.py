@@ -2,32 +2,51 @@
 
 from fastapi import APIRouter
 
-from app.engine.state.event_chain import get_all_events
-from app.engine.validation.validator import EventValidator
+from app.api.v1.ndjson import ndjson_response
+from app.core.offload import run_crypto, run_io
+from app.engine.diagnostics.analysis import get_analyzer
 
 router = APIRouter()
-validator = EventValidator()
+
+
+def _row(event, is_valid, result):
+    return {
+        "event": event,
+        "valid": is_valid,
+        "errors": result.get("errors") if not is_valid else None,
+        "computed_hash": result.get("computed_hash"),
+    }
 
 
 @router.get("/chain")
-def read_chain():
+async def read_chain():
     """
     Returns the full chain with validation status for each event.
     """
 
-    chain = get_all_events()
-    validated_chain = []
+    analyzer = get_analyzer()
+    analysis = await run_crypto(analyzer.analyze, full=True)
+    validated_chain = await run_io(
+        lambda: [
+            _row(event, is_valid, result)
+            for _, event, (is_valid, result) in analyzer.iter_results(analysis)
+        ]
+    )
 
-    for event in chain:
-        is_valid, result = validator.validate(event)
+    return {"chain_length": len(validated_chain), "chain": validated_chain}
 
-        validated_chain.append(
-            {
-                "event": event,
-                "valid": is_valid,
-                "errors": result.get("errors") if not is_valid else None,
-                "computed_hash": result.get("computed_hash"),
-            }
-        )
 
-    return {"chain_length": len(validated_chain), "chain": validated_chain}
+@router.get("/chain/stream")
+async def stream_chain():
+    """
+    NDJSON variant of /chain: one validated event per line.
+    """
+
+    analyzer = get_analyzer()
+    analysis = await run_crypto(analyzer.analyze, full=True)
+
+    def rows():
+        for index, event, (is_valid, result) in analyzer.iter_results(analysis):
+            yield {"index": index, **_row(event, is_valid, result)}
+
+    return ndjson_response(rows())
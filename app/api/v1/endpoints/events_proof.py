@@ -0,0 +1,87 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.offload import run_io
+from app.engine.anchor.merkle import get_merkle_tree
+from app.engine.state.chain_store import event_hash_of
+from app.engine.state.event_chain import get_store
+
+router = APIRouter(tags=["merkle"])
+
+
+def _tree_size(tree, size: Optional[int]) -> int:
+    if size is None:
+        return tree.size
+    if size > tree.size:
+        raise HTTPException(
+            status_code=400, detail=f"tree size {size} exceeds current {tree.size}"
+        )
+    return size
+
+
+@router.get("/merkle/root")
+async def merkle_root(size: Optional[int] = Query(None, ge=0)):
+    """Merkle root of the first `size` events (default: the whole chain)."""
+    tree = await run_io(get_merkle_tree)
+    size = _tree_size(tree, size)
+    root = await run_io(tree.root, size)
+    return {"tree_size": size, "root": root.hex()}
+
+
+@router.get("/merkle/consistency")
+async def merkle_consistency(
+    first: int = Query(..., ge=0), second: Optional[int] = Query(None, ge=0)
+):
+    """
+    Consistency proof that the tree of size `first` is a prefix of the tree
+    of size `second` (default: the whole chain). RFC 6962 section 2.1.2.
+    """
+    tree = await run_io(get_merkle_tree)
+    second = _tree_size(tree, second)
+    if first > second:
+        raise HTTPException(status_code=400, detail="first must be <= second")
+
+    def proof():
+        return {
+            "first": first,
+            "second": second,
+            "first_root": tree.root(first).hex(),
+            "second_root": tree.root(second).hex(),
+            "proof": [node.hex() for node in tree.consistency_proof(first, second)],
+        }
+
+    return await run_io(proof)
+
+
+@router.get("/{event_id}/proof")
+async def inclusion_proof(event_id: str, size: Optional[int] = Query(None, ge=1)):
+    """
+    Inclusion proof (audit path) for one event against the Merkle root of the
+    first `size` events (default: the whole chain). RFC 6962 section 2.1.1.
+    """
+    store = get_store()
+    # find() may catch the id table up with the chain: keep it off the loop
+    index = await run_io(store.find, event_id)
+    if index is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    tree = await run_io(get_merkle_tree, store)
+    size = _tree_size(tree, size)
+    if index >= size:
+        raise HTTPException(
+            status_code=400, detail=f"event {index} is not in a tree of size {size}"
+        )
+
+    def proof():
+        return {
+            "event_id": event_id,
+            "index": index,
+            "event_hash": event_hash_of(store.get(index)),
+            "leaf_hash": tree.leaf(index).hex(),
+            "tree_size": size,
+            "root": tree.root(size).hex(),
+            "proof": [node.hex() for node in tree.inclusion_proof(index, size)],
+        }
+
+    return await run_io(proof)
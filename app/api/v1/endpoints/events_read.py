@@ -1,15 +1,89 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from app.engine.chain.chain_reader import get_all_events, get_latest_event
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.v1.ndjson import ndjson_response
+from app.core.offload import run_io
+from app.engine.chain.chain_reader import (
+    get_all_events,
+    get_chain_length,
+    get_event_by_id,
+    get_events_range,
+    get_latest_event,
+    iter_events,
+)
 
 router = APIRouter(tags=["events-read"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    """Cursors are the chain index of the next event to return."""
+    if cursor is None:
+        return 0
+    try:
+        start = int(cursor)
+    except ValueError:
+        start = -1
+    if start < 0:
+        raise HTTPException(status_code=400, detail=f"invalid cursor: {cursor}")
+    return start
+
 
 @router.get("/latest")
-def read_latest():
+async def read_latest():
+    # the tail is held in memory: answered on the loop, no thread hop
     return get_latest_event()
 
 
 @router.get("/all")
-def read_all_events():
-    return get_all_events()
+async def read_all_events(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Without cursor/limit: the full list (legacy shape).
+    With either: one page plus next_cursor (None on the last page).
+    """
+    if cursor is None and limit is None:
+        return await run_io(get_all_events)
+
+    start = _decode_cursor(cursor)
+    events = await run_io(get_events_range, start, limit or DEFAULT_PAGE_SIZE)
+    next_index = start + len(events)
+    return {
+        "events": events,
+        "next_cursor": str(next_index) if next_index < get_chain_length() else None,
+    }
+
+
+@router.get("/all/stream")
+async def stream_all_events():
+    """NDJSON variant of /all: one event per line, constant memory."""
+    return ndjson_response(iter_events())
+
+
+@router.get("/range")
+async def read_range(
+    start: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Events start <= index < start + limit, read via the offset index."""
+    events = await run_io(get_events_range, start, limit)
+    return {
+        "start": start,
+        "count": len(events),
+        "chain_length": get_chain_length(),
+        "events": events,
+    }
+
+
+# Keep last: matches any single path segment under /events.
+@router.get("/{event_id}")
+async def read_event(event_id: str):
+    event = await run_io(get_event_by_id, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"event not found: {event_id}")
+    return event
@@ -1,17 +1,64 @@
-from fastapi import APIRouter
+from typing import List, Optional
 
-from app.engine.chain.chain_reader import get_all_events
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.offload import run_io
+from app.engine.search.search_index import FIELDS, get_search_index
+from app.engine.state.event_chain import get_store
 
 router = APIRouter()
 
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
 
 @router.get("/search")
-def search_events(q: str):
-    results = []
+async def search_events(
+    q: Optional[str] = None,
+    event_type: Optional[str] = None,
+    origin: Optional[str] = None,
+    trace_id: Optional[str] = None,
+    payload: Optional[List[str]] = Query(None),
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Indexed event search.
+    - q: full-text terms (all must match, `term*` for prefix)
+    - event_type / origin / trace_id: exact field filters
+    - payload: repeated `key=value` filters on flattened payload keys (a.b=c)
+    - since / until: inclusive timestamp bounds
+    """
+    filters = {}
+    for field, value in zip(FIELDS, (event_type, origin, trace_id)):
+        if value is not None:
+            filters[field] = value
+    for item in payload or []:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise HTTPException(
+                status_code=400, detail=f"payload filter must be key=value: {item}"
+            )
+        filters[f"payload.{key}"] = value
+
+    store = get_store()
+
+    def search():
+        matches = get_search_index(store).search(
+            text=q, filters=filters, since=since, until=until
+        )
+        page = matches[offset : offset + limit]
+        return len(matches), [store.get(i) for i in page]
 
-    for event in get_all_events():
-        text = str(event)
-        if q.lower() in text.lower():
-            results.append(event)
+    total, results = await run_io(search)
+    next_offset = offset + len(results)
 
-    return {"query": q, "results": results}
+    return {
+        "query": q,
+        "filters": filters,
+        "total": total,
+        "results": results,
+        "next_offset": next_offset if next_offset < total else None,
+    }
@@ -1,38 +1,70 @@
 # app/api/v1/endpoints/events_verify.py
 
-from typing import Any, Dict
-
 from fastapi import APIRouter
 
-from app.engine.state.event_chain import get_all_events
-from app.engine.validation.validator import EventValidator
+from app.api.v1.ndjson import ndjson_response
+from app.core.offload import run_crypto, run_io
+from app.engine.diagnostics.analysis import get_analyzer
 
 router = APIRouter()
-validator = EventValidator()
+
+
+def _row(index, event, is_valid, result):
+    return {
+        "index": index,
+        "event_id": event.get("event_id"),
+        "valid": is_valid,
+        "errors": result.get("errors") if not is_valid else None,
+        "computed_hash": result.get("computed_hash"),
+    }
 
 
 @router.get("/verify")
-def verify_all_events():
+async def verify_all_events(full: bool = False):
     """
-    Verifies the entire event chain:
+    Verifies the event chain:
       - hash correctness
       - signature correctness
       - canonicalization integrity
+
+    A view over the shared chain analysis: events covered by the checkpoint
+    the analysis started from are not listed; full=true requires an
+    analysis from genesis.
     """
 
-    chain = get_all_events()
-    results = []
+    analyzer = get_analyzer()
+    analysis = await run_crypto(analyzer.analyze, full=full)
+
+    def rows():
+        results = []
+        for index, event, (is_valid, result) in analyzer.iter_results(analysis):
+            row = _row(index, event, is_valid, result)
+            del row["index"]
+            results.append(row)
+        return results
+
+    results = await run_io(rows)
+
+    return {
+        "count": len(results),
+        "results": results,
+        "verified_from": analysis.base,
+        "chain_length": analysis.length,
+        "checkpoint": analysis.checkpoint,
+    }
+
+
+@router.get("/verify/stream")
+async def stream_verify(full: bool = False):
+    """
+    NDJSON variant of /verify: one verified event per line.
+    """
 
-    for event in chain:
-        is_valid, result = validator.validate(event)
+    analyzer = get_analyzer()
+    analysis = await run_crypto(analyzer.analyze, full=full)
 
-        results.append(
-            {
-                "event_id": event.get("event_id"),
-                "valid": is_valid,
-                "errors": result.get("errors") if not is_valid else None,
-                "computed_hash": result.get("computed_hash"),
-            }
-        )
+    def rows():
+        for index, event, (is_valid, result) in analyzer.iter_results(analysis):
+            yield _row(index, event, is_valid, result)
 
-    return {"count": len(results), "results": results}
+    return ndjson_response(rows())
@@ -1,33 +1,108 @@
 # app/api/v1/endpoints/health.py
 
+import threading
+from typing import Any, Dict, Optional, Tuple
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-from app.engine.state.event_chain import get_all_events
+from app.core import metrics
+from app.core.key_registry import get_signing_key
+from app.core.offload import crypto_executor, io_executor
+from app.engine.ingest.pipeline import get_pipeline
+from app.engine.state.event_chain import get_store
 from app.engine.validation.validator import EventValidator
 
 router = APIRouter()
 validator = EventValidator()
 
+# (head hash, result) of the last tail validation: the tail only changes
+# when the head does, so probes between appends reuse it
+_tail_check: Optional[Tuple[str, Dict[str, Any]]] = None
+_tail_check_lock = threading.Lock()
+
+
+def _check_tail(store) -> Dict[str, Any]:
+    global _tail_check
+    head = store.head
+    cached = _tail_check
+    if cached is not None and cached[0] == head.last_hash:
+        return cached[1]
+
+    with _tail_check_lock:
+        tail = store.tail()
+        if tail is None:
+            result = {"status": "ok", "message": "no events yet"}
+        else:
+            is_valid, validation = validator.validate(tail)
+            if is_valid:
+                result = {"status": "ok", "message": "chain integrity valid"}
+            else:
+                result = {
+                    "status": "error",
+                    "message": "latest event failed validation",
+                    "errors": validation.get("errors"),
+                    "computed_hash": validation.get("computed_hash"),
+                }
+        _tail_check = (head.last_hash, result)
+        return result
+
+
+def _round(value: Optional[float], digits: int = 3) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def _metrics(store) -> Dict[str, Any]:
+    latency = store.last_append_latency
+    return {
+        "chain_height": store.head.length,
+        "last_append_latency_ms": _round(None if latency is None else latency * 1e3),
+        "last_append_age_s": _round(metrics.age_of(store.last_append_at)),
+        "last_verify_age_s": _round(metrics.age("last_verify_at")),
+        "last_full_verify_age_s": _round(metrics.age("last_full_verify_at")),
+        "writer_queue_depth": get_pipeline().queue_depth(),
+        "crypto_queue_depth": crypto_executor().queue_depth(),
+        "io_queue_depth": io_executor().queue_depth(),
+    }
+
 
 @router.get("/")
-def health_check():
+async def health_check():
     """
     Basic health check with a quick event integrity test.
+    The tail event is read in O(1) and validated once per chain head, so
+    this runs on the event loop and never queues behind offloaded work.
     """
-    chain = get_all_events()
+    store = get_store()
+    result = dict(_check_tail(store))
+    result["metrics"] = _metrics(store)
+    return result
 
-    if not chain:
-        return {"status": "ok", "message": "no events yet"}
 
-    latest_event = chain[-1]
-    is_valid, result = validator.validate(latest_event)
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and serving. Never touches disk."""
+    return {"status": "ok"}
 
-    if not is_valid:
-        return {
-            "status": "error",
-            "message": "latest event failed validation",
-            "errors": result.get("errors"),
-            "computed_hash": result.get("computed_hash"),
-        }
 
-    return {"status": "ok", "message": "chain integrity valid"}
+@router.get("/ready")
+async def readiness():
+    """
+    Readiness probe: the chain store is open and the signing key is loaded.
+    Both are cached after startup, so this stays off the disk as well.
+    """
+    checks = {}
+    try:
+        checks["chain_height"] = get_store().head.length
+        checks["chain_store"] = "ok"
+    except Exception as e:
+        checks["chain_store"] = f"unavailable: {e}"
+    try:
+        get_signing_key()
+        checks["signing_key"] = "ok"
+    except Exception as e:
+        checks["signing_key"] = f"unavailable: {e}"
+
+    ready = checks["chain_store"] == "ok" and checks["signing_key"] == "ok"
+    body = {"status": "ready" if ready else "not_ready", "checks": checks}
+    return JSONResponse(body, status_code=200 if ready else 503)
@@ -0,0 +1,29 @@
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+from app.core.offload import iterate_io
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# rows encoded per step on the io pool (and per write to the socket)
+ROWS_PER_CHUNK = 256
+
+
+def _chunks(rows: Iterable[Any]) -> Iterator[bytes]:
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, ROWS_PER_CHUNK))
+        if not batch:
+            return
+        yield "".join(json.dumps(row) + "\n" for row in batch).encode("utf-8")
+
+
+def ndjson_response(rows: Iterable[Any]) -> StreamingResponse:
+    """
+    Stream an iterable as newline-delimited JSON, one row per line.
+    Rows are produced on the io pool, never on the event loop.
+    """
+    return StreamingResponse(iterate_io(_chunks(rows)), media_type=NDJSON_MEDIA_TYPE)
@@ -1,10 +1,27 @@
 from fastapi import APIRouter
 
-from .endpoints import diagnostics, events, events_read, health
+from .endpoints import (
+    anchors,
+    diagnostics,
+    events,
+    events_chain,
+    events_proof,
+    events_read,
+    events_search,
+    events_verify,
+    health,
+)
 
 router = APIRouter(prefix="/api/v1")
 
 router.include_router(events.router, prefix="/events")
+router.include_router(events_verify.router, prefix="/events")
+router.include_router(events_chain.router, prefix="/events")
+router.include_router(events_search.router, prefix="/events")
+router.include_router(events_proof.router, prefix="/events")
+# events_read goes last among /events routers: its /{event_id} route
+# would otherwise shadow fixed paths such as /verify, /chain and /merkle.
 router.include_router(events_read.router, prefix="/events")
+router.include_router(anchors.router, prefix="/anchors")
 router.include_router(health.router, prefix="/health")
 router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
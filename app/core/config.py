@@ -0,0 +1,141 @@
+import os
+
+# ------------------------------------------------------------
+# Environment helpers
+# ------------------------------------------------------------
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# ------------------------------------------------------------
+# Chain store
+# ------------------------------------------------------------
+
+# Segments are rotated once they grow past this many bytes.
+SEGMENT_MAX_BYTES = _env_int("TRUETRACE_SEGMENT_MAX_BYTES", 64 * 1024 * 1024)
+
+# fsync after every append group (disable only for throwaway stores).
+STORE_FSYNC = _env_bool("TRUETRACE_STORE_FSYNC", True)
+
+
+# ------------------------------------------------------------
+# Keys
+# ------------------------------------------------------------
+
+# Decoded Ed25519 VerifyKey objects kept in the LRU, keyed by pubkey hex.
+VERIFY_KEY_CACHE_SIZE = _env_int("TRUETRACE_VERIFY_KEY_CACHE_SIZE", 256)
+
+
+# ------------------------------------------------------------
+# Chain verification
+# ------------------------------------------------------------
+
+# Worker count for EventValidator.validate_many (0 = one per CPU).
+VERIFY_WORKERS = _env_int("TRUETRACE_VERIFY_WORKERS", 0) or (os.cpu_count() or 1)
+
+# "process" (scales with cores) or "thread" (no fork/spawn, GIL-bound JSON work).
+VERIFY_EXECUTOR = os.environ.get("TRUETRACE_VERIFY_EXECUTOR", "process")
+
+# Events per work unit handed to a worker.
+VERIFY_CHUNK_SIZE = _env_int("TRUETRACE_VERIFY_CHUNK_SIZE", 2048)
+
+# Chains shorter than this are validated serially (pool overhead dominates).
+VERIFY_SERIAL_THRESHOLD = _env_int("TRUETRACE_VERIFY_SERIAL_THRESHOLD", 4096)
+
+
+# ------------------------------------------------------------
+# Ingestion pipeline
+# ------------------------------------------------------------
+
+# Events per group commit (one write + fsync); a /events/batch request
+# is never split across commits.
+INGEST_MAX_BATCH_SIZE = _env_int("TRUETRACE_INGEST_MAX_BATCH_SIZE", 256)
+
+# How long the writer waits for more events before flushing a batch.
+INGEST_MAX_LINGER_MS = _env_int("TRUETRACE_INGEST_MAX_LINGER_MS", 2)
+
+# Most events accepted by one POST /events/batch request.
+INGEST_MAX_REQUEST_EVENTS = _env_int("TRUETRACE_INGEST_MAX_REQUEST_EVENTS", 10000)
+
+
+# ------------------------------------------------------------
+# Anchoring
+# ------------------------------------------------------------
+
+# Seconds between Merkle root anchors (0 disables the background service).
+ANCHOR_INTERVAL_SECONDS = _env_int("TRUETRACE_ANCHOR_INTERVAL_SECONDS", 60 * 60)
+
+
+# ------------------------------------------------------------
+# Event database (SQLite)
+# ------------------------------------------------------------
+
+# Pooled SQLite connections (each in WAL mode).
+EVENT_DB_POOL_SIZE = _env_int("TRUETRACE_EVENT_DB_POOL_SIZE", 5)
+
+# Rows per INSERT executemany when rebuilding or catching up from the chain.
+EVENT_DB_BATCH_SIZE = _env_int("TRUETRACE_EVENT_DB_BATCH_SIZE", 1000)
+
+
+# ------------------------------------------------------------
+# Async offload executors
+# ------------------------------------------------------------
+
+# Threads for hashing / Ed25519 / validation behind async endpoints.
+OFFLOAD_CRYPTO_WORKERS = _env_int("TRUETRACE_OFFLOAD_CRYPTO_WORKERS", 0) or min(
+    4, os.cpu_count() or 1
+)
+
+# Threads for blocking chain store / Merkle / database reads.
+OFFLOAD_IO_WORKERS = _env_int("TRUETRACE_OFFLOAD_IO_WORKERS", 8)
+
+
+# ------------------------------------------------------------
+# Visual frame hashing
+# ------------------------------------------------------------
+
+# Threads hashing frames in parallel (0 = one per CPU; 1 = inline).
+FRAME_HASH_WORKERS = _env_int("TRUETRACE_FRAME_HASH_WORKERS", 0) or (
+    os.cpu_count() or 1
+)
+
+# Decoded frames held at once (queued for or being hashed); bounds memory.
+FRAME_HASH_MAX_IN_FLIGHT = _env_int("TRUETRACE_FRAME_HASH_MAX_IN_FLIGHT", 0)
+
+# Frames the decoder thread may run ahead of the hashers.
+FRAME_DECODE_PREFETCH = _env_int("TRUETRACE_FRAME_DECODE_PREFETCH", 4)
+
+
+# ------------------------------------------------------------
+# Motion analysis
+# ------------------------------------------------------------
+
+# "reference" (full-resolution TV-L1) or "fast" (downscaled ILK).
+MOTION_MODE = os.environ.get("TRUETRACE_MOTION_MODE") or "reference"
+
+# Fast mode: longest side of the downscaled grayscale frames.
+MOTION_FAST_MAX_SIDE = _env_int("TRUETRACE_MOTION_FAST_MAX_SIDE", 320)
+
+# Fast mode: compute flow between every Nth frame only.
+MOTION_FAST_STRIDE = _env_int("TRUETRACE_MOTION_FAST_STRIDE", 1)
+
+# Processes computing optical flow over frame pairs (0 = one per CPU; 1 = serial).
+MOTION_WORKERS = _env_int("TRUETRACE_MOTION_WORKERS", 0) or (os.cpu_count() or 1)
+
+# Frame pairs per worker held in shared memory at once; bounds memory.
+MOTION_PAIRS_PER_WORKER = _env_int("TRUETRACE_MOTION_PAIRS_PER_WORKER", 2)
+
+# Fewer frame pairs than this are computed serially: dispatch would cost more.
+MOTION_MIN_PARALLEL_PAIRS = _env_int("TRUETRACE_MOTION_MIN_PARALLEL_PAIRS", 8)
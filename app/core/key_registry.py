@@ -0,0 +1,71 @@
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from nacl.signing import SigningKey, VerifyKey
+
+from app.core import config
+from app.core.paths import PRIVATE_KEY_FILE
+
+# ------------------------------------------------------------
+# Signing key (loaded once per process)
+# ------------------------------------------------------------
+
+_signing_key: Optional[SigningKey] = None
+_signing_key_lock = threading.Lock()
+
+
+def load_signing_key(path: str | Path = PRIVATE_KEY_FILE) -> SigningKey:
+    """
+    Load the Ed25519 signing key (raw 32-byte seed) and keep it for the
+    lifetime of the process. Called at app startup; later calls are free.
+    """
+    global _signing_key
+    if _signing_key is None:
+        with _signing_key_lock:
+            if _signing_key is None:
+                with open(path, "rb") as f:
+                    _signing_key = SigningKey(f.read())
+                # seed the verify-key cache with our own public key
+                get_verify_key(_signing_key.verify_key.encode().hex())
+    return _signing_key
+
+
+def get_signing_key() -> SigningKey:
+    """Return the process signing key, loading it on first use."""
+    return load_signing_key()
+
+
+# ------------------------------------------------------------
+# Verify keys (bounded LRU keyed by pubkey hex)
+# ------------------------------------------------------------
+
+
+@lru_cache(maxsize=config.VERIFY_KEY_CACHE_SIZE)
+def get_verify_key(pubkey_hex: str) -> VerifyKey:
+    """
+    Return a decoded VerifyKey for a hex public key.
+    Raises ValueError / nacl errors for malformed keys (never cached).
+    """
+    return VerifyKey(bytes.fromhex(pubkey_hex))
+
+
+def key_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the verify-key cache."""
+    info = get_verify_key.cache_info()
+    return {
+        "signing_key_loaded": _signing_key is not None,
+        "verify_key_hits": info.hits,
+        "verify_key_misses": info.misses,
+        "verify_key_cached": info.currsize,
+        "verify_key_capacity": info.maxsize,
+    }
+
+
+def reset_key_cache() -> None:
+    """Drop cached keys (key rotation, tests)."""
+    global _signing_key
+    with _signing_key_lock:
+        _signing_key = None
+    get_verify_key.cache_clear()
@@ -0,0 +1,48 @@
+"""
+In-process gauges for health and diagnostics.
+
+Values are plain floats set by the component that owns them; reading them
+never touches disk, so health probes can report them for free.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+_gauges: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def set_gauge(name: str, value: Optional[float] = None) -> None:
+    """Set a gauge; with no value, record the current wall-clock time."""
+    with _lock:
+        _gauges[name] = time.time() if value is None else value
+
+
+def gauge(name: str) -> Optional[float]:
+    return _gauges.get(name)
+
+
+def age(name: str) -> Optional[float]:
+    """Seconds since a timestamp gauge was set, or None if it never was."""
+    return age_of(_gauges.get(name))
+
+
+def age_of(timestamp: Optional[float]) -> Optional[float]:
+    return None if timestamp is None else max(0.0, time.time() - timestamp)
+
+
+def gauges() -> Dict[str, float]:
+    with _lock:
+        return dict(_gauges)
+
+
+def mark_verified(height: int, from_genesis: bool) -> None:
+    """Record a verification pass that reached the chain head."""
+    with _lock:
+        now = time.time()
+        _gauges["last_verify_at"] = now
+        _gauges["last_verify_height"] = height
+        if from_genesis:
+            _gauges["last_full_verify_at"] = now
+            _gauges["last_full_verify_height"] = height
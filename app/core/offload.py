@@ -0,0 +1,156 @@
+"""
+Dedicated executors for blocking work done on behalf of async endpoints.
+
+Three pools, separate from Starlette's request threadpool:
+
+    crypto  hashing, Ed25519, validation and chain analysis passes
+    io      chain store, Merkle, anchor log and database reads
+    writer  one thread for the ingest pipeline's batch commits
+
+An endpoint awaits run_crypto() / run_io() instead of being a sync `def`,
+so a long verification occupies a crypto worker, not the threads that
+serve health probes or latest-event reads. Commits never queue behind
+verify or diagnostics work on the crypto pool. Every pool counts its queued
+(submitted, not yet started) and running calls; health and diagnostics
+report them.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core import config
+
+T = TypeVar("T")
+
+# states of one offloaded call
+_QUEUED, _RUNNING, _DONE, _CANCELLED = "queued", "running", "done", "cancelled"
+
+
+class OffloadExecutor:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.completed = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=self.name
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs) on this pool and await its result."""
+        # queued -> running -> done, or queued -> cancelled. Each move is
+        # made under the lock, so exactly one side takes the call off the
+        # queued count, even when a worker picks it up as the await is
+        # cancelled.
+        state = _QUEUED
+
+        def call():
+            nonlocal state
+            with self._lock:
+                if state != _QUEUED:
+                    return None  # cancelled: nobody waits for the result
+                state = _RUNNING
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    state = _DONE
+                    self._running -= 1
+                    self.completed += 1
+
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), call)
+        finally:
+            with self._lock:
+                if state == _QUEUED:
+                    state = _CANCELLED
+                    self._queued -= 1
+
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_crypto = OffloadExecutor("crypto", config.OFFLOAD_CRYPTO_WORKERS)
+_io = OffloadExecutor("io", config.OFFLOAD_IO_WORKERS)
+# the store takes one writer at a time, so more threads would only wait
+_writer = OffloadExecutor("writer", 1)
+
+
+def crypto_executor() -> OffloadExecutor:
+    return _crypto
+
+
+def io_executor() -> OffloadExecutor:
+    return _io
+
+
+def writer_executor() -> OffloadExecutor:
+    return _writer
+
+
+async def run_crypto(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await _crypto.run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await _io.run(fn, *args, **kwargs)
+
+
+async def run_writer(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await _writer.run(fn, *args, **kwargs)
+
+
+def iterate_io(iterator):
+    """Async iterator over a blocking iterator, each step on the io pool."""
+    sentinel = object()
+    step = partial(next, iterator, sentinel)
+
+    async def gen():
+        while True:
+            item = await _io.run(step)
+            if item is sentinel:
+                return
+            yield item
+
+    return gen()
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {"crypto": _crypto.stats(), "io": _io.stats(), "writer": _writer.stats()}
+
+
+def shutdown_executors() -> None:
+    _crypto.shutdown()
+    _io.shutdown()
+    _writer.shutdown()
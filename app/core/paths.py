@@ -10,6 +10,7 @@ DATA_DIR = BASE_DIR / "data"
 KEY_DIR = DATA_DIR / "keys"
 CHAIN_DIR = DATA_DIR / "chain"  # matches your actual structure
 DB_DIR = DATA_DIR / "db"
+STORE_DIR = CHAIN_DIR / "store"  # append-only segment store
 
 # Ensure directories exist
 KEY_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,3 +25,8 @@ PRIVATE_KEY_FILE = KEY_DIR / "truetrace_priv.bin"
 PUBLIC_KEY_FILE = KEY_DIR / "truetrace_pub.bin"  # matches your existing file
 CHAIN_FILE = CHAIN_DIR / "event_chain.json"  # matches your actual file
 EVENT_DB_FILE = DB_DIR / "truetrace.db"
+CHECKPOINT_FILE = CHAIN_DIR / "checkpoints.jsonl"  # signed verification checkpoints
+SEARCH_INDEX_FILE = CHAIN_DIR / "search_index.json"  # search index snapshot
+MERKLE_DIR = CHAIN_DIR / "merkle"  # Merkle tree level files
+ANCHOR_LOG_FILE = CHAIN_DIR / "anchors.jsonl"  # append-only anchor log
+ANCHOR_INDEX_FILE = CHAIN_DIR / "anchors.idx"  # timestamp / height index
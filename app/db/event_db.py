@@ -1,44 +1,365 @@
+# app/db/event_db.py
+"""
+SQLite event database: an indexed, queryable projection of the chain.
+
+One row per chain event, keyed by chain index, with indexed event_id,
+event_type, timestamp and trace_id columns; the full event is kept as JSON.
+event_id is not unique: the chain does not forbid a repeated id, and every
+occurrence keeps its row; lookups by id return the latest occurrence, as
+ChainStore.find does.
+The chain store stays the source of truth: catch_up fills any missing
+indexes, and rows can always be regenerated with
+
+    python -m app.db.event_db --rebuild
+
+Connections come from SQLAlchemy's pool and are switched to WAL (readers
+never wait for the writer) with synchronous=NORMAL. The fixed statements
+are built once at import with bound parameters, so SQLAlchemy's compiled
+cache and sqlite3's prepared statement cache are hit on every call;
+inserts go through executemany.
+
+The previous JSONL file of the same name is moved aside to
+truetrace.db.jsonl the first time the database is opened. A table from an
+older schema (PRAGMA user_version) is dropped and refilled from the chain.
+"""
+import argparse
 import json
 import os
-from typing import Dict, List, Optional
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    text,
+)
+
+from app.core import config
 from app.core.paths import EVENT_DB_FILE
 
+SQLITE_MAGIC = b"SQLite format 3\x00"
+SCHEMA_VERSION = 2
+
+metadata = MetaData()
+
+events_table = Table(
+    "events",
+    metadata,
+    Column("chain_index", Integer, primary_key=True, autoincrement=False),
+    Column("event_id", String, nullable=False, index=True),
+    Column("event_type", String, index=True),
+    Column("timestamp", Integer, index=True),
+    Column("trace_id", String, index=True),
+    Column("hash", String),
+    Column("body", Text, nullable=False),
+)
+
+_c = events_table.c
+_INSERT = insert(events_table).prefix_with("OR REPLACE")
+_LATEST = select(_c.body).order_by(_c.chain_index.desc()).limit(1)
+_BY_ID = (
+    select(_c.body)
+    .where(_c.event_id == bindparam("event_id"))
+    .order_by(_c.chain_index.desc())
+    .limit(1)
+)
+_BY_INDEX = select(_c.body).where(_c.chain_index == bindparam("chain_index"))
+_RANGE = (
+    select(_c.body)
+    .where(_c.chain_index >= bindparam("start"), _c.chain_index < bindparam("stop"))
+    .order_by(_c.chain_index)
+)
+_MAX_INDEX = select(func.max(_c.chain_index))
+_COUNT = select(func.count()).select_from(events_table)
+
+# (first missing index, next stored index) for every hole between rows
+_next = (
+    select(
+        _c.chain_index,
+        func.lead(_c.chain_index).over(order_by=_c.chain_index).label("next_index"),
+    )
+).subquery()
+_GAPS = (
+    select(_next.c.chain_index + 1, _next.c.next_index)
+    .where(_next.c.next_index > _next.c.chain_index + 1)
+    .order_by(_next.c.chain_index)
+)
+_MIN_INDEX = select(func.min(_c.chain_index))
+
+
+def _row(index: int, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "chain_index": index,
+        "event_id": event_dict.get("event_id"),
+        "event_type": event_dict.get("event_type"),
+        "timestamp": event_dict.get("timestamp"),
+        "trace_id": event_dict.get("trace_id"),
+        "hash": event_dict.get("hash") or event_dict.get("event_hash"),
+        "body": json.dumps(event_dict, separators=(",", ":")),
+    }
+
+
+def _move_legacy_file(path: Path) -> None:
+    """Move a JSONL file left at the database path out of the way."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with path.open("rb") as f:
+        if f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC:
+            return
+    target = path.with_name(path.name + ".jsonl")
+    n = 1
+    while target.exists():
+        target = path.with_name(f"{path.name}.{n}.jsonl")
+        n += 1
+    os.replace(path, target)
+
 
 class EventDB:
     """
-    Simple file-based event database.
-    Stores full event objects in JSONL format.
+    SQLite-backed event database.
+    Rows are keyed by chain index; re-adding an index replaces the row.
     """
 
-    def __init__(self, db_path: str = EVENT_DB_FILE):
-        self.db_path = db_path
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+    def __init__(self, db_path: Path = EVENT_DB_FILE, pool_size: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        _move_legacy_file(self.db_path)
 
-    def add(self, event: Dict):
-        """Append an event to the DB file."""
-        with open(self.db_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event) + "\n")
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            pool_size=pool_size or config.EVENT_DB_POOL_SIZE,
+            max_overflow=0,
+        )
+        event.listen(self.engine, "connect", _configure_connection)
+        self._migrate()
+        metadata.create_all(self.engine)
 
-    def list_all(self) -> List[Dict]:
-        """Return all stored events."""
-        if not os.path.exists(self.db_path):
-            return []
-        with open(self.db_path, "r", encoding="utf-8") as f:
-            return [json.loads(line.strip()) for line in f if line.strip()]
+    def _migrate(self) -> None:
+        """Drop an events table from another schema version; catch_up refills it."""
+        with self.engine.begin() as conn:
+            version = conn.execute(text("PRAGMA user_version")).scalar()
+            if version != SCHEMA_VERSION:
+                events_table.drop(conn, checkfirst=True)
+                conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    def add(self, event_dict: Dict[str, Any], index: int) -> None:
+        """Store the event at chain position `index`."""
+        self.add_many([(index, event_dict)])
+
+    def add_many(
+        self,
+        indexed_events: Iterable[Tuple[int, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Store (index, event) pairs with one executemany per batch,
+        each batch in its own transaction. Returns the rows written.
+        """
+        batch_size = batch_size or config.EVENT_DB_BATCH_SIZE
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for index, event_dict in indexed_events:
+            batch.append(_row(index, event_dict))
+            if len(batch) >= batch_size:
+                written += self._insert(batch)
+                batch = []
+        if batch:
+            written += self._insert(batch)
+        return written
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        with self.engine.begin() as conn:
+            conn.execute(_INSERT, rows)
+        return len(rows)
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(events_table))
+
+    # -------------------------
+    # Reading
+    # -------------------------
+
+    def _one(self, stmt, **params) -> Optional[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            body = conn.execute(stmt, params).scalar()
+        return json.loads(body) if body is not None else None
+
+    def _many(self, stmt, **params) -> List[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            return [json.loads(b) for b in conn.execute(stmt, params).scalars()]
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(_COUNT).scalar_one()
+
+    def max_index(self) -> int:
+        """Highest stored chain index, -1 when empty."""
+        with self.engine.connect() as conn:
+            value = conn.execute(_MAX_INDEX).scalar()
+        return -1 if value is None else value
 
     def latest(self) -> Optional[Dict]:
         """Return the most recent event or None."""
-        events = self.list_all()
-        return events[-1] if events else None
+        return self._one(_LATEST)
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        return self._one(_BY_ID, event_id=event_id)
+
+    def get_index(self, index: int) -> Optional[Dict[str, Any]]:
+        return self._one(_BY_INDEX, chain_index=index)
+
+    def range(self, start: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Events start <= index < start + limit, in chain order."""
+        return self._many(_RANGE, start=start, stop=start + limit)
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Events matching every given filter, in chain order."""
+        stmt = select(_c.body)
+        if event_type is not None:
+            stmt = stmt.where(_c.event_type == event_type)
+        if trace_id is not None:
+            stmt = stmt.where(_c.trace_id == trace_id)
+        if since is not None:
+            stmt = stmt.where(_c.timestamp >= since)
+        if until is not None:
+            stmt = stmt.where(_c.timestamp <= until)
+        return self._many(stmt.order_by(_c.chain_index).offset(offset).limit(limit))
+
+    def list_all(self) -> List[Dict]:
+        """Return all stored events."""
+        return self._many(select(_c.body).order_by(_c.chain_index))
+
+    # -------------------------
+    # Chain synchronisation
+    # -------------------------
+
+    def gaps(self) -> List[Tuple[int, int]]:
+        """
+        [start, stop) ranges of missing indexes below the highest stored one.
+        Only scanned when the row count says some are missing.
+        """
+        with self.engine.connect() as conn:
+            count = conn.execute(_COUNT).scalar_one()
+            highest = conn.execute(_MAX_INDEX).scalar()
+            if highest is None or count == highest + 1:
+                return []
+            lowest = conn.execute(_MIN_INDEX).scalar()
+            gaps = [(0, lowest)] if lowest > 0 else []
+            gaps.extend(tuple(row) for row in conn.execute(_GAPS))
+        return gaps
+
+    def catch_up(self, store=None) -> int:
+        """
+        Add chain events that have no row yet: any holes left by failed
+        writes, then everything past the highest stored index. Returns
+        rows added.
+        """
+        store = store if store is not None else _get_store()
+        added = 0
+        for start, stop in self.gaps():
+            added += self.add_many(
+                enumerate(store.iter_events(start=start, stop=stop), start)
+            )
+        start = self.max_index() + 1
+        return added + self.add_many(enumerate(store.iter_events(start=start), start))
+
+    def rebuild_from_chain(self, store=None) -> int:
+        """Replace every row with the events of the chain store."""
+        self.clear()
+        return self.catch_up(store)
+
+
+def _configure_connection(dbapi_connection, _record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _get_store():
+    from app.engine.state.event_chain import get_store
+
+    return get_store()
+
+
+# ------------------------------------------------------------
+# Process-wide database
+# ------------------------------------------------------------
+
+_db: Optional[EventDB] = None
+_db_lock = threading.Lock()
+
+
+def get_event_db() -> EventDB:
+    """The process-wide EventDB, caught up with the chain on first use."""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                db = EventDB()
+                db.catch_up()
+                _db = db
+    return _db
 
 
 # Existing free functions preserved for compatibility
-def add_event_db(event: Dict):
-    db = EventDB()
-    db.add(event)
+def add_event_db(event: Dict, index: int):
+    add_events_db([(index, event)])
+
+
+def add_events_db(indexed_events: List[Tuple[int, Dict[str, Any]]]) -> int:
+    """
+    Store freshly committed chain events at the indexes the store appended
+    them at (ChainStore.append_many / the pipeline's indexed results). An
+    id lookup cannot stand in: event_id may repeat.
+    """
+    return get_event_db().add_many(indexed_events)
 
 
 def get_latest_event():
+    return get_event_db().latest()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="TrueTrace event database")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="regenerate all rows from the chain"
+    )
+    args = parser.parse_args(argv)
     db = EventDB()
-    return db.latest()
+    if args.rebuild:
+        print(f"rebuilt {db.rebuild_from_chain()} events into {db.db_path}")
+    else:
+        print(f"added {db.catch_up()} events; {db.count()} rows in {db.db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# app/engine/anchor/anchor_log.py
+"""
+Append-only anchor log.
+
+Every anchor is one JSON line in ANCHOR_LOG_FILE:
+
+    {"seq": 0, "tree_size": 1024, "root": "<hex>", "timestamp": 1700000000}
+
+and one fixed-width entry in ANCHOR_INDEX_FILE:
+
+    timestamp i64 | tree_size i64 | byte offset of the log line u64
+
+Both columns only grow (anchors are taken in order, on a growing chain), so
+lookups by time or by chain height are binary searches over the index; only
+the matching log lines are read. The log line is fsynced before its index
+entry is written; an index that does not match the log is rebuilt on open.
+
+Every process running an anchor service (e.g. each uvicorn worker) may
+append. Appends and recovery hold an exclusive flock on the log file and
+first pick up the lines other processes wrote, so seq numbers stay dense
+and the tree_size check sees the true last anchor. Readers follow peers by
+comparing the log's size with the end of the last line they know.
+"""
+import bisect
+import json
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock(): single-process only
+    fcntl = None
+
+from app.core.paths import ANCHOR_INDEX_FILE, ANCHOR_LOG_FILE
+
+_ENTRY = struct.Struct("<qqQ")
+
+
+class AnchorLog:
+    def __init__(
+        self, path: Path = ANCHOR_LOG_FILE, index_path: Path = ANCHOR_INDEX_FILE
+    ):
+        self.path = Path(path)
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._timestamps: List[int] = []
+        self._heights: List[int] = []
+        self._offsets: List[int] = []
+        self._end = 0  # log size covered by the columns above
+        self._fd: Optional[int] = None  # flock target
+        self._open()
+
+    # -------------------------
+    # Opening / recovery
+    # -------------------------
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._exclusive():
+            # under the flock a torn line can only be a crashed writer's
+            self._trim_torn_line()
+            if not self._load_index():
+                self._rebuild_index()
+            self._end = os.fstat(self._fd).st_size
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    @contextmanager
+    def _exclusive(self):
+        """Thread lock plus, across processes, an exclusive flock on the log."""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _trim_torn_line(self) -> None:
+        """Drop a trailing line that was never completed."""
+        with self.path.open("rb+") as f:
+            data_end = f.seek(0, os.SEEK_END)
+            if data_end == 0:
+                return
+            f.seek(data_end - 1)
+            if f.read(1) == b"\n":
+                return
+            # walk back to the last newline
+            pos = data_end
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl >= 0:
+                    f.truncate(pos - step + nl + 1)
+                    return
+                pos -= step
+            f.truncate(0)
+
+    def _load_index(self) -> bool:
+        """Load the index if it lines up with the log."""
+        try:
+            raw = self.index_path.read_bytes()
+        except FileNotFoundError:
+            raw = b""
+        if len(raw) % _ENTRY.size:
+            return False
+        entries = [e for e in _ENTRY.iter_unpack(raw)]
+        log_size = self.path.stat().st_size
+        if not entries:
+            return log_size == 0
+
+        # the last indexed line must be the last line of the log
+        _, _, offset = entries[-1]
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            line = f.readline()
+            if f.tell() != log_size:
+                return False
+        try:
+            anchor = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        if anchor.get("seq") != len(entries) - 1:
+            return False
+
+        self._timestamps = [e[0] for e in entries]
+        self._heights = [e[1] for e in entries]
+        self._offsets = [e[2] for e in entries]
+        return True
+
+    def _rebuild_index(self) -> None:
+        self._timestamps, self._heights, self._offsets = [], [], []
+        entries = bytearray()
+        offset = 0
+        with self.path.open("rb") as f:
+            for line in f:
+                anchor = json.loads(line)
+                self._timestamps.append(anchor["timestamp"])
+                self._heights.append(anchor["tree_size"])
+                self._offsets.append(offset)
+                entries += _ENTRY.pack(anchor["timestamp"], anchor["tree_size"], offset)
+                offset += len(line)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_bytes(bytes(entries))
+        os.replace(tmp, self.index_path)
+
+    # -------------------------
+    # Following other processes
+    # -------------------------
+
+    def _follow(self) -> None:
+        """
+        Add the complete lines other processes appended past the known end.
+        Call with self._lock held; costs one fstat when nothing changed.
+        """
+        size = os.fstat(self._fd).st_size
+        if size <= self._end:
+            return
+        data = os.pread(self._fd, size - self._end, self._end)
+        offset = self._end
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # a peer is still writing it
+            anchor = json.loads(line)
+            self._timestamps.append(anchor["timestamp"])
+            self._heights.append(anchor["tree_size"])
+            self._offsets.append(offset)
+            offset += len(line)
+        self._end = offset
+
+    def _sync_index(self) -> None:
+        """
+        Under the flock: make the index file hold exactly one entry per
+        known line (a writer may have died between the two writes).
+        """
+        want = len(self._offsets)
+        with self.index_path.open("ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == want * _ENTRY.size:
+                return
+            keep = min(size // _ENTRY.size, want)
+            f.truncate(keep * _ENTRY.size)
+            columns = zip(self._timestamps, self._heights, self._offsets)
+            f.write(b"".join(_ENTRY.pack(*e) for e in islice(columns, keep, None)))
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    def append(
+        self, tree_size: int, root: str, timestamp: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Append an anchor for the first `tree_size` events with Merkle `root`."""
+        with self._exclusive():
+            # seq and the ordering checks must see other processes' anchors
+            self._trim_torn_line()
+            self._follow()
+            self._sync_index()
+            if timestamp is None:
+                timestamp = int(time.time())
+            # keep both index columns sorted
+            if self._timestamps:
+                timestamp = max(timestamp, self._timestamps[-1])
+                if tree_size < self._heights[-1]:
+                    raise ValueError(
+                        f"tree_size {tree_size} is below the last anchor"
+                        f" ({self._heights[-1]})"
+                    )
+            anchor = {
+                "seq": len(self._offsets),
+                "tree_size": tree_size,
+                "root": root,
+                "timestamp": timestamp,
+            }
+            line = (json.dumps(anchor, separators=(",", ":")) + "\n").encode("utf-8")
+
+            with self.path.open("ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            with self.index_path.open("ab") as f:
+                f.write(_ENTRY.pack(timestamp, tree_size, offset))
+
+            self._timestamps.append(timestamp)
+            self._heights.append(tree_size)
+            self._offsets.append(offset)
+            self._end = offset + len(line)
+            return anchor
+
+    # -------------------------
+    # Reading
+    # -------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._follow()
+            return len(self._offsets)
+
+    def _read(self, positions: range) -> List[Dict[str, Any]]:
+        if not positions:
+            return []
+        anchors = []
+        with self.path.open("rb") as f:
+            f.seek(self._offsets[positions[0]])
+            for _ in positions:
+                anchors.append(json.loads(f.readline()))
+        return anchors
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._follow()
+            n = len(self._offsets)
+            return self._read(range(n - 1, n))[0] if n else None
+
+    def get(self, seq: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._follow()
+            if not 0 <= seq < len(self._offsets):
+                return None
+            return self._read(range(seq, seq + 1))[0]
+
+    def covering(self, index: int) -> Optional[Dict[str, Any]]:
+        """Earliest anchor whose tree includes chain event `index`."""
+        with self._lock:
+            self._follow()
+            pos = bisect.bisect_right(self._heights, index)
+            if pos == len(self._heights):
+                return None
+            return self._read(range(pos, pos + 1))[0]
+
+    def query(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        min_height: Optional[int] = None,
+        max_height: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Anchors with since <= timestamp <= until and
+        min_height <= tree_size <= max_height, oldest first.
+        """
+        with self._lock:
+            self._follow()
+            lo, hi = 0, len(self._offsets)
+            if since is not None:
+                lo = max(lo, bisect.bisect_left(self._timestamps, since))
+            if until is not None:
+                hi = min(hi, bisect.bisect_right(self._timestamps, until))
+            if min_height is not None:
+                lo = max(lo, bisect.bisect_left(self._heights, min_height))
+            if max_height is not None:
+                hi = min(hi, bisect.bisect_right(self._heights, max_height))
+            lo += offset
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return self._read(range(lo, hi)) if lo < hi else []
+
+
+# ------------------------------------------------------------
+# Process-wide log
+# ------------------------------------------------------------
+
+_log: Optional[AnchorLog] = None
+_log_lock = threading.Lock()
+
+
+def get_anchor_log() -> AnchorLog:
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = AnchorLog()
+    return _log
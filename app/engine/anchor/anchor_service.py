@@ -1,31 +1,41 @@
 # app/engine/anchor/anchor_service.py
 """
-Scaffold for the Background Anchor Service.
+Background Anchor Service.
 
-This file provides a simple class you can wire to a background task runner (e.g. FastAPI startup event
-that creates an asyncio Task). It currently does not perform external anchoring, only computes a Merkle root
-placeholder and writes an 'anchor record' to event_chain.json when invoked.
+Started from the FastAPI lifespan, it periodically records the chain's current
+Merkle root (app.engine.anchor.merkle) in the append-only anchor log
+(app.engine.anchor.anchor_log). The root comes from the tree's in-memory
+frontier, so an anchor costs the same however long the chain is.
 
 Extend this to submit roots to a blockchain, timestamping service, or store receipts.
 """
 import asyncio
-import hashlib
-import json
-from pathlib import Path
-from typing import List
+from typing import Optional
 
-EVENT_CHAIN_PATH = Path.cwd() / "event_chain.json"
-ANCHOR_RECORD_KEY = "anchors"
+from app.core import config
+from app.engine.anchor.anchor_log import AnchorLog, get_anchor_log
+from app.engine.anchor.merkle import MerkleTree, get_merkle_tree
 
 
 class AnchorService:
-    def __init__(self, interval_seconds: int = 60 * 60):
-        self.interval = interval_seconds
+    def __init__(
+        self,
+        interval_seconds: Optional[int] = None,
+        log: Optional[AnchorLog] = None,
+        tree: Optional[MerkleTree] = None,
+    ):
+        self.interval = (
+            interval_seconds
+            if interval_seconds is not None
+            else config.ANCHOR_INTERVAL_SECONDS
+        )
+        self._log = log
+        self._tree = tree
         self._task = None
         self._running = False
 
     async def start(self):
-        if self._running:
+        if self._running or self.interval <= 0:
             return
         self._running = True
         self._task = asyncio.create_task(self._loop())
@@ -38,6 +48,7 @@ class AnchorService:
                 await self._task
             except asyncio.CancelledError:
                 pass
+            self._task = None
 
     async def _loop(self):
         while self._running:
@@ -50,43 +61,20 @@ class AnchorService:
 
     async def perform_anchor(self):
         """
-        Load chain, compute a simple merkle-like root (naive: hash of concatenated event hashes),
-        and append an anchor record into the chain file (not into the canonical event chain).
-        Replace with real Merkle tree and external submission later.
+        Append {seq, tree_size, root, timestamp} for the current Merkle root
+        to the anchor log. Nothing is written when the chain has not grown
+        since the last anchor. Returns the new anchor, or None.
         """
-        chain = self._load_chain()
-        if not chain:
-            return None
-        hashes = [ev.get("hash", "") for ev in chain]
-        concat = "".join(hashes).encode("utf-8")
-        root = hashlib.sha256(concat).hexdigest()
+        return await asyncio.to_thread(self.anchor_now)
 
-        # write anchor metadata into event_chain.json as a top-level anchors list
-        # Be conservative: preserve existing structure
-        data = {}
-        if EVENT_CHAIN_PATH.exists():
-            try:
-                with EVENT_CHAIN_PATH.open("r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
-                data = {}
-        anchors = data.get(ANCHOR_RECORD_KEY, [])
-        anchors.append({"root": root, "timestamp": int(__import__("time").time())})
-        data[ANCHOR_RECORD_KEY] = anchors
-        # preserve event list under "events" key if present on read
-        if isinstance(data, dict) and "events" not in data:
-            data["events"] = chain
-        with EVENT_CHAIN_PATH.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        return root
+    def anchor_now(self):
+        log = self._log if self._log is not None else get_anchor_log()
+        tree = self._tree if self._tree is not None else get_merkle_tree()
 
-    def _load_chain(self) -> List[dict]:
-        if not EVENT_CHAIN_PATH.exists():
-            return []
-        with EVENT_CHAIN_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            if isinstance(data, dict) and "events" in data:
-                return data["events"]
-            return []
+        size, root = tree.head()
+        if size == 0:
+            return None
+        latest = log.latest()
+        if latest is not None and latest["tree_size"] == size:
+            return None
+        return log.append(size, root.hex())
@@ -0,0 +1,420 @@
+# app/engine/anchor/merkle.py
+"""
+Incremental Merkle tree over the event chain (RFC 6962 / RFC 9162 hashing).
+
+    leaf hash  = SHA256(0x00 || UTF-8 of the event's stored hash hex)
+    node hash  = SHA256(0x01 || left || right)
+    empty root = SHA256("")
+
+Level k holds the roots of the complete subtrees of 2**k leaves, in order, as
+raw 32-byte hashes in MERKLE_DIR/level_KK.bin. Appending a leaf writes it to
+level 0 and one parent per completed pair above it, so an append costs
+amortized O(1) writes. The frontier (one complete-subtree root per set bit
+of the tree size, O(log n) nodes) stays in memory, so the current root needs
+no disk reads and is cached until the next append.
+
+Proofs are read from the level files:
+- inclusion proof:   audit path for leaf m in a tree of size n
+- consistency proof: proves a tree of size m is a prefix of one of size n
+and can be checked offline with verify_inclusion / verify_consistency.
+
+The tree follows the chain store through an append listener and catches up
+(or rebuilds, if the chain was rewritten) on demand:
+
+    python -m app.engine.anchor.merkle --rebuild
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.paths import MERKLE_DIR
+from app.engine.state.chain_store import ChainStore, event_hash_of
+from app.engine.state.event_chain import get_store
+
+HASH_SIZE = 32
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+# leaves read from the store per tree-lock hold in catch_up()
+CATCH_UP_BATCH = 4096
+
+
+# ------------------------------------------------------------
+# Hashing
+# ------------------------------------------------------------
+
+
+def leaf_hash(event_hash: str) -> bytes:
+    return hashlib.sha256(b"\x00" + event_hash.encode("utf-8")).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+# ------------------------------------------------------------
+# Proof verification (RFC 9162 2.1.3.2 / 2.1.4.2)
+# ------------------------------------------------------------
+
+
+def verify_inclusion(
+    leaf: bytes, index: int, size: int, proof: Sequence[bytes], root: bytes
+) -> bool:
+    """Check an audit path for leaf hash `leaf` at `index` in a tree of `size`."""
+    if not 0 <= index < size:
+        return False
+    fn, sn = index, size - 1
+    r = leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+def verify_consistency(
+    first: int,
+    second: int,
+    first_root: bytes,
+    second_root: bytes,
+    proof: Sequence[bytes],
+) -> bool:
+    """Check that the tree of size `first` is a prefix of the one of `second`."""
+    if not 0 <= first <= second:
+        return False
+    if first == second:
+        return not proof and first_root == second_root
+    if first == 0:
+        # every tree extends the empty tree
+        return not proof and first_root == EMPTY_ROOT
+    if not proof and first & (first - 1):
+        return False
+
+    path = list(proof)
+    if first & (first - 1) == 0:
+        path.insert(0, first_root)
+
+    fn, sn = first - 1, second - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and fr == first_root and sr == second_root
+
+
+# ------------------------------------------------------------
+# Tree
+# ------------------------------------------------------------
+
+
+class MerkleTree:
+    def __init__(self, directory: Path = MERKLE_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+        self._fds: List[int] = []
+        self._counts: List[int] = []
+        self.tail_hash = ""  # stored hash of the last leaf's event
+        self._open()
+
+    # -------------------------
+    # Files
+    # -------------------------
+
+    def _level_path(self, level: int) -> Path:
+        return self.directory / f"level_{level:02d}.bin"
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open_level(0)
+        size = self._counts[0]
+        for level in range(1, max(size.bit_length(), 1)):
+            self._open_level(level)
+        for path in self.directory.glob("level_*.bin"):
+            if int(path.stem[len("level_") :]) >= len(self._fds):
+                path.unlink()
+
+        # a torn write can leave partial nodes or upper levels out of step
+        for level in range(len(self._fds)):
+            want = size >> level
+            on_disk = os.fstat(self._fds[level]).st_size
+            if self._counts[level] > want or self._counts[level] * HASH_SIZE != on_disk:
+                self._truncate(level, min(self._counts[level], want))
+            while self._counts[level] < want:
+                i = self._counts[level]
+                left = self._node(level - 1, 2 * i)
+                right = self._node(level - 1, 2 * i + 1)
+                self._write(level, node_hash(left, right))
+
+        # frontier[k]: root of the complete 2**k-leaf subtree for bit k of size
+        self._frontier: List[Optional[bytes]] = [
+            self._node(k, (size >> k) - 1) if size >> k & 1 else None
+            for k in range(size.bit_length())
+        ]
+        self._root: Optional[bytes] = None
+
+        tail = self.directory / "TAIL"
+        self.tail_hash = tail.read_text(encoding="utf-8") if tail.exists() else ""
+
+    def _open_level(self, level: int) -> None:
+        fd = os.open(self._level_path(level), os.O_RDWR | os.O_CREAT, 0o644)
+        self._fds.append(fd)
+        self._counts.append(os.fstat(fd).st_size // HASH_SIZE)
+
+    def _truncate(self, level: int, count: int) -> None:
+        os.ftruncate(self._fds[level], count * HASH_SIZE)
+        self._counts[level] = count
+
+    def _write(self, level: int, digest: bytes) -> None:
+        if level == len(self._fds):
+            self._open_level(level)
+        os.pwrite(self._fds[level], digest, self._counts[level] * HASH_SIZE)
+        self._counts[level] += 1
+
+    def _node(self, level: int, index: int) -> bytes:
+        return os.pread(self._fds[level], HASH_SIZE, index * HASH_SIZE)
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in self._fds:
+                os.close(fd)
+            self._fds, self._counts = [], []
+
+    # -------------------------
+    # Updating
+    # -------------------------
+
+    @property
+    def size(self) -> int:
+        return self._counts[0]
+
+    def append(self, event_hash: str) -> None:
+        with self._lock:
+            digest = leaf_hash(event_hash)
+            self._write(0, digest)
+            # binary-counter carry: every filled frontier slot pairs up
+            level = 0
+            while level < len(self._frontier) and self._frontier[level] is not None:
+                digest = node_hash(self._frontier[level], digest)
+                self._frontier[level] = None
+                level += 1
+                self._write(level, digest)
+            if level == len(self._frontier):
+                self._frontier.append(None)
+            self._frontier[level] = digest
+            self._root = None
+            self.tail_hash = event_hash
+
+    def _write_tail(self) -> None:
+        tmp = self.directory / "TAIL.tmp"
+        tmp.write_text(self.tail_hash, encoding="utf-8")
+        os.replace(tmp, self.directory / "TAIL")
+
+    def on_append(self, first_index: int, events: List[Dict[str, Any]]) -> None:
+        """ChainStore append listener."""
+        with self._lock:
+            if first_index != self.size:
+                return  # out of step: the next catch_up() repairs it
+            for event in events:
+                self.append(event_hash_of(event))
+            self._write_tail()
+
+    def catch_up(self, store: ChainStore) -> None:
+        """
+        Bring the tree level with the store. A store that no longer matches
+        the leaves (rewritten / truncated chain) triggers a rebuild.
+
+        The store is read without the tree lock held: on_append runs under
+        the store lock and takes the tree lock, so the opposite order here
+        would deadlock against a commit. Leaves the listener appended in
+        the meantime are skipped.
+        """
+        head = store.head
+        with self._lock:
+            size, tail_hash = self.size, self.tail_hash
+        if size == head.length and tail_hash == head.last_hash:
+            return
+        if size > head.length or (
+            size and event_hash_of(store.get(size - 1)) != tail_hash
+        ):
+            with self._lock:
+                if (self.size, self.tail_hash) == (size, tail_hash):
+                    self.reset()
+                size = self.size
+
+        events = store.iter_events(start=size, stop=head.length)
+        while True:
+            hashes = [event_hash_of(e) for e in islice(events, CATCH_UP_BATCH)]
+            if not hashes:
+                return
+            with self._lock:
+                for index, event_hash in enumerate(hashes, size):
+                    if index == self.size:
+                        self.append(event_hash)
+                self._write_tail()
+            size += len(hashes)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.tail_hash = ""
+            self._open()
+
+    # -------------------------
+    # Roots
+    # -------------------------
+
+    def head(self) -> Tuple[int, bytes]:
+        """(size, root) of the current tree, read atomically."""
+        with self._lock:
+            return self.size, self.root()
+
+    def _frontier_root(self) -> bytes:
+        root = None
+        for node in self._frontier:
+            if node is not None:
+                root = node if root is None else node_hash(node, root)
+        return root if root is not None else EMPTY_ROOT
+
+    def _subtree(self, start: int, end: int) -> bytes:
+        """MTH of leaves [start, end), read from complete-subtree nodes."""
+        n = end - start
+        if n & (n - 1) == 0 and start % n == 0:
+            return self._node(n.bit_length() - 1, start // n)
+        k = _split(n)
+        return node_hash(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        """Root of the first `size` leaves (default: the whole tree)."""
+        with self._lock:
+            if size is None or size == self.size:
+                if self._root is None:
+                    self._root = self._frontier_root()
+                return self._root
+            if not 0 <= size <= self.size:
+                raise ValueError(f"tree size {size} out of range 0..{self.size}")
+            if size == 0:
+                return EMPTY_ROOT
+            return self._subtree(0, size)
+
+    # -------------------------
+    # Proofs (RFC 6962 2.1.1 / 2.1.2)
+    # -------------------------
+
+    def inclusion_proof(self, index: int, size: Optional[int] = None) -> List[bytes]:
+        with self._lock:
+            size = self.size if size is None else size
+            if not 0 <= index < size <= self.size:
+                raise ValueError(f"leaf {index} not in a tree of size {size}")
+            return self._path(index, 0, size)
+
+    def _path(self, m: int, start: int, end: int) -> List[bytes]:
+        n = end - start
+        if n == 1:
+            return []
+        k = _split(n)
+        if m < k:
+            return self._path(m, start, start + k) + [self._subtree(start + k, end)]
+        return self._path(m - k, start + k, end) + [self._subtree(start, start + k)]
+
+    def consistency_proof(
+        self, first: int, second: Optional[int] = None
+    ) -> List[bytes]:
+        with self._lock:
+            second = self.size if second is None else second
+            if not 0 <= first <= second <= self.size:
+                raise ValueError(f"no consistency proof from {first} to {second}")
+            if first == 0 or first == second:
+                return []
+            return self._subproof(first, 0, second, True)
+
+    def _subproof(self, m: int, start: int, end: int, complete: bool) -> List[bytes]:
+        n = end - start
+        if m == n:
+            return [] if complete else [self._subtree(start, end)]
+        k = _split(n)
+        if m <= k:
+            return self._subproof(m, start, start + k, complete) + [
+                self._subtree(start + k, end)
+            ]
+        return self._subproof(m - k, start + k, end, False) + [
+            self._subtree(start, start + k)
+        ]
+
+    def leaf(self, index: int) -> bytes:
+        with self._lock:
+            if not 0 <= index < self.size:
+                raise IndexError(index)
+            return self._node(0, index)
+
+
+# ------------------------------------------------------------
+# Process-wide tree
+# ------------------------------------------------------------
+
+_tree: Optional[MerkleTree] = None
+_tree_lock = threading.Lock()
+
+
+def get_merkle_tree(store: Optional[ChainStore] = None) -> MerkleTree:
+    """Return the shared tree, attached to the chain store and caught up."""
+    global _tree
+    if store is None:
+        store = get_store()
+
+    if _tree is None:
+        with _tree_lock:
+            if _tree is None:
+                tree = MerkleTree()
+                store.add_listener(tree.on_append)
+                _tree = tree
+    _tree.catch_up(store)
+    return _tree
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrueTrace Merkle tree")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="rebuild the tree from the chain"
+    )
+    args = parser.parse_args()
+    if args.rebuild:
+        tree = MerkleTree()
+        tree.reset()
+        tree.catch_up(get_store())
+        print(f"Merkle tree: {tree.size} leaves, root {tree.root().hex()}")
+    else:
+        parser.print_help()
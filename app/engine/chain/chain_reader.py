@@ -1,20 +1,22 @@
-import json
-import os
+from typing import Any, Dict, Iterator, List, Optional
 
-from app.core.paths import CHAIN_FILE
+from app.engine.state.event_chain import get_store
 from app.engine.validation.hash_validation import compute_event_hash
 
 
-def load_chain():
+def load_chain() -> List[Dict[str, Any]]:
     """
-    Load entire chain from JSONL file.
-    Returns a list of event dicts.
+    Load entire chain from the chain store.
+    Returns a list of event dicts (prefer iter_events for large chains).
     """
-    if not os.path.exists(CHAIN_FILE):
-        return []
+    return list(iter_events())
 
-    with open(CHAIN_FILE, "r", encoding="utf-8") as f:
-        return [json.loads(line.strip()) for line in f if line.strip()]
+
+def iter_events(
+    start: Optional[int] = None, stop: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield events start <= index < stop, one at a time."""
+    return get_store().iter_events(start=start or 0, stop=stop)
 
 
 def get_all_events():
@@ -24,49 +26,47 @@ def get_all_events():
 
 def get_event_by_index(index: int):
     """Return event at index or None."""
-    chain = load_chain()
-    if index < 0 or index >= len(chain):
+    if index < 0:
         return None
-    return chain[index]
+    return get_store().get(index)
+
+
+def get_event_by_id(event_id: str):
+    """Return the event with event_id or None (id index + one read)."""
+    return get_store().get_by_id(event_id)
+
+
+def get_events_range(start: int, limit: int) -> List[Dict[str, Any]]:
+    """Return up to `limit` events starting at index `start`."""
+    return list(iter_events(start, start + limit))
 
 
 def get_chain_length():
     """Return number of events in chain."""
-    return len(load_chain())
+    return len(get_store())
 
 
 def get_last_event_hash():
-    """Return event_hash of last event, or None."""
-    chain = load_chain()
-    if not chain:
-        return None
-    return chain[-1].get("event_hash")
+    """Return hash of last event, or None."""
+    return get_store().head.last_hash or None
 
 
 def get_latest_event():
     """Return the last event object in the chain."""
-    chain = load_chain()
-    if not chain:
-        return None
-    return chain[-1]
+    return get_store().tail()
 
 
 def append_event_to_chain(event: dict):
     """
     Append an event to the chain.
-    - Computes event_hash
     - Adds prev_hash
-    - Appends to JSONL file
+    - Computes hash
+    - Appends to the chain store
     """
-    chain = load_chain()
-    prev_hash = chain[-1]["event_hash"] if chain else None
-
-    event_hash = compute_event_hash(event, prev_hash)
-
-    event["prev_hash"] = prev_hash
-    event["event_hash"] = event_hash
-
-    with open(CHAIN_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    store = get_store()
+    with store.lock:
+        event["prev_hash"] = store.head.last_hash or None
+        event["hash"] = compute_event_hash(event)
+        store.append(event)
 
     return event
@@ -0,0 +1,260 @@
+# app/engine/diagnostics/analysis.py
+"""
+Shared chain analysis.
+
+/events/verify, /events/chain, /diagnostics and the diagnostics CLI are all
+views over one ChainAnalysis: a single streaming validation pass that records
+per-event errors, prev_hash linkage breaks, missing fields and the clean
+(checkpointable) prefix.
+
+The analyzer caches the latest result keyed on the chain head (length and
+head hash). Callers that arrive while a pass is running wait for it instead
+of starting their own. When the chain has only grown since the cached pass,
+only the new events are analyzed.
+
+Results are kept compact: for a valid event the computed hash equals the
+stored one, so only exceptions (errors, link breaks, differing hashes) are
+stored, keyed by chain index.
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.core import metrics
+from app.core.paths import CHECKPOINT_FILE
+from app.engine.state.chain_store import ChainStore, event_hash_of
+from app.engine.state.checkpoints import record_checkpoint, resume_point
+from app.engine.state.event_chain import get_store
+from app.engine.validation.validator import EventValidator, ValidationResult
+
+REQUIRED_FIELDS = ("event_id", "event_type", "payload", "timestamp", "hash")
+
+
+class ChainAnalysis(NamedTuple):
+    """
+    Analysis of events base <= index < length. Events before `base` are
+    covered by the signed checkpoint the pass started from.
+    """
+
+    base: int
+    length: int
+    head_hash: str
+    errors: Dict[int, List[str]]  # validation errors of invalid events
+    computed: Dict[int, str]  # computed hash, where it differs from the stored one
+    links: Dict[int, str]  # prev_hash linkage breaks
+    missing: Dict[int, List[str]]  # required fields absent
+    last_computed: Optional[str]  # computed hash of the last event
+    clean_through: int  # last index of the clean prefix (base - 1 if none)
+    clean_open: bool  # False once an issue ended the clean prefix
+    checkpoint: Optional[Dict[str, Any]]
+    analyzed_at: float
+    elapsed: float  # seconds spent on this result (incl. extensions)
+
+    @property
+    def status(self) -> str:
+        return "ok" if not self.issue_indexes() else "issues_detected"
+
+    def result(self, index: int, event: Dict[str, Any]) -> ValidationResult:
+        """validate()-shaped result for the event at `index`."""
+        errors = self.errors.get(index, [])
+        computed = self.computed.get(index) or event_hash_of(event)
+        return not errors, {"errors": errors, "computed_hash": computed}
+
+    def issues(self, index: int) -> List[str]:
+        """Every problem found at `index`: validation, linkage, missing fields."""
+        found = list(self.errors.get(index, []))
+        if index in self.links:
+            found.append(self.links[index])
+        found.extend(f"missing_field:{f}" for f in self.missing.get(index, []))
+        return found
+
+    def issue_indexes(self) -> List[int]:
+        return sorted(set(self.errors) | set(self.links) | set(self.missing))
+
+
+def _link_error(expected: str, actual: Optional[str]) -> str:
+    return f"chain_link_mismatch: expected prev_hash={expected}, got={actual}"
+
+
+class ChainAnalyzer:
+    def __init__(
+        self,
+        store: Optional[ChainStore] = None,
+        validator: Optional[EventValidator] = None,
+        checkpoint_path: Path = CHECKPOINT_FILE,
+    ):
+        self._store = store
+        self.checkpoint_path = checkpoint_path
+        self.validator = validator if validator is not None else EventValidator()
+        self._lock = threading.Lock()
+        self._current: Optional[ChainAnalysis] = None
+        self.passes = 0  # analysis passes run (full or incremental)
+
+    @property
+    def store(self) -> ChainStore:
+        return self._store if self._store is not None else get_store()
+
+    def cached(self) -> Optional[ChainAnalysis]:
+        return self._current
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._current = None
+
+    # -------------------------
+    # Analysis
+    # -------------------------
+
+    def analyze(self, full: bool = False) -> ChainAnalysis:
+        """
+        Analysis of the current chain. full=True requires a pass from genesis
+        (checkpoints are not trusted); otherwise a pass may start after the
+        latest valid checkpoint.
+        """
+        store = self.store
+        current = self._current
+        if current is not None and self._is_current(store, current, full):
+            return current
+
+        with self._lock:
+            current = self._current
+            if current is not None and self._is_current(store, current, full):
+                return current
+            if current is not None and not (full and current.base > 0):
+                if self._extends(store, current):
+                    analysis = self._extend(store, current)
+                    self._current = analysis
+                    return analysis
+            self._current = self._fresh(store, full)
+            return self._current
+
+    @staticmethod
+    def _is_current(store: ChainStore, analysis: ChainAnalysis, full: bool) -> bool:
+        if full and analysis.base > 0:
+            return False
+        head = store.head
+        return analysis.length == head.length and analysis.head_hash == head.last_hash
+
+    @staticmethod
+    def _extends(store: ChainStore, analysis: ChainAnalysis) -> bool:
+        """True if the chain only grew since `analysis` (append-only)."""
+        if store.head.length < analysis.length:
+            return False
+        if analysis.length == 0:
+            return True
+        tail = store.get(analysis.length - 1)
+        return event_hash_of(tail) == analysis.head_hash
+
+    def _fresh(self, store: ChainStore, full: bool) -> ChainAnalysis:
+        checkpoint, start = resume_point(store, full=full, path=self.checkpoint_path)
+        empty = ChainAnalysis(
+            base=start,
+            length=start,
+            head_hash=checkpoint["tail_hash"] if checkpoint else "",
+            errors={},
+            computed={},
+            links={},
+            missing={},
+            last_computed=checkpoint["tail_hash"] if checkpoint else None,
+            clean_through=start - 1,
+            clean_open=True,
+            checkpoint=checkpoint,
+            analyzed_at=0.0,
+            elapsed=0.0,
+        )
+        return self._extend(store, empty)
+
+    def _extend(self, store: ChainStore, prev: ChainAnalysis) -> ChainAnalysis:
+        """Analyze events prev.length.. and fold them into a new result."""
+        started = time.perf_counter()
+        errors, computed = dict(prev.errors), dict(prev.computed)
+        links, missing = dict(prev.links), dict(prev.missing)
+        last_hash = prev.last_computed
+        clean_through, clean_open = prev.clean_through, prev.clean_open
+
+        head = store.head
+        head_hash = prev.head_hash
+        events = store.iter_events(start=prev.length, stop=head.length)
+        for index, (event, (is_valid, result)) in enumerate(
+            self.validator.iter_validate(events), prev.length
+        ):
+            computed_hash = result.get("computed_hash")
+            stored_hash = event_hash_of(event)
+            if not is_valid:
+                errors[index] = result["errors"]
+            if computed_hash != stored_hash:
+                computed[index] = computed_hash
+
+            prev_hash = event.get("prev_hash")
+            linked = not last_hash or prev_hash == last_hash
+            if not linked:
+                links[index] = _link_error(last_hash, prev_hash)
+
+            absent = [f for f in REQUIRED_FIELDS if f not in event]
+            if absent:
+                missing[index] = absent
+
+            if clean_open and is_valid and stored_hash and linked:
+                clean_through = index
+            else:
+                clean_open = False
+            last_hash = computed_hash
+            head_hash = stored_hash
+        length = max(head.length, prev.length)
+        self.passes += 1
+
+        checkpoint = prev.checkpoint
+        last_checkpointed = checkpoint["last_index"] if checkpoint else -1
+        if clean_through > last_checkpointed:
+            tail_hash = event_hash_of(store.get(clean_through))
+            checkpoint = (
+                record_checkpoint(clean_through, tail_hash, self.checkpoint_path)
+                or checkpoint
+            )
+        metrics.mark_verified(length, from_genesis=prev.base == 0)
+
+        return prev._replace(
+            length=length,
+            head_hash=head_hash,
+            errors=errors,
+            computed=computed,
+            links=links,
+            missing=missing,
+            last_computed=last_hash,
+            clean_through=clean_through,
+            clean_open=clean_open,
+            checkpoint=checkpoint,
+            analyzed_at=time.time(),
+            elapsed=prev.elapsed + time.perf_counter() - started,
+        )
+
+    # -------------------------
+    # Views
+    # -------------------------
+
+    def iter_results(
+        self, analysis: ChainAnalysis, start: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any], ValidationResult]]:
+        """(index, event, result) for analysed events, in chain order."""
+        first = analysis.base if start is None else max(start, analysis.base)
+        events = self.store.iter_events(start=first, stop=analysis.length)
+        for index, event in enumerate(events, first):
+            yield index, event, analysis.result(index, event)
+
+
+# ------------------------------------------------------------
+# Process-wide analyzer
+# ------------------------------------------------------------
+
+_analyzer: Optional[ChainAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_analyzer() -> ChainAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = ChainAnalyzer()
+    return _analyzer
@@ -0,0 +1,504 @@
+# app/engine/diagnostics/audit.py
+"""
+Parallel, resumable full-chain audit.
+
+The chain is cut into chunks of consecutive events. Each chunk is sent to the
+verification pool as raw stored records (canonical bytes + trailer), so workers
+never re-canonicalize and pickling stays small. A worker validates its events
+and checks prev_hash linkage inside the chunk; the parent reassembles results
+in chain order and checks the links across chunk boundaries.
+
+After every chunk the parent appends the chunk's issues to an NDJSON sidecar
+(<state>.issues.ndjson) and saves a small state file holding only the cursor,
+so an interrupted audit continues with --resume where it stopped, over the
+range it was started on, however much the chain grew since. A clean prefix
+audited from genesis is recorded as a signed verification checkpoint.
+
+    python truetrace.py audit --workers 8 --format ndjson --output report.ndjson
+    python -m app.engine.diagnostics.audit --from 1000 --to 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from app.core import config, metrics
+from app.core.paths import CHAIN_DIR, CHECKPOINT_FILE
+from app.engine.state.chain_store import ChainStore, event_hash_of
+from app.engine.state.checkpoints import latest_checkpoint, record_checkpoint
+from app.engine.state.event_chain import get_store
+from app.engine.validation.hash_validation import CanonicalEvent
+from app.engine.validation.validator import EventValidator, _get_pool
+
+AUDIT_STATE_FILE = CHAIN_DIR / "audit_state.json"
+STATE_VERSION = 2
+
+Record = Tuple[bytes, bytes]  # (canonical bytes, trailer JSON)
+
+
+# ------------------------------------------------------------
+# Chunk work (runs in the verification pool)
+# ------------------------------------------------------------
+
+
+def _audit_chunk(
+    validator: EventValidator, start: int, records: List[Record]
+) -> Dict[str, Any]:
+    """
+    Validate one chunk. Returns its issues plus what the parent needs to
+    stitch chunks together: the first event's prev_hash, the last event's
+    computed hash, and how long the clean (valid + linked) prefix is.
+    """
+    issues = []
+    first_id = first_prev = None
+    last_hash = None
+    clean = 0
+    clean_run = True
+
+    for offset, (canon, trailer) in enumerate(records):
+        event = json.loads(canon)
+        event.update(json.loads(trailer))
+        is_valid, result = validator.validate(event, CanonicalEvent(event, canon))
+
+        errors = list(result["errors"]) if not is_valid else []
+        prev_hash = event.get("prev_hash")
+        if offset == 0:
+            first_id, first_prev = event.get("event_id"), prev_hash
+        elif last_hash and prev_hash != last_hash:
+            errors.append(_linkage_error(last_hash, prev_hash))
+
+        if errors:
+            clean_run = False
+            issues.append(
+                {
+                    "index": start + offset,
+                    "event_id": event.get("event_id"),
+                    "errors": errors,
+                }
+            )
+        elif clean_run and event_hash_of(event):
+            clean = offset + 1
+        else:
+            clean_run = False
+        last_hash = result.get("computed_hash")
+
+    return {
+        "start": start,
+        "count": len(records),
+        "issues": issues,
+        "first_id": first_id,
+        "first_prev": first_prev,
+        "last_hash": last_hash,
+        "clean": clean,
+    }
+
+
+def _linkage_error(expected: str, actual: Optional[str]) -> str:
+    return f"linkage_mismatch: expected prev_hash={expected}, got={actual}"
+
+
+# ------------------------------------------------------------
+# Progress
+# ------------------------------------------------------------
+
+
+class Progress:
+    """Throughput / ETA line on a terminal stream, redrawn at most every interval."""
+
+    def __init__(self, total: int, stream: IO = sys.stderr, interval: float = 0.5):
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.started = time.monotonic()
+        self._last_draw = 0.0
+
+    def update(self, done: int, issues: int, final: bool = False) -> None:
+        now = time.monotonic()
+        if not final and now - self._last_draw < self.interval:
+            return
+        self._last_draw = now
+        elapsed = max(now - self.started, 1e-9)
+        rate = done / elapsed
+        pct = 100.0 * done / self.total if self.total else 100.0
+        eta = (self.total - done) / rate if rate else 0.0
+        self.stream.write(
+            f"\raudited {done}/{self.total} ({pct:5.1f}%)  {rate:,.0f} ev/s  "
+            f"ETA {_hms(eta)}  issues {issues}"
+        )
+        if final:
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+def _hms(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+# ------------------------------------------------------------
+# Resume state
+# ------------------------------------------------------------
+
+
+def load_state(path: Path) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(path: Path, state: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def issues_path(state_path: Path) -> Path:
+    """NDJSON sidecar holding the issues confirmed so far, one per line."""
+    state_path = Path(state_path)
+    return state_path.with_name(state_path.name + ".issues.ndjson")
+
+
+def load_issues(path: Path, count: int) -> List[Dict[str, Any]]:
+    """
+    The first `count` issues of the sidecar. Lines past them (written for a
+    chunk whose state save was interrupted) are cut off.
+    """
+    path = Path(path)
+    issues = []
+    if not path.exists():
+        if count:
+            raise ValueError(f"{path} is missing {count} saved issues")
+        return issues
+    with path.open("r+b") as f:
+        while len(issues) < count:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                raise ValueError(f"{path} holds fewer than {count} issues")
+            issues.append(json.loads(line))
+        f.truncate(f.tell())
+    return issues
+
+
+def _append_issues(path: Path, issues: List[Dict[str, Any]]) -> None:
+    if not issues:
+        return
+    with Path(path).open("a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(i, separators=(",", ":")) + "\n" for i in issues))
+
+
+# ------------------------------------------------------------
+# Audit
+# ------------------------------------------------------------
+
+
+def run_audit(
+    store: Optional[ChainStore] = None,
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+    workers: Optional[int] = None,
+    executor: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    state_path: Optional[Path] = None,
+    resume: bool = False,
+    checkpoint_path: Path = CHECKPOINT_FILE,
+    progress: Optional[Progress] = None,
+    on_issue: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Audit events start <= index < stop. Returns the summary; issues are
+    passed to on_issue in chain order as they are confirmed (and listed
+    in the summary's "issues").
+
+    With resume, a saved state fixes the range: start/stop may be omitted
+    and are only checked against it when given.
+    """
+    store = store if store is not None else get_store()
+    workers = workers if workers is not None else config.VERIFY_WORKERS
+    chunk_size = chunk_size or config.VERIFY_CHUNK_SIZE
+    validator = EventValidator(workers=workers, executor=executor)
+
+    length = len(store)
+    sidecar = issues_path(state_path) if state_path is not None else None
+
+    state = None
+    if resume and state_path is not None:
+        state = load_state(state_path)
+    if state is not None:
+        _check_resume_range(state, start, stop, length)
+        start, stop = state["from"], state["to"]
+        issues = load_issues(sidecar, state["issues_found"])
+    else:
+        requested = stop
+        stop = length if stop is None else min(stop, length)
+        start = max(0, min(start or 0, stop))
+        state = _initial_state(store, start, stop, requested, checkpoint_path)
+        issues = []
+        if sidecar is not None:
+            sidecar.unlink(missing_ok=True)
+    for issue in issues:
+        if on_issue:
+            on_issue(issue)
+
+    next_index = state["next"]
+    total = stop - start
+    if progress is not None:
+        progress.total = total
+        progress.update(next_index - start, len(issues), final=False)
+
+    pool = None
+    if workers > 1 and stop - next_index > chunk_size:
+        pool = _get_pool(validator.executor, workers)
+
+    def chunks():
+        index = next_index
+        records = []
+        for record in store.iter_records(start=next_index, stop=stop):
+            records.append((bytes(record.canonical), bytes(record.trailer)))
+            if len(records) == chunk_size:
+                yield index, records
+                index += len(records)
+                records = []
+        if records:
+            yield index, records
+
+    pending = deque()
+    window = max(2 * workers, 2)
+    source = chunks()
+
+    def fill():
+        for chunk_start, records in source:
+            if pool is None:
+                pending.append(_audit_chunk(validator, chunk_start, records))
+            else:
+                pending.append(
+                    pool.submit(_audit_chunk, validator, chunk_start, records)
+                )
+            if len(pending) >= window:
+                return
+
+    fill()
+    while pending:
+        item = pending.popleft()
+        chunk = item if isinstance(item, dict) else item.result()
+        new_issues = _merge_chunk(state, chunk)
+        issues.extend(new_issues)
+        if state_path is not None:
+            # issues first: lines past the saved count are dropped on resume
+            _append_issues(sidecar, new_issues)
+            save_state(state_path, state)
+        if on_issue:
+            for issue in new_issues:
+                on_issue(issue)
+        if progress is not None:
+            progress.update(state["next"] - start, len(issues))
+        fill()
+
+    if progress is not None:
+        progress.update(state["next"] - start, len(issues), final=True)
+
+    checkpoint = None
+    clean_through = state["clean_through"]
+    if clean_through is not None and clean_through > state["clean_from"]:
+        tail_hash = event_hash_of(store.get(clean_through))
+        checkpoint = record_checkpoint(clean_through, tail_hash, checkpoint_path)
+    if start == 0 and stop == length:
+        metrics.mark_verified(stop, from_genesis=True)
+
+    summary = {
+        "from": start,
+        "to": stop,
+        "audited": state["next"] - start,
+        "issues_found": len(issues),
+        "status": "ok" if not issues else "issues_detected",
+        "checkpoint": checkpoint,
+        "issues": issues,
+    }
+    if state_path is not None:
+        # finished: the next run starts over
+        Path(state_path).unlink(missing_ok=True)
+        sidecar.unlink(missing_ok=True)
+    return summary
+
+
+def _check_resume_range(
+    state: Dict[str, Any], start: Optional[int], stop: Optional[int], length: int
+) -> None:
+    """
+    Refuse to resume when an explicit --from/--to names another range. The
+    chain may have grown since the audit started, so --to matches either
+    the clamped end it was saved with or the value originally asked for.
+    """
+    saved_from, saved_to = state["from"], state["to"]
+    if (start is not None and start != saved_from) or (
+        stop is not None and stop not in (saved_to, state["requested_to"])
+    ):
+        raise ValueError(
+            f"saved audit covers [{saved_from}, {saved_to}), "
+            f"not [{saved_from if start is None else start}, "
+            f"{saved_to if stop is None else stop})"
+        )
+    if saved_to > length:
+        raise ValueError(
+            f"saved audit covers [{saved_from}, {saved_to}), "
+            f"but the chain only holds {length} events"
+        )
+
+
+def _initial_state(
+    store: ChainStore,
+    start: int,
+    stop: int,
+    requested_to: Optional[int],
+    checkpoint_path: Path,
+) -> Dict[str, Any]:
+    """
+    Fresh state for [start, stop). The first event is linked against the
+    stored hash of its predecessor; the clean prefix (what a signed
+    checkpoint may cover) can only grow from genesis or from a trusted
+    checkpoint ending right before `start`.
+    """
+    last_hash = None
+    clean_through = -1 if start == 0 else None
+    if start > 0:
+        last_hash = event_hash_of(store.get(start - 1)) or None
+        checkpoint = latest_checkpoint(store, checkpoint_path)
+        if checkpoint is not None and checkpoint["last_index"] == start - 1:
+            clean_through = start - 1
+    return {
+        "version": STATE_VERSION,
+        "from": start,
+        "to": stop,
+        "requested_to": requested_to,
+        "next": start,
+        "last_hash": last_hash,
+        "clean_through": clean_through,
+        "clean_from": clean_through,
+        "issues_found": 0,
+        "started_at": int(time.time()),
+    }
+
+
+def _merge_chunk(state: Dict[str, Any], chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Fold one chunk's results into the running state, in chain order.
+    Returns the chunk's issues, including a broken link into it.
+    """
+    issues = chunk["issues"]
+    start = chunk["start"]
+    last_hash = state["last_hash"]
+
+    # linkage across the boundary with the previous chunk
+    boundary_ok = not last_hash or chunk["first_prev"] == last_hash
+    if not boundary_ok:
+        error = _linkage_error(last_hash, chunk["first_prev"])
+        if issues and issues[0]["index"] == start:
+            issues[0]["errors"].insert(0, error)
+        else:
+            issues.insert(
+                0, {"index": start, "event_id": chunk["first_id"], "errors": [error]}
+            )
+
+    state["issues_found"] += len(issues)
+
+    # the clean prefix grows only while every event so far was clean
+    if state["clean_through"] == start - 1 and boundary_ok:
+        state["clean_through"] = start + chunk["clean"] - 1
+
+    state["next"] = start + chunk["count"]
+    state["last_hash"] = chunk["last_hash"]
+    return issues
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers", type=int, default=None, help="verification workers (1 = serial)"
+    )
+    parser.add_argument(
+        "--executor", choices=("process", "thread"), default=None, help="pool kind"
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument(
+        "--from",
+        dest="start",
+        type=int,
+        default=None,
+        help="first index (inclusive, default 0)",
+    )
+    parser.add_argument(
+        "--to", dest="stop", type=int, default=None, help="last index (exclusive)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted audit from the state file",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=AUDIT_STATE_FILE,
+        help=f"resume state file (default {AUDIT_STATE_FILE})",
+    )
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json")
+    parser.add_argument(
+        "--output", type=Path, default=None, help="report file (default stdout)"
+    )
+    parser.add_argument("--quiet", action="store_true", help="no progress display")
+
+
+def run_audit_cli(args: argparse.Namespace) -> int:
+    """Run an audit from parsed arguments. Exit status 1 if issues were found."""
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+
+        def write_issue(issue):
+            out.write(json.dumps({"type": "issue", **issue}) + "\n")
+            out.flush()
+
+        summary = run_audit(
+            start=args.start,
+            stop=args.stop,
+            workers=args.workers,
+            executor=args.executor,
+            chunk_size=args.chunk_size,
+            state_path=args.state,
+            resume=args.resume,
+            progress=None if args.quiet else Progress(0),
+            on_issue=write_issue if args.format == "ndjson" else None,
+        )
+        if args.format == "ndjson":
+            summary.pop("issues")
+            out.write(json.dumps({"type": "summary", **summary}) + "\n")
+        else:
+            issues = summary.pop("issues")
+            out.write(json.dumps({"summary": summary, "issues": issues}, indent=2))
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0 if summary["status"] == "ok" else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="TrueTrace parallel chain audit")
+    add_arguments(parser)
+    return run_audit_cli(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,21 @@
-import json
+from app.engine.diagnostics.analysis import ChainAnalyzer
 
-from app.engine.state.event_chain import get_all_events
-from app.engine.validation.validator import EventValidator
 
-
-def run_cli_diagnostics():
-    validator = EventValidator()
-    events = get_all_events()
+def run_cli_diagnostics(full: bool = False):
+    analyzer = ChainAnalyzer()
+    analysis = analyzer.analyze(full=full)
+    checkpoint = analysis.checkpoint if analysis.base else None
 
     print("\n=== TrueTrace Local Diagnostics ===\n")
-    print(f"Loaded {len(events)} events\n")
-
-    last_hash = None
-
-    for i, event in enumerate(events):
-        is_valid, result = validator.validate(event)
-        event_id = event.get("event_id")
-        prev_hash = event.get("prev_hash")
+    print(f"Loaded {analysis.length} events\n")
+    if checkpoint:
+        print(
+            f"Resuming after checkpoint at index {checkpoint['last_index']} "
+            f"(verified_at={checkpoint['verified_at']})\n"
+        )
 
-        print(f"[{i}] Event ID: {event_id}")
+    for i, event, (is_valid, result) in analyzer.iter_results(analysis):
+        print(f"[{i}] Event ID: {event.get('event_id')}")
 
         if not is_valid:
             print("  ❌ Validation Errors:")
@@ -27,11 +24,13 @@ def run_cli_diagnostics():
         else:
             print("  ✅ Valid")
 
-        if last_hash and prev_hash != last_hash:
-            print(f"  ❌ Chain linkage mismatch (expected prev_hash={last_hash})")
+        if i in analysis.links:
+            print(f"  ❌ {analysis.links[i]}")
 
         print("")
 
-        last_hash = result.get("computed_hash")
+    new_checkpoint = analysis.checkpoint
+    if new_checkpoint and new_checkpoint is not checkpoint:
+        print(f"Checkpoint recorded at index {new_checkpoint['last_index']}\n")
 
     print("=== End Diagnostics ===")
@@ -0,0 +1,337 @@
+# app/engine/ingest/pipeline.py
+"""
+Group-commit ingestion pipeline.
+
+Requests are queued on an asyncio queue and a single writer task drains it:
+it takes up to max_batch_size events (waiting at most max_linger_ms for more),
+assigns prev_hash in queue order, hashes, signs, validates, and persists the
+whole batch with one store write + fsync. Each request's future resolves once
+its batch is durable.
+
+Because only the writer assigns prev_hash (under the store's writer lock),
+linkage stays correct no matter how many requests arrive concurrently.
+"""
+import asyncio
+import hashlib
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from nacl.signing import SigningKey
+
+from app.core import config
+from app.core.key_registry import get_signing_key
+from app.core.offload import run_writer
+from app.engine.state.chain_store import ChainStore
+from app.engine.state.event_chain import get_store
+from app.engine.validation.hash_validation import (
+    CanonicalEvent,
+    canonical_json_bytes,
+    filtered_for_hash,
+)
+from app.engine.validation.validator import EventValidator
+
+
+class EventRejected(Exception):
+    """An event failed validation and was not written."""
+
+    def __init__(self, errors: List[str], computed_hash: Optional[str] = None):
+        super().__init__("event failed validation")
+        self.errors = errors
+        self.computed_hash = computed_hash
+
+
+# ------------------------------------------------------------
+# Event construction
+# ------------------------------------------------------------
+
+
+def build_event(
+    event_type: str,
+    payload: Dict[str, Any],
+    prev_hash: str,
+    signing_key: SigningKey,
+) -> CanonicalEvent:
+    """
+    Build a signed version 1.5 TrueTrace event:
+      - SHA256 canonical hash
+      - Ed25519 signature (HEX)
+      - Ed25519 public key (HEX)
+    Returned with its canonical bytes so validation does not redo them.
+    """
+    base_event = {
+        "event_id": f"evt-{uuid.uuid4().hex[:12]}",
+        "event_version": "1.5",
+        "timestamp": int(datetime.now(timezone.utc).timestamp()),
+        "event_type": event_type,
+        "payload": payload,
+        "prev_hash": prev_hash,
+        "origin": "system",
+        "trace_id": uuid.uuid4().hex,
+    }
+
+    filtered = filtered_for_hash(base_event)
+    canonical_bytes = canonical_json_bytes(filtered)
+
+    full_event = dict(filtered)
+    full_event["hash"] = hashlib.sha256(canonical_bytes).hexdigest()
+    full_event["signature"] = signing_key.sign(canonical_bytes).signature.hex()
+    full_event["pubkey"] = signing_key.verify_key.encode().hex()
+    return CanonicalEvent(full_event, canonical_bytes)
+
+
+# ------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------
+
+
+class _Job:
+    """One submission: a single event or a batch that commits together."""
+
+    __slots__ = ("items", "atomic", "future", "outcomes", "indexes")
+
+    def __init__(self, items, atomic: bool, future: asyncio.Future):
+        self.items = items  # list of (event_type, payload)
+        self.atomic = atomic
+        self.future = future
+        self.outcomes: List[Union[Dict[str, Any], Exception]] = []
+        # chain index of each created event, None for a rejected item
+        self.indexes: List[Optional[int]] = []
+
+
+class IngestPipeline:
+    def __init__(
+        self,
+        store: Optional[ChainStore] = None,
+        max_batch_size: Optional[int] = None,
+        max_linger_ms: Optional[int] = None,
+        validator: Optional[EventValidator] = None,
+    ):
+        self._store = store
+        self.max_batch_size = max_batch_size or config.INGEST_MAX_BATCH_SIZE
+        self.max_linger = (
+            max_linger_ms if max_linger_ms is not None else config.INGEST_MAX_LINGER_MS
+        ) / 1000.0
+        self.validator = validator or EventValidator()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batches_committed = 0
+        self.events_committed = 0
+        self.last_batch_size = 0
+
+    @property
+    def store(self) -> ChainStore:
+        return self._store if self._store is not None else get_store()
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    async def start(self) -> None:
+        """Start the writer task on the running loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        # a writer bound to another (finished) loop is simply replaced
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything queued, then stop the writer."""
+        if self._task is None or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def queue_depth(self) -> int:
+        """Events waiting for the writer."""
+        if self._queue is None:
+            return 0
+        return sum(len(job.items) for job in list(self._queue._queue))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queue_depth": self.queue_depth(),
+            "max_batch_size": self.max_batch_size,
+            "max_linger_ms": self.max_linger * 1000.0,
+            "batches_committed": self.batches_committed,
+            "events_committed": self.events_committed,
+            "last_batch_size": self.last_batch_size,
+        }
+
+    # -------------------------
+    # Submission
+    # -------------------------
+
+    async def submit(
+        self, event_type: str, payload: Dict[str, Any], indexed: bool = False
+    ) -> Union[Dict[str, Any], Tuple[int, Dict[str, Any]]]:
+        """
+        Queue one event; returns it once durable, raises EventRejected.
+        With indexed=True returns (chain index, event).
+        """
+        job = await self._submit([(event_type, payload)], atomic=True)
+        (outcome,), (index,) = job.outcomes, job.indexes
+        if isinstance(outcome, Exception):
+            raise outcome
+        return (index, outcome) if indexed else outcome
+
+    async def submit_many(
+        self,
+        items: List[Tuple[str, Dict[str, Any]]],
+        atomic: bool = False,
+        indexed: bool = False,
+    ) -> List[Any]:
+        """
+        Queue (event_type, payload) items that are chained in order and
+        written as one append group. Returns one outcome per item: the
+        created event or its EventRejected. With atomic=True a single
+        rejection writes nothing and every item reports an error. With
+        indexed=True each outcome comes as (chain index or None, outcome).
+        """
+        if not items:
+            return []
+        job = await self._submit(list(items), atomic=atomic)
+        if indexed:
+            return list(zip(job.indexes, job.outcomes))
+        return job.outcomes
+
+    async def _submit(self, items, atomic: bool) -> _Job:
+        await self.start()
+        job = _Job(items, atomic, self._loop.create_future())
+        await self._queue.put(job)
+        await job.future
+        return job
+
+    # -------------------------
+    # Writer
+    # -------------------------
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0].items)
+            deadline = loop.time() + self.max_linger
+
+            while size < self.max_batch_size:
+                try:
+                    job = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        job = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                batch.append(job)
+                size += len(job.items)
+
+            try:
+                # signing + validation + append, on the dedicated writer thread
+                await run_writer(self._commit, batch)
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_result(None)
+            except Exception as e:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _commit(self, batch: List[_Job]) -> None:
+        """Chain, sign and validate a batch, then persist it in one write."""
+        store = self.store
+        signing_key = get_signing_key()
+
+        with store.lock:
+            prev_hash = store.head.last_hash
+            accepted: List[Dict[str, Any]] = []
+            placed: List[_Job] = []
+
+            for job in batch:
+                job_prev = prev_hash
+                job_events = []
+                outcomes: List[Union[Dict[str, Any], Exception]] = []
+
+                for event_type, payload in job.items:
+                    built = build_event(event_type, payload, job_prev, signing_key)
+                    event = built.event
+                    is_valid, result = self.validator.validate(event, built)
+                    if not is_valid:
+                        outcomes.append(
+                            EventRejected(result["errors"], result.get("computed_hash"))
+                        )
+                        continue
+                    outcomes.append(event)
+                    job_events.append(event)
+                    job_prev = event["hash"]
+
+                rejected = len(job_events) < len(job.items)
+                if job.atomic and rejected:
+                    job.indexes = [None] * len(outcomes)
+                    job.outcomes = [
+                        (
+                            o
+                            if isinstance(o, Exception)
+                            else EventRejected(["batch_aborted"])
+                        )
+                        for o in outcomes
+                    ]
+                    continue
+
+                # positions in `accepted` for now, chain indexes once written
+                position = len(accepted)
+                job.indexes = []
+                for outcome in outcomes:
+                    if isinstance(outcome, Exception):
+                        job.indexes.append(None)
+                    else:
+                        job.indexes.append(position)
+                        position += 1
+                job.outcomes = outcomes
+                placed.append(job)
+                accepted.extend(job_events)
+                prev_hash = job_prev
+
+            if accepted:
+                first_index = store.append_many(accepted)
+                for job in placed:
+                    job.indexes = [
+                        None if i is None else first_index + i for i in job.indexes
+                    ]
+                self.batches_committed += 1
+                self.events_committed += len(accepted)
+                self.last_batch_size = len(accepted)
+
+
+# ------------------------------------------------------------
+# Process-wide pipeline
+# ------------------------------------------------------------
+
+_pipeline: Optional[IngestPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> IngestPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = IngestPipeline()
+    return _pipeline
@@ -0,0 +1,317 @@
+# app/engine/search/search_index.py
+"""
+Inverted index over the event chain for /events/search.
+
+Indexed:
+- exact-match fields: event_type, origin, trace_id
+- flattened payload keys ("payload.a.b") -> stringified values
+- timestamps (sorted, for range filters)
+- full-text terms from ids, types, payload keys and values
+
+Postings are chain indices in ascending order. The index follows the store
+through an append listener, catches up on demand, and can be saved to /
+rebuilt from SEARCH_INDEX_FILE offline:
+
+    python -m app.engine.search.search_index --rebuild
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.paths import SEARCH_INDEX_FILE
+from app.engine.state.chain_store import ChainStore, event_hash_of
+from app.engine.state.event_chain import get_store
+
+FIELDS = ("event_type", "origin", "trace_id")
+SNAPSHOT_VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+
+
+# ------------------------------------------------------------
+# Tokenizing / flattening
+# ------------------------------------------------------------
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    # JSON spelling for true/false/null/numbers
+    return json.dumps(value)
+
+
+def flatten_payload(value: Any, prefix: str = "payload") -> Iterable[Tuple[str, str]]:
+    """Yield (dotted_key, value_string) pairs; list items share their key."""
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from flatten_payload(v, f"{prefix}.{k}")
+    elif isinstance(value, list):
+        for v in value:
+            yield from flatten_payload(v, prefix)
+    else:
+        yield prefix, _scalar(value)
+
+
+# ------------------------------------------------------------
+# Index
+# ------------------------------------------------------------
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.height = 0  # events [0, height) are indexed
+        self.tail_hash = ""
+        self.fields: Dict[str, Dict[str, List[int]]] = {}
+        self.terms: Dict[str, List[int]] = {}
+        self.timestamps: List[Tuple[int, int]] = []
+
+    # -------------------------
+    # Updating
+    # -------------------------
+
+    def add(self, index: int, event: Dict[str, Any]) -> None:
+        """Index one event. Events must arrive in chain order."""
+        with self._lock:
+            if index != self.height:
+                return
+
+            terms = set()
+
+            for field in FIELDS:
+                value = event.get(field)
+                if value is None:
+                    continue
+                value = _scalar(value)
+                self._post(self.fields.setdefault(field, {}), value, index)
+                terms.update(tokenize(value))
+
+            for key, value in flatten_payload(event.get("payload")):
+                self._post(self.fields.setdefault(key, {}), value, index)
+                terms.update(tokenize(key[len("payload.") :]))
+                terms.update(tokenize(value))
+
+            event_id = event.get("event_id")
+            if isinstance(event_id, str):
+                terms.update(tokenize(event_id))
+
+            for term in terms:
+                self._post(self.terms, term, index)
+
+            ts = event.get("timestamp")
+            if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+                bisect.insort(self.timestamps, (int(ts), index))
+
+            self.height = index + 1
+            self.tail_hash = event_hash_of(event)
+
+    @staticmethod
+    def _post(postings: Dict[str, List[int]], key: str, index: int) -> None:
+        lst = postings.setdefault(key, [])
+        if not lst or lst[-1] != index:
+            lst.append(index)
+
+    def on_append(self, first_index: int, events: List[Dict[str, Any]]) -> None:
+        """ChainStore append listener."""
+        for offset, event in enumerate(events):
+            self.add(first_index + offset, event)
+
+    def catch_up(self, store: ChainStore) -> None:
+        """
+        Bring the index level with the store. A store that no longer
+        matches what was indexed (rewritten / truncated) triggers a rebuild.
+
+        The store is only read without the index lock held: append listeners
+        run under the store lock and take the index lock in add(), so taking
+        the two in the other order here would deadlock against a commit.
+        Events the listener adds meanwhile are skipped by add().
+        """
+        head = store.head
+        with self._lock:
+            height, tail_hash = self.height, self.tail_hash
+        if height == head.length and tail_hash == head.last_hash:
+            return
+        if height > head.length or (
+            height and event_hash_of(store.get(height - 1)) != tail_hash
+        ):
+            with self._lock:
+                if (self.height, self.tail_hash) == (height, tail_hash):
+                    self._reset()
+                height = self.height
+        for index, event in enumerate(
+            store.iter_events(start=height, stop=head.length), height
+        ):
+            self.add(index, event)
+
+    # -------------------------
+    # Querying
+    # -------------------------
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        filters: Optional[Dict[str, str]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Return matching chain indices in ascending order.
+        - text: all terms must match; a trailing * makes a term a prefix match
+        - filters: exact match on event_type / origin / trace_id / payload.<key>
+        - since / until: inclusive timestamp bounds
+        """
+        with self._lock:
+            candidates: List[set] = []
+
+            for field, value in (filters or {}).items():
+                candidates.append(set(self.fields.get(field, {}).get(value, ())))
+
+            for term in (text or "").split():
+                candidates.append(self._term_matches(term))
+
+            if since is not None or until is not None:
+                lo = bisect.bisect_left(
+                    self.timestamps, (since if since is not None else -(2**63), -1)
+                )
+                hi = bisect.bisect_right(
+                    self.timestamps, (until if until is not None else 2**63, 2**63)
+                )
+                candidates.append({i for _, i in self.timestamps[lo:hi]})
+
+            if not candidates:
+                return list(range(self.height))
+
+            candidates.sort(key=len)
+            result = candidates[0]
+            for other in candidates[1:]:
+                result = result & other
+                if not result:
+                    break
+            return sorted(result)
+
+    def _term_matches(self, term: str) -> set:
+        prefix = term.endswith("*")
+        tokens = tokenize(term)
+        if not tokens:
+            return set(range(self.height))
+
+        matches = None
+        for n, token in enumerate(tokens):
+            if prefix and n == len(tokens) - 1:
+                hits = set()
+                for key, postings in self.terms.items():
+                    if key.startswith(token):
+                        hits.update(postings)
+            else:
+                hits = set(self.terms.get(token, ()))
+            matches = hits if matches is None else matches & hits
+        return matches
+
+    # -------------------------
+    # Snapshots
+    # -------------------------
+
+    def save(self, path: Path = SEARCH_INDEX_FILE) -> None:
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_VERSION,
+                "height": self.height,
+                "tail_hash": self.tail_hash,
+                "fields": self.fields,
+                "terms": self.terms,
+                "timestamps": self.timestamps,
+            }
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+
+    def load(self, path: Path = SEARCH_INDEX_FILE) -> bool:
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if data.get("version") != SNAPSHOT_VERSION:
+            return False
+        with self._lock:
+            self.height = data["height"]
+            self.tail_hash = data["tail_hash"]
+            self.fields = data["fields"]
+            self.terms = data["terms"]
+            self.timestamps = [tuple(t) for t in data["timestamps"]]
+        return True
+
+
+# ------------------------------------------------------------
+# Process-wide index
+# ------------------------------------------------------------
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(store: Optional[ChainStore] = None) -> SearchIndex:
+    """
+    Return the shared index, attached to the chain store and caught up.
+    The snapshot (if any) is loaded first so only new events are indexed.
+    """
+    global _index
+    if store is None:
+        store = get_store()
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = SearchIndex()
+                index.load()
+                store.add_listener(index.on_append)
+                _index = index
+    _index.catch_up(store)
+    return _index
+
+
+def rebuild_search_index(
+    store: Optional[ChainStore] = None, path: Path = SEARCH_INDEX_FILE
+) -> SearchIndex:
+    """Index the whole chain from scratch and write the snapshot."""
+    index = SearchIndex()
+    index.catch_up(store if store is not None else get_store())
+    index.save(path)
+    return index
+
+
+def save_search_index(path: Path = SEARCH_INDEX_FILE) -> None:
+    """Persist the in-memory index (if one was built) so restarts resume."""
+    if _index is not None:
+        _index.save(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrueTrace search index")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="rebuild the snapshot from the chain"
+    )
+    args = parser.parse_args()
+    if args.rebuild:
+        idx = rebuild_search_index()
+        print(f"Indexed {idx.height} events -> {SEARCH_INDEX_FILE}")
+    else:
+        parser.print_help()
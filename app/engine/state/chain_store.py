@@ -0,0 +1,1025 @@
+# app/engine/state/chain_store.py
+"""
+Append-only segmented storage engine for the event chain.
+
+Layout (one directory):
+    00000000000000000000.seg   first segment, starts at chain index 0
+    00000000000000000000.idx   offset index: one u64 record offset per event
+    00000000000000004096.seg   next segment, starts at chain index 4096
+    ...
+    HEAD                       head pointer sidecar (see ChainHead)
+    ids.tbl                    event_id -> chain index hash table (see id_index)
+    LOCK                       flock()ed while writing; HEAD generation counter
+
+Each segment is a sequence of framed records:
+
+    magic "TT" | version u8 | flags u8 | body_len u32 | canon_len u32 | crc32 u32
+    body = canonical hashed bytes (canon_len) + compact JSON of hash/signature/pubkey
+
+Records store the exact canonical bytes that were hashed and signed, so the
+stored form is the authoritative one. The last record of every append group
+carries FLAG_COMMIT; on open, anything after the last committed record (a torn
+or half-written group) is truncated away.
+
+Reads go through read-only memory maps of the segment and .idx files: a random
+or tail read costs a page fault rather than a file parse, only the requested
+record is decoded, and every process serving the same store shares the OS
+page cache.
+
+Several processes (e.g. uvicorn workers) may open the same store. Appends,
+recovery and ids.idx writes hold an exclusive flock on LOCK, and a writer
+first brings its in-memory tail up to date with HEAD and the files on disk
+(cutting away a group left torn by a crashed peer). HEAD is replaced only
+after a group's records and offsets are written, so readers follow peers'
+appends by re-reading HEAD whenever the generation counter in LOCK moved:
+an 8-byte read from a shared map per read in the common case. Listeners
+only see this process's own appends; derived views catch up from the store.
+"""
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no flock(): single-process only
+    fcntl = None
+
+from app.core import config
+from app.engine.state.id_index import IdIndex
+from app.engine.validation.hash_validation import (
+    HASH_EXCLUDED_FIELDS,
+    canonical_event_bytes,
+)
+
+MAGIC = b"TT"
+FORMAT_VERSION = 1
+FLAG_COMMIT = 0x01
+
+_HEADER = struct.Struct("<2sBBIII")
+HEADER_SIZE = _HEADER.size
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+HEAD_FILE = "HEAD"
+IDS_FILE = "ids.tbl"
+LEGACY_IDS_FILE = "ids.idx"  # text index of earlier versions, removed on open
+LOCK_FILE = "LOCK"
+
+_OFFSET = struct.Struct("<Q")
+
+# events per append group when rewriting the store
+REPLACE_GROUP_SIZE = 4096
+
+AppendListener = Callable[[int, List[Dict[str, Any]]], None]
+
+
+# ------------------------------------------------------------
+# Record encoding
+# ------------------------------------------------------------
+
+
+def encode_record(event: Dict[str, Any], flags: int = 0) -> bytes:
+    """Frame a single event as a segment record."""
+    canon = canonical_event_bytes(event)
+    extras = {k: event[k] for k in HASH_EXCLUDED_FIELDS if k in event}
+    rest = json.dumps(extras, separators=(",", ":")).encode("utf-8")
+    body = canon + rest
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags, len(body), len(canon), zlib.crc32(body)
+    )
+    return header + body
+
+
+def decode_body(body: bytes, canon_len: int) -> Dict[str, Any]:
+    """Rebuild an event dict from a record body."""
+    event = json.loads(body[:canon_len])
+    event.update(json.loads(body[canon_len:]))
+    return event
+
+
+class StoredRecord(NamedTuple):
+    """
+    Zero-copy view of one record body inside a mapped segment.
+    canonical is exactly what was hashed and signed.
+    """
+
+    flags: int
+    canonical: memoryview
+    trailer: memoryview  # compact JSON of hash/signature/pubkey
+
+    def event(self) -> Dict[str, Any]:
+        event = json.loads(bytes(self.canonical))
+        event.update(json.loads(bytes(self.trailer)))
+        return event
+
+    def stored_hash(self) -> str:
+        return json.loads(bytes(self.trailer)).get("hash") or ""
+
+    def hash_ok(self) -> bool:
+        """True if the stored hash matches SHA-256 of the stored canonical bytes."""
+        return hashlib.sha256(self.canonical).hexdigest() == self.stored_hash()
+
+
+def read_record(f, offset: int = None) -> Optional[Tuple[int, int, bytes]]:
+    """
+    Read one record from an open binary file.
+    Returns (flags, canon_len, body) or None at a clean or torn end.
+    """
+    if offset is not None:
+        f.seek(offset)
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        return None
+    magic, version, flags, body_len, canon_len, crc = _HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION or canon_len > body_len:
+        return None
+    body = f.read(body_len)
+    if len(body) < body_len or zlib.crc32(body) != crc:
+        return None
+    return flags, canon_len, body
+
+
+def segment_name(first_index: int) -> str:
+    return f"{first_index:020d}{SEGMENT_SUFFIX}"
+
+
+def index_name(first_index: int) -> str:
+    return f"{first_index:020d}{INDEX_SUFFIX}"
+
+
+def event_hash_of(event: Optional[Dict[str, Any]]) -> str:
+    """Stored hash of an event ("hash", or the legacy "event_hash")."""
+    if not event:
+        return ""
+    return event.get("hash") or event.get("event_hash") or ""
+
+
+# ------------------------------------------------------------
+# Head pointer
+# ------------------------------------------------------------
+
+
+class ChainHead(NamedTuple):
+    """
+    Pointer to the last committed record.
+    last_index is -1 for an empty chain.
+    """
+
+    last_hash: str = ""
+    last_index: int = -1
+    segment: int = 0  # first chain index of the segment holding the tail
+    offset: int = 0  # byte offset of the tail record inside that segment
+
+    @property
+    def length(self) -> int:
+        return self.last_index + 1
+
+    def to_json(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ChainHead":
+        return cls(
+            last_hash=str(data["last_hash"]),
+            last_index=int(data["last_index"]),
+            segment=int(data["segment"]),
+            offset=int(data["offset"]),
+        )
+
+
+# ------------------------------------------------------------
+# Legacy JSON chain (migration source)
+# ------------------------------------------------------------
+
+
+def load_legacy_chain(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load the old whole-file JSON chain.
+    Accepts both a plain list and the {"events": [...]} layout.
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        return []
+
+    if isinstance(data, list):
+        return data
+
+    if isinstance(data, dict) and "events" in data and isinstance(data["events"], list):
+        return data["events"]
+
+    return []
+
+
+# ------------------------------------------------------------
+# Store
+# ------------------------------------------------------------
+
+
+class ChainStore:
+    """
+    Append-only event store made of rotating segment files.
+
+    - append / append_many: one write + one fsync per group
+    - tail(): O(1), served from memory
+    - get(index) / find(event_id): offset-index lookup + one seek-and-read
+    - opening only scans the last segment, never the whole chain
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        legacy_file: Optional[Path] = None,
+        segment_max_bytes: int = None,
+        fsync: bool = None,
+    ):
+        self.directory = Path(directory)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self.segment_max_bytes = (
+            segment_max_bytes
+            if segment_max_bytes is not None
+            else config.SEGMENT_MAX_BYTES
+        )
+        self.fsync = config.STORE_FSYNC if fsync is None else fsync
+
+        self._lock = threading.RLock()
+        self._segments: List[int] = []  # first chain index of each segment
+        self._length = 0
+        self._head = ChainHead()
+        self._tail: Optional[Dict[str, Any]] = None
+        self._fd: Optional[int] = None
+        self._idx_fd: Optional[int] = None
+        self._fd_segment: Optional[int] = None  # segment the fds append to
+        self._segment_size = 0
+        self._lock_fd: Optional[int] = None
+        self._lock_map: Optional[mmap.mmap] = None  # HEAD generation counter
+        self._flock_depth = 0
+        self._generation = -1  # generation of the HEAD last written / read
+        self._ids = IdIndex(self.directory / IDS_FILE)  # mapped on first find()
+        self._listeners: List[AppendListener] = []
+        self._failed: Optional[BaseException] = None  # unrecoverable append error
+        self.last_append_latency: Optional[float] = None  # seconds, last group
+        self.last_append_at: Optional[float] = None
+        # (suffix, first index) -> read-only map of a segment / .idx file
+        self._maps: Dict[Tuple[str, int], mmap.mmap] = {}
+
+        self._open()
+
+    # ------------------------------------------------------------
+    # Opening / recovery
+    # ------------------------------------------------------------
+
+    def _open(self) -> None:
+        # recovery may truncate files: never read them through old maps
+        self._maps = {}
+        self._failed = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # replace() swaps the directory: always lock the current LOCK file
+        self._close_lock_file()
+
+        with self._exclusive():
+            self._segments = self._list_segments()
+            self._ids.close()
+            (self.directory / LEGACY_IDS_FILE).unlink(missing_ok=True)
+            self._recover_tail()
+            self._check_offset_indexes()
+
+            if self._length == 0 and self.legacy_file is not None:
+                legacy = load_legacy_chain(self.legacy_file)
+                if legacy:
+                    self.append_many(legacy)
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(p.name[: -len(SEGMENT_SUFFIX)])
+            for p in self.directory.glob("*" + SEGMENT_SUFFIX)
+        )
+
+    def _open_lock_file(self) -> None:
+        """
+        Open LOCK: the flock target, and an 8-byte HEAD generation counter
+        bumped by every writer, which readers watch through a shared map.
+        """
+        fd = os.open(self.directory / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(fd).st_size < _OFFSET.size:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size < _OFFSET.size:
+                    os.ftruncate(fd, _OFFSET.size)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        self._lock_fd = fd
+        self._lock_map = mmap.mmap(fd, _OFFSET.size, access=mmap.ACCESS_READ)
+
+    def _close_lock_file(self) -> None:
+        if self._lock_map is not None:
+            self._lock_map.close()
+            self._lock_map = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self._flock_depth = 0
+
+    @contextmanager
+    def _exclusive(self):
+        """Thread lock plus, across processes, an exclusive flock on LOCK."""
+        with self._lock:
+            if self._lock_fd is None:
+                self._open_lock_file()
+            if self._flock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._flock_depth += 1
+            try:
+                yield
+            finally:
+                self._flock_depth -= 1
+                if self._flock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _segment_path(self, first_index: int) -> Path:
+        return self.directory / segment_name(first_index)
+
+    def _index_path(self, first_index: int) -> Path:
+        return self.directory / index_name(first_index)
+
+    def _recover_tail(self) -> None:
+        """
+        Restore the tail. The HEAD sidecar is trusted only if it still points at
+        the last committed record of the last segment; otherwise the last
+        segment is scanned (truncating any uncommitted tail).
+        """
+        if self._load_head():
+            return
+
+        while self._segments:
+            first = self._segments[-1]
+            path = self._segment_path(first)
+            count, committed_end, tail_offset, tail = self._scan_committed(path)
+
+            if count == 0:
+                # empty (or entirely torn) segment: drop it, tail lives earlier
+                path.unlink()
+                self._index_path(first).unlink(missing_ok=True)
+                self._segments.pop()
+                continue
+
+            if committed_end < path.stat().st_size:
+                with path.open("r+b") as f:
+                    f.truncate(committed_end)
+                # the id table may name events that no longer exist: rebuild
+                (self.directory / IDS_FILE).unlink(missing_ok=True)
+
+            self._set_tail(first + count - 1, first, tail_offset, tail)
+            self._segment_size = committed_end
+            self._write_head()
+            return
+
+        self._set_tail(-1, 0, 0, None)
+        self._segment_size = 0
+        self._write_head()
+
+    def _set_tail(
+        self, last_index: int, segment: int, offset: int, tail: Optional[Dict]
+    ) -> None:
+        self._tail = tail
+        self._length = last_index + 1
+        self._head = ChainHead(event_hash_of(tail), last_index, segment, offset)
+
+    def _load_head(self) -> bool:
+        """Validate the HEAD sidecar against the segment tail (O(1))."""
+        if not self._segments:
+            return False
+        try:
+            head = ChainHead.from_json(
+                json.loads((self.directory / HEAD_FILE).read_text(encoding="utf-8"))
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if head.segment != self._segments[-1] or head.last_index < head.segment:
+            return False
+
+        path = self._segment_path(head.segment)
+        try:
+            with path.open("rb") as f:
+                rec = read_record(f, head.offset)
+                end = f.tell()
+                size = f.seek(0, os.SEEK_END)
+        except OSError:
+            return False
+
+        if rec is None or not rec[0] & FLAG_COMMIT or end != size:
+            return False
+
+        tail = decode_body(rec[2], rec[1])
+        if event_hash_of(tail) != head.last_hash:
+            return False
+
+        self._set_tail(head.last_index, head.segment, head.offset, tail)
+        self._segment_size = size
+        return True
+
+    def _write_head(self) -> None:
+        """
+        Persist the head pointer. Not fsynced: it is re-checked against the
+        segment tail on every open, so a stale sidecar only costs one scan.
+        """
+        path = self.directory / HEAD_FILE
+        tmp = path.with_name(HEAD_FILE + ".tmp")
+        tmp.write_text(json.dumps(self._head.to_json()), encoding="utf-8")
+        os.replace(tmp, path)
+        if self._lock_map is not None:
+            # tell other processes' readers to re-read HEAD
+            generation = _OFFSET.unpack_from(self._lock_map)[0] + 1
+            os.pwrite(self._lock_fd, _OFFSET.pack(generation), 0)
+            self._generation = generation
+
+    def _check_offset_indexes(self) -> None:
+        """
+        Make sure every segment has a complete offset index. Only file sizes
+        are compared; a segment is rescanned only if its index is off.
+        """
+        bounds = self._segments[1:] + [self._length]
+        for first, end in zip(self._segments, bounds):
+            expected = (end - first) * _OFFSET.size
+            path = self._index_path(first)
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                size = -1
+            if size == expected:
+                continue
+            offsets = self._scan_offsets(self._segment_path(first), end - first)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(b"".join(_OFFSET.pack(o) for o in offsets))
+            os.replace(tmp, path)
+
+    @staticmethod
+    def _scan_offsets(path: Path, count: int) -> List[int]:
+        offsets = []
+        with path.open("rb") as f:
+            while len(offsets) < count:
+                offset = f.tell()
+                if read_record(f) is None:
+                    break
+                offsets.append(offset)
+        return offsets
+
+    @staticmethod
+    def _scan_committed(path: Path):
+        """
+        Return (committed_count, committed_end, tail_offset, tail_event)
+        for one segment file.
+        """
+        count = 0
+        committed_count = 0
+        committed_end = 0
+        tail_offset = 0
+        tail_record = None
+        pending = None
+
+        with path.open("rb") as f:
+            offset = 0
+            while True:
+                rec = read_record(f)
+                if rec is None:
+                    break
+                count += 1
+                pending = (offset, rec)
+                offset = f.tell()
+                if rec[0] & FLAG_COMMIT:
+                    committed_count = count
+                    committed_end = offset
+                    tail_offset, tail_record = pending
+
+        tail = None
+        if tail_record is not None:
+            _, canon_len, body = tail_record
+            tail = decode_body(body, canon_len)
+        return committed_count, committed_end, tail_offset, tail
+
+    # ------------------------------------------------------------
+    # Following other processes
+    # ------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """
+        Adopt the head another process committed, if the HEAD generation in
+        LOCK moved since this process last wrote or read HEAD. HEAD is
+        replaced only after the records and offsets it covers are on disk,
+        so it is safe to follow.
+        """
+        lock_map = self._lock_map
+        if lock_map is None:
+            return
+        generation = _OFFSET.unpack_from(lock_map)[0]
+        if generation == self._generation:
+            return
+        with self._lock:
+            if generation == self._generation:
+                return
+            try:
+                head = ChainHead.from_json(
+                    json.loads((self.directory / HEAD_FILE).read_text("utf-8"))
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                return
+            self._generation = generation
+            if head != self._head:
+                self._adopt_head(head)
+
+    def _adopt_head(self, head: ChainHead) -> None:
+        previous = self._length
+        if head.length < previous:
+            # rewritten by another process: nothing cached can be trusted
+            self._maps = {}
+            self._ids.close()
+        if head.length and head.segment not in self._segments:
+            self._segments = self._list_segments()
+        tail = None
+        if head.length:
+            tail = self._view(
+                head.segment, *self._record_span(head.segment, head.offset)
+            )
+            tail = tail.event()
+        self._tail = tail
+        self._length = head.length
+        self._head = head
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _open_append(path: Path) -> int:
+        return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _ensure_writable_segment(self) -> None:
+        if self._segments and self._segment_size < self.segment_max_bytes:
+            first = self._segments[-1]
+            if self._fd_segment != first:
+                # first write, or a peer process rotated to a new segment
+                self._close_fd()
+                self._fd = self._open_append(self._segment_path(first))
+                self._idx_fd = self._open_append(self._index_path(first))
+                self._fd_segment = first
+            return
+
+        # rotate: start a new segment at the current chain length
+        self._close_fd()
+        self._segments.append(self._length)
+        self._segment_size = 0
+        self._fd = self._open_append(self._segment_path(self._length))
+        self._idx_fd = self._open_append(self._index_path(self._length))
+        self._fd_segment = self._length
+        if self.fsync:
+            self._fsync_directory()
+
+    def _sync_tail(self) -> None:
+        """
+        Under the flock, before writing: adopt appends made by other
+        processes and size the active segment from disk. Bytes past the
+        committed tail (a group a crashed peer never finished) are cut away
+        together with their offsets.
+        """
+        self._refresh()
+        if not self._segments:
+            return
+        first = self._segments[-1]
+        if self._head.last_index >= first:
+            span = self._record_span(first, self._head.offset)
+            committed, count = span[4], self._head.last_index - first + 1
+        else:
+            committed, count = 0, 0  # rotated, nothing committed there yet
+        seg, idx = self._segment_path(first), self._index_path(first)
+        if seg.stat().st_size > committed:
+            with seg.open("r+b") as f:
+                f.truncate(committed)
+            # the crashed writer may have indexed the ids it never committed
+            (self.directory / IDS_FILE).unlink(missing_ok=True)
+            self._ids.close()
+        if idx.exists() and idx.stat().st_size > count * _OFFSET.size:
+            with idx.open("r+b") as f:
+                f.truncate(count * _OFFSET.size)
+        self._segment_size = committed
+
+    def _fsync_directory(self) -> None:
+        try:
+            dfd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+
+    def _close_fd(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._idx_fd is not None:
+            os.close(self._idx_fd)
+            self._idx_fd = None
+        self._fd_segment = None
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Durably append one event. Returns its chain index."""
+        return self.append_many([event])
+
+    def append_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Durably append a group of events as one unit (one write, one fsync).
+        Returns the chain index of the first event in the group.
+        """
+        events = list(events)
+        with self._exclusive():
+            self._sync_tail()
+            first_index = self._length
+            if not events:
+                return first_index
+            started = time.perf_counter()
+
+            records = [encode_record(e) for e in events[:-1]]
+            records.append(encode_record(events[-1], FLAG_COMMIT))
+
+            if self._failed is not None:
+                raise OSError(
+                    f"chain store {self.directory} failed an earlier append and "
+                    "could not be rolled back; reopen it"
+                ) from self._failed
+
+            self._ensure_writable_segment()
+            data = b"".join(records)
+            offsets = []
+            offset = self._segment_size
+            for record in records:
+                offsets.append(offset)
+                offset += len(record)
+            idx_size = (first_index - self._segments[-1]) * _OFFSET.size
+            try:
+                self._write_all(self._fd, data)
+                if self.fsync:
+                    os.fsync(self._fd)
+                # the offset index is derived data: written after the records
+                # are durable, repaired on open if a crash cuts it short
+                self._write_all(
+                    self._idx_fd, b"".join(_OFFSET.pack(o) for o in offsets)
+                )
+            except BaseException:
+                self._rollback(self._segment_size, idx_size)
+                raise
+            self._index_ids(first_index, events)
+
+            tail_offset = offsets[-1]
+            self._segment_size += len(data)
+            self._set_tail(
+                first_index + len(events) - 1,
+                self._segments[-1],
+                tail_offset,
+                decode_body(*_split_record(records[-1])),
+            )
+            self._write_head()
+            self.last_append_latency = time.perf_counter() - started
+            self.last_append_at = time.time()
+
+            for listener in self._listeners:
+                try:
+                    listener(first_index, events)
+                except Exception:
+                    # derived views catch up from the store on their own;
+                    # a failing listener must not fail a durable append
+                    pass
+            return first_index
+
+    def _rollback(self, segment_size: int, idx_size: int) -> None:
+        """
+        Cut the active segment and its .idx back to their sizes before a
+        failed append, so a partial record never precedes later ones. If
+        that fails too, appends are refused until the store is reopened
+        (recovery then truncates the torn group).
+        """
+        try:
+            os.ftruncate(self._fd, segment_size)
+            os.ftruncate(self._idx_fd, idx_size)
+            if self.fsync:
+                os.fsync(self._fd)
+        except OSError as e:
+            self._failed = e
+
+    def add_listener(self, listener: "AppendListener") -> None:
+        """
+        Call listener(first_index, events) after every durable append group,
+        under the writer lock. Used to keep derived indexes current.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _index_ids(self, first_index: int, events: List[Dict[str, Any]]) -> None:
+        """
+        Add a just-written group to the id table if the table is current up
+        to it. A missing or lagging table is left for find() to catch up
+        (a new store creates it here).
+        """
+        ids = self._ids
+        if ids.covered != first_index and not (
+            ids.reopen() and ids.covered == first_index
+        ):
+            if first_index != 0 or ids.covered >= 0:
+                return
+            ids.create()  # a new store starts its table with the first group
+        ids.insert(
+            ((e.get("event_id"), i) for i, e in enumerate(events, first_index)),
+            first_index + len(events),
+        )
+
+    def _sync_ids(self) -> None:
+        """
+        Under the flock: bring the id table up to the committed tail. A
+        table that is missing, unreadable or names events past the tail
+        (left by a crashed writer) is rebuilt from the chain.
+        """
+        self._refresh()
+        length = self._length
+        ids = self._ids
+        if ids.covered != length:
+            ids.reopen()  # a peer may have grown it into a new file
+        covered = ids.covered
+        if covered < 0 or covered > length:
+            ids.create()
+            covered = 0
+        while covered < length:
+            stop = min(covered + REPLACE_GROUP_SIZE, length)
+            records = self.iter_records(covered, stop)
+            ids.insert(
+                (
+                    (json.loads(bytes(r.canonical)).get("event_id"), i)
+                    for i, r in enumerate(records, covered)
+                ),
+                stop,
+            )
+            covered = stop
+
+    def replace(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Rewrite the whole store with a new event list.
+        Only meant for offline tools (re-signing, restores).
+        """
+        with self._lock:
+            staging = self.directory.with_name(self.directory.name + ".staging")
+            retired = self.directory.with_name(self.directory.name + ".old")
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.rmtree(retired, ignore_errors=True)
+
+            fresh = ChainStore(
+                staging,
+                segment_max_bytes=self.segment_max_bytes,
+                fsync=self.fsync,
+            )
+            # bounded groups: the source may be a long lazy iterator
+            it = iter(events)
+            while True:
+                group = list(islice(it, REPLACE_GROUP_SIZE))
+                if not group:
+                    break
+                fresh.append_many(group)
+            fresh.close()
+
+            self._close_fd()
+            self._maps = {}
+            self.directory.rename(retired)
+            staging.rename(self.directory)
+            shutil.rmtree(retired, ignore_errors=True)
+            self._open()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_fd()
+            self._maps = {}
+            self._ids.close()
+            self._close_lock_file()
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        self._refresh()
+        return self._length
+
+    @property
+    def lock(self) -> ContextManager[None]:
+        """
+        Writer lock: hold it (`with store.lock:`) to read the head and append
+        atomically. Excludes other threads and other processes.
+        """
+        return self._exclusive()
+
+    @property
+    def head(self) -> ChainHead:
+        """Current head pointer (O(1); HEAD is re-read only after a peer's append)."""
+        self._refresh()
+        return self._head
+
+    def tail(self) -> Optional[Dict[str, Any]]:
+        """Return the last committed event (O(1))."""
+        self._refresh()
+        tail = self._tail
+        return dict(tail) if tail is not None else None
+
+    def iter_events(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield committed events start <= index < stop in chain order.
+        Only one record is decoded at a time, so memory stays flat.
+        """
+        for first, mm, flags, body_start, canon_len, end, crc in self._spans(
+            start, stop
+        ):
+            body = mm[body_start:end]
+            self._check_crc(body, crc, first, body_start)
+            yield decode_body(body, canon_len)
+
+    def iter_records(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[StoredRecord]:
+        """Like iter_events, but yields zero-copy StoredRecord views."""
+        for first, mm, flags, body_start, canon_len, end, crc in self._spans(
+            start, stop
+        ):
+            yield self._view(first, mm, flags, body_start, canon_len, end, crc)
+
+    def _spans(self, start: int, stop: Optional[int]):
+        self._refresh()
+        with self._lock:
+            length = self._length
+            segments = list(self._segments)
+
+        if stop is not None:
+            length = min(length, stop)
+        start = max(0, start)
+        if start >= length:
+            return
+        # first segment that can hold `start`
+        pos = max(0, bisect.bisect_right(segments, start) - 1)
+        index = start
+
+        for n, first in enumerate(segments[pos:], pos):
+            if index >= length:
+                break
+            end = segments[n + 1] if n + 1 < len(segments) else length
+            offset = self._record_offset(first, index)
+            while index < min(end, length):
+                span = self._record_span(first, offset)
+                offset = span[4]
+                index += 1
+                yield (first,) + span
+
+    def record(self, index: int) -> Optional[StoredRecord]:
+        """Zero-copy view of the record at `index` (negative from the tail)."""
+        self._refresh()
+        length = self._length
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            return None
+        with self._lock:
+            segments = list(self._segments)
+        first = segments[bisect.bisect_right(segments, index) - 1]
+        span = self._record_span(first, self._record_offset(first, index))
+        return self._view(first, *span)
+
+    def get(self, index: int) -> Optional[Dict[str, Any]]:
+        """Return the event at `index` (negative counts from the tail), or None."""
+        self._refresh()
+        length = self._length
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            return None
+        if index == length - 1:
+            return self.tail()
+        return self.record(index).event()
+
+    def find(self, event_id: str) -> Optional[int]:
+        """
+        Return the chain index of `event_id`, or None. An id that occurs
+        more than once resolves to its latest occurrence. A probe of the
+        mapped id table; only the first call after other processes' appends
+        that were not indexed (or on a store without a table) catches up.
+        """
+        self._refresh()
+        with self._lock:
+            length = self._length
+            if self._ids.covered < length:
+                with self._exclusive():
+                    self._sync_ids()
+                length = self._length
+            index = self._ids.lookup(event_id)
+        # a peer indexes its group just before publishing HEAD
+        return index if index is not None and index < length else None
+
+    def get_by_id(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Return the event with `event_id`, or None."""
+        index = self.find(event_id)
+        return self.get(index) if index is not None else None
+
+    # ------------------------------------------------------------
+    # Memory maps
+    # ------------------------------------------------------------
+
+    def _map(self, suffix: str, first: int, need: int) -> mmap.mmap:
+        """
+        Read-only map of a segment / .idx file covering at least `need` bytes.
+        The active segment grows, so it is remapped when a read passes the
+        end of the current map; older maps stay alive while views use them.
+        """
+        key = (suffix, first)
+        mm = self._maps.get(key)
+        if mm is not None and len(mm) >= need:
+            return mm
+        with self._lock:
+            mm = self._maps.get(key)
+            if mm is None or len(mm) < need:
+                path = self.directory / f"{first:020d}{suffix}"
+                with path.open("rb") as f:
+                    if os.fstat(f.fileno()).st_size < max(need, 1):
+                        raise ValueError(f"{path.name}: shorter than {need} bytes")
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[key] = mm
+            return mm
+
+    def _record_offset(self, first: int, index: int) -> int:
+        pos = (index - first) * _OFFSET.size
+        mm = self._map(INDEX_SUFFIX, first, pos + _OFFSET.size)
+        return _OFFSET.unpack_from(mm, pos)[0]
+
+    def _record_span(self, first: int, offset: int):
+        """
+        Locate the record at `offset` in its segment map.
+        Returns (map, flags, body_start, canon_len, body_end, crc);
+        body_end is also where the next record starts.
+        """
+        mm = self._map(SEGMENT_SUFFIX, first, offset + HEADER_SIZE)
+        magic, version, flags, body_len, canon_len, crc = _HEADER.unpack_from(
+            mm, offset
+        )
+        if magic != MAGIC or version != FORMAT_VERSION or canon_len > body_len:
+            raise ValueError(f"corrupt record at {segment_name(first)}:{offset}")
+        start = offset + HEADER_SIZE
+        end = start + body_len
+        if len(mm) < end:
+            mm = self._map(SEGMENT_SUFFIX, first, end)
+        return mm, flags, start, canon_len, end, crc
+
+    @staticmethod
+    def _check_crc(body, crc: int, first: int, body_start: int) -> None:
+        if zlib.crc32(body) != crc:
+            offset = body_start - HEADER_SIZE
+            raise ValueError(f"checksum mismatch at {segment_name(first)}:{offset}")
+
+    def _view(self, first, mm, flags, body_start, canon_len, end, crc) -> StoredRecord:
+        body = memoryview(mm)[body_start:end]
+        self._check_crc(body, crc, first, body_start)
+        return StoredRecord(flags, body[:canon_len], body[canon_len:])
+
+
+def _split_record(record: bytes) -> Tuple[bytes, int]:
+    _, _, _, body_len, canon_len, _ = _HEADER.unpack_from(record)
+    return record[HEADER_SIZE : HEADER_SIZE + body_len], canon_len
@@ -0,0 +1,186 @@
+# app/engine/state/checkpoints.py
+"""
+Signed verification checkpoints.
+
+A checkpoint says "events 0..last_index were fully verified, the event at
+last_index has hash tail_hash, checked at verified_at". Because the chain is
+append-only, a later verification only has to look at events after the newest
+checkpoint whose tail hash still matches the stored chain.
+
+Checkpoints are appended (one JSON line each) to CHECKPOINT_FILE and signed
+with the engine's Ed25519 key; only checkpoints signed by that key are trusted.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.key_registry import get_signing_key
+from app.core.paths import CHECKPOINT_FILE
+from app.engine.state.chain_store import ChainStore, event_hash_of
+from app.engine.validation.hash_validation import canonical_json_bytes
+from app.engine.validation.signature_validation import verify_ed25519
+
+SIGNED_FIELDS = ("last_index", "tail_hash", "verified_at")
+
+_write_lock = threading.Lock()
+
+
+# ------------------------------------------------------------
+# Signing
+# ------------------------------------------------------------
+
+
+def checkpoint_message(checkpoint: Dict[str, Any]) -> bytes:
+    """Canonical bytes covered by a checkpoint signature."""
+    return canonical_json_bytes({k: checkpoint[k] for k in SIGNED_FIELDS})
+
+
+def _trusted_pubkey() -> Optional[str]:
+    try:
+        return get_signing_key().verify_key.encode().hex()
+    except Exception:
+        return None
+
+
+def verify_checkpoint(checkpoint: Dict[str, Any]) -> bool:
+    """True if the checkpoint is well-formed and signed by our own key."""
+    pubkey = _trusted_pubkey()
+    if not pubkey or checkpoint.get("pubkey") != pubkey:
+        return False
+    try:
+        msg = checkpoint_message(checkpoint)
+    except KeyError:
+        return False
+    return verify_ed25519(checkpoint.get("signature", ""), msg, pubkey)
+
+
+# ------------------------------------------------------------
+# Persistence
+# ------------------------------------------------------------
+
+
+def load_checkpoints(path: Path = CHECKPOINT_FILE) -> List[Dict[str, Any]]:
+    """Return all recorded checkpoints, oldest first (unparseable lines skipped)."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    checkpoints = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                checkpoints.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return checkpoints
+
+
+def record_checkpoint(
+    last_index: int, tail_hash: str, path: Path = CHECKPOINT_FILE
+) -> Optional[Dict[str, Any]]:
+    """
+    Sign and append a checkpoint for events 0..last_index.
+    Returns None when no signing key is available.
+    """
+    try:
+        signing_key = get_signing_key()
+    except Exception:
+        return None
+
+    checkpoint = {
+        "last_index": last_index,
+        "tail_hash": tail_hash,
+        "verified_at": int(time.time()),
+    }
+    checkpoint["pubkey"] = signing_key.verify_key.encode().hex()
+    checkpoint["signature"] = signing_key.sign(
+        checkpoint_message(checkpoint)
+    ).signature.hex()
+
+    line = json.dumps(checkpoint, separators=(",", ":")) + "\n"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _write_lock, path.open("a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    return checkpoint
+
+
+# ------------------------------------------------------------
+# Resume point
+# ------------------------------------------------------------
+
+
+def latest_checkpoint(
+    store: ChainStore, path: Path = CHECKPOINT_FILE
+) -> Optional[Dict[str, Any]]:
+    """
+    Newest checkpoint that is correctly signed and whose tail hash still
+    matches the stored event at last_index.
+    """
+    length = len(store)
+    candidates = [
+        c
+        for c in load_checkpoints(path)
+        if isinstance(c.get("last_index"), int) and 0 <= c["last_index"] < length
+    ]
+    candidates.sort(key=lambda c: c["last_index"], reverse=True)
+
+    for checkpoint in candidates:
+        if not verify_checkpoint(checkpoint):
+            continue
+        stored = store.get(checkpoint["last_index"])
+        if event_hash_of(stored) != checkpoint.get("tail_hash"):
+            continue
+        return checkpoint
+    return None
+
+
+def resume_point(
+    store: ChainStore, full: bool = False, path: Path = CHECKPOINT_FILE
+) -> Tuple[Optional[Dict[str, Any]], int]:
+    """
+    Return (checkpoint, first index still to verify).
+    full=True ignores checkpoints and forces a from-genesis audit.
+    """
+    if full:
+        return None, 0
+    checkpoint = latest_checkpoint(store, path)
+    if checkpoint is None:
+        return None, 0
+    return checkpoint, checkpoint["last_index"] + 1
+
+
+def advance_checkpoint(
+    start: int,
+    events: List[Dict[str, Any]],
+    results: List[Tuple[bool, Dict[str, Any]]],
+    checkpoint: Optional[Dict[str, Any]] = None,
+    path: Path = CHECKPOINT_FILE,
+) -> Optional[Dict[str, Any]]:
+    """
+    Record a checkpoint covering the longest clean prefix of a verification
+    pass over events[start:]: every event valid and prev_hash-linked.
+    Returns the new checkpoint, or None if nothing new was verified clean.
+    """
+    last_hash = checkpoint["tail_hash"] if checkpoint else None
+    last_good = None
+
+    for offset, (event, (is_valid, result)) in enumerate(zip(events, results)):
+        if not is_valid or not event_hash_of(event):
+            break
+        if last_hash and event.get("prev_hash") != last_hash:
+            break
+        last_hash = result.get("computed_hash")
+        last_good = start + offset
+
+    if last_good is None:
+        return None
+    tail_hash = event_hash_of(events[last_good - start])
+    return record_checkpoint(last_good, tail_hash, path)
@@ -1,45 +1,46 @@
-import json
-from pathlib import Path
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Iterator, List, Optional
 
-from app.core.paths import CHAIN_FILE
+from app.core.paths import CHAIN_FILE, STORE_DIR
+from app.engine.state.chain_store import ChainStore
 
 # ------------------------------------------------------------
-# Safe Loader
+# Store Handle
 # ------------------------------------------------------------
 
+_store: Optional[ChainStore] = None
+_store_lock = threading.Lock()
 
-def load_chain() -> List[Dict[str, Any]]:
+
+def get_store() -> ChainStore:
     """
-    Load the event chain.
-    Ensures the result is ALWAYS a list.
-    If file missing or corrupted, returns empty list.
+    Return the process-wide chain store.
+    On first use the legacy event_chain.json is migrated into it (once).
     """
-    if not CHAIN_FILE.exists():
-        return []
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ChainStore(STORE_DIR, legacy_file=CHAIN_FILE)
+    return _store
 
-    try:
-        with CHAIN_FILE.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
-        return []
 
-    # Normalize structure
-    if isinstance(data, list):
-        return data
+# ------------------------------------------------------------
+# Loader
+# ------------------------------------------------------------
 
-    if isinstance(data, dict) and "events" in data and isinstance(data["events"], list):
-        return data["events"]
 
-    # Unknown structure → reset to empty chain
-    return []
+def load_chain() -> List[Dict[str, Any]]:
+    """
+    Load the event chain.
+    Ensures the result is ALWAYS a list.
+    """
+    return list(get_store().iter_events())
 
 
 def save_chain(chain: List[Dict[str, Any]]) -> None:
-    """Persist chain as a simple list."""
-    CHAIN_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with CHAIN_FILE.open("w", encoding="utf-8") as f:
-        json.dump(chain, f, indent=2)
+    """Replace the stored chain (offline tools only; appends use store_event)."""
+    get_store().replace(chain)
 
 
 # ------------------------------------------------------------
@@ -49,26 +50,16 @@ def save_chain(chain: List[Dict[str, Any]]) -> None:
 
 def get_latest_hash() -> str:
     """
-    Return the event_hash of the last event in the chain.
+    Return the hash of the last event in the chain.
     If chain empty, return an empty string.
-    """
-    chain = load_chain()  # FIXED: use correct loader
-    if not chain:
-        return ""
-
-    last = chain[-1]
 
-    if not isinstance(last, dict):
-        return ""
-
-    # FIXED: must match actual event structure
-    return last.get("event_hash", "")
+    Served from the store's head pointer: never scans the chain.
+    """
+    return get_store().head.last_hash
 
 
 def append_event(event: Dict[str, Any]) -> None:
-    chain = load_chain()
-    chain.append(event)
-    save_chain(chain)
+    get_store().append(event)
 
 
 def store_event(event: Dict[str, Any]) -> None:
@@ -77,3 +68,10 @@ def store_event(event: Dict[str, Any]) -> None:
 
 def get_all_events() -> List[Dict[str, Any]]:
     return load_chain()
+
+
+def iter_events(
+    start: Optional[int] = None, stop: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream events start <= index < stop without materializing the chain."""
+    return get_store().iter_events(start=start or 0, stop=stop)
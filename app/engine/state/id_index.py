@@ -0,0 +1,192 @@
+# app/engine/state/id_index.py
+"""
+On-disk event_id -> chain index table behind ChainStore.find().
+
+One open-addressing hash table per store, read through a shared read-only
+map: a lookup touches a page or two and no process ever loads the ids into
+memory, so every worker serving the store shares the same page cache.
+
+    header  magic "TTID" | version u32 | capacity u64 | count u64 | covered u64
+    slots   capacity x (BLAKE2b-128 digest of the event_id | chain index + 1 u64)
+
+Slots are probed linearly from the digest's low bits; a stored index of 0
+marks an empty slot. A repeated event_id keeps a single slot holding its
+latest index. `covered` counts the chain events indexed so far.
+
+Writers insert under the store's flock, slots first and header last, so a
+crash mid-insert only leaves slots that inserting the same events again
+overwrites. Past IDS_MAX_LOAD the table is rewritten at a larger capacity
+into a new file that replaces the old one; other processes notice because
+the old file's `covered` stops moving, and reopen it.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+MAGIC = b"TTID"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sIQQQ")
+_SLOT = struct.Struct("<16sQ")
+
+IDS_MIN_CAPACITY = 1024
+# linear probing stays short below half full
+IDS_MAX_LOAD = 0.5
+
+
+def id_digest(event_id: str) -> bytes:
+    """Fixed-width key of an event_id; 128 bits, so digests stand in for ids."""
+    return hashlib.blake2b(event_id.encode("utf-8"), digest_size=16).digest()
+
+
+class IdIndex:
+    """
+    Hash table file mapping event_id digests to chain indexes.
+    Not thread-safe: ChainStore calls it under its own lock, and only
+    inserts under its flock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._capacity = 0
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._capacity = 0
+
+    def reopen(self) -> bool:
+        """Map the table currently on disk. False if it is missing or unusable."""
+        self.close()
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            size = os.fstat(fd).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{self.path.name}: no header")
+            mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            os.close(fd)
+            return False
+        magic, version, capacity, _, _ = _HEADER.unpack_from(mm)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or capacity < 1
+            or capacity & (capacity - 1)
+            or size != _HEADER.size + capacity * _SLOT.size
+        ):
+            mm.close()
+            os.close(fd)
+            return False
+        self._fd, self._map, self._capacity = fd, mm, capacity
+        return True
+
+    @property
+    def covered(self) -> int:
+        """Chain events indexed so far; -1 when no table is mapped."""
+        if self._map is None:
+            return -1
+        return _HEADER.unpack_from(self._map)[4]
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+
+    def lookup(self, event_id: str) -> Optional[int]:
+        """Latest chain index of `event_id` in the mapped table, or None."""
+        mm = self._map
+        if mm is None:
+            return None
+        digest = id_digest(event_id)
+        mask = self._capacity - 1
+        slot = int.from_bytes(digest[:8], "little") & mask
+        while True:
+            stored_digest, stored = _SLOT.unpack_from(
+                mm, _HEADER.size + slot * _SLOT.size
+            )
+            if stored == 0:
+                return None
+            if stored_digest == digest:
+                return stored - 1
+            slot = (slot + 1) & mask
+
+    # -------------------------
+    # Writing (under the store's flock)
+    # -------------------------
+
+    def create(self) -> None:
+        """Replace whatever is on disk with an empty table."""
+        self._write_table(IDS_MIN_CAPACITY, (), 0)
+
+    def insert(self, pairs: Iterable[Tuple[object, int]], covered: int) -> None:
+        """
+        Record (event_id, chain index) pairs in chain order, a later index
+        replacing an earlier one for the same id, then mark the table as
+        covering the first `covered` events. Non-string ids are skipped.
+        """
+        items = [(id_digest(e), i) for e, i in pairs if isinstance(e, str)]
+        count = _HEADER.unpack_from(self._map)[3]
+        if count + len(items) > self._capacity * IDS_MAX_LOAD:
+            self._write_table(
+                _capacity_for(count + len(items)), self._entries(), self.covered
+            )
+        mm, fd = self._map, self._fd
+        mask = self._capacity - 1
+        for digest, index in items:
+            slot = int.from_bytes(digest[:8], "little") & mask
+            while True:
+                pos = _HEADER.size + slot * _SLOT.size
+                stored_digest, stored = _SLOT.unpack_from(mm, pos)
+                if stored == 0 or stored_digest == digest:
+                    if stored == 0:
+                        count += 1
+                    os.pwrite(fd, _SLOT.pack(digest, index + 1), pos)
+                    break
+                slot = (slot + 1) & mask
+        os.pwrite(fd, _HEADER.pack(MAGIC, VERSION, self._capacity, count, covered), 0)
+
+    def _entries(self) -> Iterator[Tuple[bytes, int]]:
+        mm = self._map
+        for pos in range(_HEADER.size, len(mm), _SLOT.size):
+            stored_digest, stored = _SLOT.unpack_from(mm, pos)
+            if stored:
+                yield stored_digest, stored
+
+    def _write_table(
+        self, capacity: int, entries: Iterable[Tuple[bytes, int]], covered: int
+    ) -> None:
+        """Build a table of `capacity` slots in a new file and swap it in."""
+        buf = bytearray(_HEADER.size + capacity * _SLOT.size)
+        mask = capacity - 1
+        count = 0
+        for digest, stored in entries:
+            slot = int.from_bytes(digest[:8], "little") & mask
+            while _SLOT.unpack_from(buf, _HEADER.size + slot * _SLOT.size)[1]:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(buf, _HEADER.size + slot * _SLOT.size, digest, stored)
+            count += 1
+        _HEADER.pack_into(buf, 0, MAGIC, VERSION, capacity, count, covered)
+
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(buf)
+        os.replace(tmp, self.path)
+        self.reopen()
+
+
+def _capacity_for(count: int) -> int:
+    capacity = IDS_MIN_CAPACITY
+    while count > capacity * IDS_MAX_LOAD:
+        capacity *= 2
+    return capacity
@@ -0,0 +1,430 @@
+# app/engine/state/snapshot.py
+"""
+Binary columnar chain snapshots.
+
+A snapshot is one file that can be memory-mapped and scanned column by column:
+
+    header (magic, version, count, section offsets)
+    canon blob      canonical hashed bytes of every event, back to back
+    extras blob     compact JSON of hash/signature/pubkey values that do not
+                    fit the fixed columns (usually empty)
+    flags           u8 per event: which fixed columns are present
+    hash            32 bytes per event   (raw SHA-256)
+    signature       64 bytes per event   (raw Ed25519)
+    pubkey          32 bytes per event   (raw Ed25519)
+    index           i64 per event        (chain index)
+    timestamp       i64 per event        (FLAG_TIMESTAMP when an integer)
+    canon_offsets   u64 * (count + 1)    event i is canon[off[i]:off[i+1]]
+    extras_offsets  u64 * (count + 1)
+
+All integers are little-endian and every section is 8-byte aligned.
+Hashes and signatures are checked straight from the mapped buffers; dicts are
+only built when events are actually read.
+
+    python -m app.engine.state.snapshot export chain.ttsnap
+    python -m app.engine.state.snapshot verify chain.ttsnap
+    python -m app.engine.state.snapshot import chain.ttsnap
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from nacl.exceptions import BadSignatureError
+
+from app.core.key_registry import get_verify_key
+from app.engine.state.chain_store import ChainStore
+from app.engine.state.event_chain import get_store
+from app.engine.validation.hash_validation import canonical_event_bytes
+from app.engine.validation.signature_validation import verify_ed25519
+
+MAGIC = b"TTSNAP\x00\x01"
+FORMAT_VERSION = 1
+
+FLAG_HASH = 0x01
+FLAG_SIGNATURE = 0x02
+FLAG_PUBKEY = 0x04
+FLAG_TIMESTAMP = 0x08
+
+SECTIONS = (
+    "canon",
+    "extras",
+    "flags",
+    "hash",
+    "signature",
+    "pubkey",
+    "index",
+    "timestamp",
+    "canon_offsets",
+    "extras_offsets",
+)
+
+# field -> (flag, raw width)
+FIXED_FIELDS = {
+    "hash": (FLAG_HASH, 32),
+    "signature": (FLAG_SIGNATURE, 64),
+    "pubkey": (FLAG_PUBKEY, 32),
+}
+
+_HEADER = struct.Struct("<8sIIQ" + "Q" * len(SECTIONS))
+HEADER_SIZE = _HEADER.size
+
+
+class SnapshotError(ValueError):
+    """The file is not a readable snapshot."""
+
+
+def _fixed_raw(value: Any, width: int) -> Optional[bytes]:
+    """Raw bytes for a lowercase hex string of the right width, else None."""
+    if not isinstance(value, str) or len(value) != width * 2:
+        return None
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        return None
+    # only exact round trips go in the fixed column
+    return raw if raw.hex() == value else None
+
+
+def _pad(f, position: int) -> int:
+    pad = -position % 8
+    if pad:
+        f.write(b"\x00" * pad)
+    return position + pad
+
+
+# ------------------------------------------------------------
+# Export
+# ------------------------------------------------------------
+
+
+def export_snapshot(events: Iterable[Dict[str, Any]], path: Path) -> int:
+    """
+    Write events (in chain order) as a snapshot in one streaming pass.
+    Returns the number of events written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    flags = bytearray()
+    fixed = {name: bytearray() for name in FIXED_FIELDS}
+    timestamps: List[int] = []
+    canon_offsets = [0]
+    extras_offsets = [0]
+    extras_blob = bytearray()
+
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(b"\x00" * HEADER_SIZE)
+        canon_start = HEADER_SIZE
+        canon_len = 0
+
+        for event in events:
+            canon = canonical_event_bytes(event)
+            f.write(canon)
+            canon_len += len(canon)
+            canon_offsets.append(canon_len)
+
+            flag = 0
+            extras = {}
+            for name, (bit, width) in FIXED_FIELDS.items():
+                raw = _fixed_raw(event.get(name), width)
+                if raw is not None:
+                    flag |= bit
+                    fixed[name] += raw
+                else:
+                    fixed[name] += b"\x00" * width
+                    if name in event:
+                        extras[name] = event[name]
+            if extras:
+                extras_blob += json.dumps(extras, separators=(",", ":")).encode()
+            extras_offsets.append(len(extras_blob))
+
+            ts = event.get("timestamp")
+            if (
+                isinstance(ts, int)
+                and not isinstance(ts, bool)
+                and -(2**63) <= ts < 2**63
+            ):
+                flag |= FLAG_TIMESTAMP
+                timestamps.append(ts)
+            else:
+                timestamps.append(0)
+            flags.append(flag)
+
+        count = len(flags)
+        offsets = {"canon": canon_start}
+        position = _pad(f, canon_start + canon_len)
+
+        def section(name: str, data) -> None:
+            nonlocal position
+            offsets[name] = position
+            data = bytes(data)
+            f.write(data)
+            position = _pad(f, position + len(data))
+
+        section("extras", extras_blob)
+        section("flags", flags)
+        for name in FIXED_FIELDS:
+            section(name, fixed[name])
+        section("index", np.arange(count, dtype="<i8").tobytes())
+        section("timestamp", np.asarray(timestamps, dtype="<i8").tobytes())
+        section("canon_offsets", np.asarray(canon_offsets, dtype="<u8").tobytes())
+        section("extras_offsets", np.asarray(extras_offsets, dtype="<u8").tobytes())
+
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                MAGIC, FORMAT_VERSION, 0, count, *(offsets[s] for s in SECTIONS)
+            )
+        )
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, path)
+    return count
+
+
+# ------------------------------------------------------------
+# Reading
+# ------------------------------------------------------------
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+    Column accessors return zero-copy memoryviews / numpy arrays.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER_SIZE:
+                raise SnapshotError(f"{self.path}: too short for a snapshot")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._buf = memoryview(self._mmap)
+
+        magic, version, _, count, *offsets = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise SnapshotError(f"{self.path}: not a v{FORMAT_VERSION} snapshot")
+        self.count = count
+        self._offsets = dict(zip(SECTIONS, offsets))
+
+        n = count
+        sizes = {"flags": n, "index": 8 * n, "timestamp": 8 * n}
+        sizes.update({name: width * n for name, (_, width) in FIXED_FIELDS.items()})
+        sizes.update({"canon_offsets": 8 * (n + 1), "extras_offsets": 8 * (n + 1)})
+        if any(self._offsets[s] + size > len(self._buf) for s, size in sizes.items()):
+            self.close()
+            raise SnapshotError(f"{self.path}: truncated snapshot")
+
+        self.flags = np.frombuffer(self._buf, "u1", n, self._offsets["flags"])
+        self.index = np.frombuffer(self._buf, "<i8", n, self._offsets["index"])
+        self.timestamp = np.frombuffer(self._buf, "<i8", n, self._offsets["timestamp"])
+        self.canon_offsets = np.frombuffer(
+            self._buf, "<u8", n + 1, self._offsets["canon_offsets"]
+        )
+        self.extras_offsets = np.frombuffer(
+            self._buf, "<u8", n + 1, self._offsets["extras_offsets"]
+        )
+        self._fixed = {
+            name: self._buf[self._offsets[name] : self._offsets[name] + width * n]
+            for name, (_, width) in FIXED_FIELDS.items()
+        }
+        canon_len = int(self.canon_offsets[n]) if n else 0
+        extras_len = int(self.extras_offsets[n]) if n else 0
+        if self._offsets["canon"] + canon_len > len(self._buf):
+            self.close()
+            raise SnapshotError(f"{self.path}: truncated snapshot")
+        self._canon = self._buf[self._offsets["canon"] :][:canon_len]
+        self._extras = self._buf[self._offsets["extras"] :][:extras_len]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # numpy arrays and memoryviews must let go of the map first
+        for name in ("flags", "index", "timestamp", "canon_offsets", "extras_offsets"):
+            setattr(self, name, None)
+        self._fixed = {}
+        self._canon = self._extras = None
+        # a caller may still hold a column or view: then the map is left
+        # to be unmapped by the garbage collector once the last one goes
+        if getattr(self, "_buf", None) is not None:
+            try:
+                self._buf.release()
+            except BufferError:
+                pass
+            self._buf = None
+        if getattr(self, "_mmap", None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        self._file.close()
+
+    # -------------------------
+    # Columns
+    # -------------------------
+
+    def canonical(self, i: int) -> memoryview:
+        """Canonical hashed bytes of event i (zero-copy)."""
+        return self._canon[int(self.canon_offsets[i]) : int(self.canon_offsets[i + 1])]
+
+    def raw(self, name: str, i: int) -> Optional[memoryview]:
+        """Raw fixed-width hash / signature / pubkey of event i, if present."""
+        bit, width = FIXED_FIELDS[name]
+        if not self.flags[i] & bit:
+            return None
+        return self._fixed[name][i * width : (i + 1) * width]
+
+    def extras(self, i: int) -> Dict[str, Any]:
+        start, end = int(self.extras_offsets[i]), int(self.extras_offsets[i + 1])
+        if start == end:
+            return {}
+        return json.loads(self._extras[start:end].tobytes())
+
+    # -------------------------
+    # Events
+    # -------------------------
+
+    def event(self, i: int) -> Dict[str, Any]:
+        """Rebuild event i as a dict (same shape as the chain store returns)."""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        event = json.loads(self.canonical(i).tobytes())
+        extras = self.extras(i)
+        for name in FIXED_FIELDS:
+            raw = self.raw(name, i)
+            if raw is not None:
+                event[name] = raw.hex()
+            elif name in extras:
+                event[name] = extras[name]
+        return event
+
+    def iter_events(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        stop = self.count if stop is None else min(stop, self.count)
+        for i in range(max(start, 0), stop):
+            yield self.event(i)
+
+    # -------------------------
+    # Verification
+    # -------------------------
+
+    def _field_hex(self, name: str, i: int) -> Optional[str]:
+        raw = self.raw(name, i)
+        if raw is not None:
+            return raw.hex()
+        return self.extras(i).get(name)
+
+    def verify(self, signatures: bool = True) -> Dict[str, Any]:
+        """
+        Check every stored hash (and signature) against the canonical bytes,
+        reading straight from the mapped columns.
+        Events without a stored hash / signature are not checked, as in
+        EventValidator.
+        """
+        hash_mismatches: List[int] = []
+        bad_signatures: List[int] = []
+        need_both = FLAG_SIGNATURE | FLAG_PUBKEY
+        hashes = self._fixed["hash"]
+        sigs = self._fixed["signature"]
+        pubs = self._fixed["pubkey"]
+        # pubkeys repeat (one engine key), so decode each distinct one once
+        verify_keys: Dict[bytes, Any] = {}
+
+        for i in range(self.count):
+            flag = int(self.flags[i])
+            msg = self.canonical(i)
+
+            if flag & FLAG_HASH:
+                if hashlib.sha256(msg).digest() != hashes[i * 32 : i * 32 + 32]:
+                    hash_mismatches.append(i)
+            else:
+                stored = self.extras(i).get("hash")
+                if stored and hashlib.sha256(msg).hexdigest() != stored:
+                    hash_mismatches.append(i)
+
+            if not signatures:
+                continue
+
+            if flag & need_both == need_both:
+                pub = pubs[i * 32 : i * 32 + 32].tobytes()
+                key = verify_keys.get(pub)
+                if key is None:
+                    key = verify_keys[pub] = get_verify_key(pub.hex())
+                try:
+                    key.verify(msg.tobytes(), sigs[i * 64 : i * 64 + 64].tobytes())
+                except BadSignatureError:
+                    bad_signatures.append(i)
+            else:
+                signature = self._field_hex("signature", i)
+                pubkey = self._field_hex("pubkey", i)
+                if signature and pubkey:
+                    if not verify_ed25519(signature, msg.tobytes(), pubkey):
+                        bad_signatures.append(i)
+
+        return {
+            "count": self.count,
+            "hash_mismatches": hash_mismatches,
+            "bad_signatures": bad_signatures,
+            "ok": not hash_mismatches and not bad_signatures,
+        }
+
+
+# ------------------------------------------------------------
+# Chain store round trip
+# ------------------------------------------------------------
+
+
+def export_store(path: Path, store: Optional[ChainStore] = None) -> int:
+    store = store if store is not None else get_store()
+    return export_snapshot(store.iter_events(), path)
+
+
+def import_snapshot(path: Path, store: Optional[ChainStore] = None) -> int:
+    """Replace the chain store contents with a snapshot. Returns event count."""
+    store = store if store is not None else get_store()
+    with Snapshot(path) as snap:
+        store.replace(snap.iter_events())
+        return len(snap)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TrueTrace chain snapshots")
+    parser.add_argument("command", choices=("export", "import", "verify"))
+    parser.add_argument("path", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        n = export_store(args.path)
+        print(f"Exported {n} events -> {args.path}")
+    elif args.command == "import":
+        n = import_snapshot(args.path)
+        print(f"Imported {n} events <- {args.path}")
+    else:
+        with Snapshot(args.path) as snap:
+            report = snap.verify()
+        print(json.dumps(report, indent=2))
@@ -1,6 +1,41 @@
 import json
 from hashlib import sha256
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+# Fields that are never part of the hashed / signed representation.
+HASH_EXCLUDED_FIELDS = ("hash", "signature", "pubkey")
+
+# One shared encoder. json.dumps() with non-default arguments builds a new
+# JSONEncoder and C encoder on every call; building the C encoder once keeps
+# output byte-identical to json.dumps(obj, sort_keys=True, separators=(",", ":")).
+# No circular-reference markers: events are decoded JSON and cannot contain cycles.
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), check_circular=False
+)
+
+
+def _make_canonical_encode():
+    try:
+        from json.encoder import c_make_encoder, encode_basestring_ascii
+
+        c_encode = c_make_encoder(
+            None,  # markers (no circular check)
+            _CANONICAL_ENCODER.default,
+            encode_basestring_ascii,
+            None,  # indent
+            ":",  # key separator
+            ",",  # item separator
+            True,  # sort_keys
+            False,  # skipkeys
+            True,  # allow_nan
+        )
+    except (ImportError, TypeError):
+        # no C accelerator (or an incompatible one): pure-Python encoder
+        return _CANONICAL_ENCODER.encode
+    return lambda obj: "".join(c_encode(obj, 0))
+
+
+_canonical_encode = _make_canonical_encode()
 
 # -----------------------------------------------------------
 # Canonicalizer Helpers
@@ -12,7 +47,7 @@ def canonical_json_bytes(obj: Any) -> bytes:
     Converts any JSON-compatible object to stable canonical JSON bytes.
     Removes whitespace, sorts keys, ensures deterministic structure.
     """
-    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return _canonical_encode(obj).encode("utf-8")
 
 
 def filtered_for_hash(event: Dict[str, Any]) -> Dict[str, Any]:
@@ -20,9 +55,7 @@ def filtered_for_hash(event: Dict[str, Any]) -> Dict[str, Any]:
     Returns the version of an event used for hashing.
     Removes signature, public key, and the event's own hash.
     """
-    filtered = {
-        k: v for k, v in event.items() if k not in ("hash", "signature", "pubkey")
-    }
+    filtered = {k: v for k, v in event.items() if k not in HASH_EXCLUDED_FIELDS}
     return filtered
 
 
@@ -44,6 +77,33 @@ def canonical_event_bytes(event: Dict[str, Any]) -> bytes:
     return canonical_json_bytes(filtered)
 
 
+class CanonicalEvent:
+    """
+    Canonical bytes and hash of one event, each computed at most once and
+    shared by the hash and signature checks of a validation pass.
+    canonical_bytes may be supplied when the caller already has them.
+    """
+
+    __slots__ = ("event", "_bytes", "_hash")
+
+    def __init__(self, event: Dict[str, Any], canonical_bytes: Optional[bytes] = None):
+        self.event = event
+        self._bytes = canonical_bytes
+        self._hash: Optional[str] = None
+
+    @property
+    def bytes(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = canonical_event_bytes(self.event)
+        return self._bytes
+
+    @property
+    def hash(self) -> str:
+        if self._hash is None:
+            self._hash = sha256(self.bytes).hexdigest()
+        return self._hash
+
+
 # -----------------------------------------------------------
 # Hashing Function
 # -----------------------------------------------------------
@@ -54,6 +114,4 @@ def compute_event_hash(event_for_hash: Dict[str, Any]) -> str:
     Produces deterministic SHA-256 hash for the event.
     Matches exactly what signatures use.
     """
-    filtered = filtered_for_hash(event_for_hash)
-    b = canonical_json_bytes(filtered)
-    return sha256(b).hexdigest()
+    return sha256(canonical_event_bytes(event_for_hash)).hexdigest()
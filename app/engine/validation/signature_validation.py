@@ -1,9 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from nacl.exceptions import BadSignatureError
-from nacl.signing import VerifyKey
 
-from app.engine.validation.hash_validation import canonical_event_bytes
+from app.core.key_registry import get_verify_key
+from app.engine.validation.hash_validation import CanonicalEvent, canonical_event_bytes
 
 # -----------------------------------------------------------
 # Raw Ed25519 Verification
@@ -13,9 +13,10 @@ from app.engine.validation.hash_validation import canonical_event_bytes
 def verify_ed25519(signature_hex: str, message: bytes, pubkey_hex: str) -> bool:
     """
     Low-level Ed25519 signature check.
+    Decoded VerifyKeys come from the shared key registry cache.
     """
     try:
-        verify_key = VerifyKey(bytes.fromhex(pubkey_hex))
+        verify_key = get_verify_key(pubkey_hex)
         signature_bytes = bytes.fromhex(signature_hex)
 
         verify_key.verify(message, signature_bytes)
@@ -32,13 +33,16 @@ def verify_ed25519(signature_hex: str, message: bytes, pubkey_hex: str) -> bool:
 # -----------------------------------------------------------
 
 
-def verify_signature(event: Dict[str, Any]) -> bool:
+def verify_signature(
+    event: Dict[str, Any], canonical: Optional[CanonicalEvent] = None
+) -> bool:
     """
     Returns True if:
     - signature is valid, OR
     - event is missing signature/pubkey (unsigned events are allowed)
 
     Returns False only if the signature is present AND invalid.
+    Pass the validation's CanonicalEvent to reuse its canonical bytes.
     """
     signature = event.get("signature")
     pubkey = event.get("pubkey")
@@ -47,5 +51,5 @@ def verify_signature(event: Dict[str, Any]) -> bool:
     if not signature or not pubkey:
         return True
 
-    msg = canonical_event_bytes(event)
+    msg = canonical.bytes if canonical is not None else canonical_event_bytes(event)
     return verify_ed25519(signature, msg, pubkey)
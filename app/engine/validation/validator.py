@@ -1,10 +1,18 @@
-from typing import Any, Dict, Tuple
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from app.engine.validation.hash_validation import compute_event_hash
+from app.core import config
+from app.engine.validation.hash_validation import CanonicalEvent
 from app.engine.validation.security_rules import run_security_rules
 from app.engine.validation.signature_validation import verify_signature
 from app.engine.validation.structure import validate_structure
 
+ValidationResult = Tuple[bool, Dict[str, Any]]
+
 
 class EventValidator:
     """
@@ -16,8 +24,33 @@ class EventValidator:
     - Signature validation
     """
 
-    def validate(self, event: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        serial_threshold: Optional[int] = None,
+    ):
+        self.workers = workers if workers is not None else config.VERIFY_WORKERS
+        self.executor = executor or config.VERIFY_EXECUTOR
+        self.chunk_size = chunk_size or config.VERIFY_CHUNK_SIZE
+        self.serial_threshold = (
+            serial_threshold
+            if serial_threshold is not None
+            else config.VERIFY_SERIAL_THRESHOLD
+        )
+
+    def validate(
+        self, event: Dict[str, Any], canonical: Optional[CanonicalEvent] = None
+    ) -> ValidationResult:
+        """
+        Validate one event. The event is canonicalized once and the bytes
+        are shared by the hash and signature checks; callers that already
+        hold them can pass a CanonicalEvent.
+        """
         errors = []
+        if canonical is None:
+            canonical = CanonicalEvent(event)
 
         # -------------------------
         # STRUCTURE CHECKS
@@ -36,7 +69,7 @@ class EventValidator:
         # -------------------------
         # HASH CONSISTENCY
         # -------------------------
-        computed_hash = compute_event_hash(event)
+        computed_hash = canonical.hash
         stored_hash = event.get("hash")
 
         if stored_hash and stored_hash != computed_hash:
@@ -47,7 +80,7 @@ class EventValidator:
         # -------------------------
         # SIGNATURE VALIDATION
         # -------------------------
-        sig_ok = verify_signature(event)
+        sig_ok = verify_signature(event, canonical)
         if not sig_ok:
             errors.append("invalid_signature")
 
@@ -55,3 +88,86 @@ class EventValidator:
         # RESULT
         # -------------------------
         return (len(errors) == 0, {"errors": errors, "computed_hash": computed_hash})
+
+    def validate_many(self, events: Iterable[Dict[str, Any]]) -> List[ValidationResult]:
+        """
+        Validate a whole chain (or any batch of events).
+
+        Events are split into chunks and verified on a shared worker pool;
+        results come back in chain order, one validate() result per event.
+        Small batches, or workers <= 1, are validated serially.
+        """
+        if not isinstance(events, list):
+            events = list(events)
+
+        if self.workers <= 1 or len(events) < self.serial_threshold:
+            return [self.validate(e) for e in events]
+
+        size = self.chunk_size
+        chunks = [events[i : i + size] for i in range(0, len(events), size)]
+        pool = _get_pool(self.executor, self.workers)
+
+        results: List[ValidationResult] = []
+        for chunk_results in pool.map(partial(_validate_chunk, self), chunks):
+            results.extend(chunk_results)
+        return results
+
+    def iter_validate(
+        self, events: Iterable[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], ValidationResult]]:
+        """
+        Streaming validate_many: pulls one window (a chunk per worker) at a
+        time from any iterable and yields (event, result) pairs in order, so
+        memory stays bounded by the window however long the chain is.
+        """
+        window = max(self.chunk_size * max(self.workers, 1), self.serial_threshold)
+        it = iter(events)
+        while True:
+            batch = list(islice(it, window))
+            if not batch:
+                return
+            yield from zip(batch, self.validate_many(batch))
+
+
+def _validate_chunk(
+    validator: EventValidator, events: List[Dict[str, Any]]
+) -> List[ValidationResult]:
+    return [validator.validate(e) for e in events]
+
+
+# -----------------------------------------------------------
+# Shared worker pools (one per executor kind / size)
+# -----------------------------------------------------------
+
+_pools: Dict[Tuple[str, int], Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(kind: str, workers: int) -> Executor:
+    key = (kind, workers)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if kind == "thread":
+                pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="verify"
+                )
+            elif kind == "process":
+                # spawn: forking a threaded server process is not safe
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                raise ValueError(f"unknown verify executor: {kind!r}")
+            _pools[key] = pool
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stop all verification workers (app shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -2,11 +2,10 @@
 """Visual Integrity Subsystem (VPIE) package.
 Basic, dependency-light helpers and clear extension points for ML models.
 """
-
-
 __all__ = [
     "frame_extractor",
     "frame_hashing",
+    "frame_stream",
     "canonicalizer",
     "motion_analysis",
     "model_base",
@@ -7,10 +7,13 @@ Rules enforced here:
 - remove audio (handled at ingestion)
 - frame ordering deterministic
 """
-from typing import Tuple
+import math
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple
 
 import numpy as np
 from PIL import Image
+from scipy import sparse
 
 
 def canonicalize_frame_bytes(
@@ -33,3 +36,211 @@ def canonicalize_frame_bytes(
 
     out = np.ascontiguousarray(np.array(img.convert("RGB")), dtype=np.uint8)
     return out
+
+
+# ------------------------------------------------------------
+# Batch canonicalization
+# ------------------------------------------------------------
+#
+# canonicalize_frames() works on a stacked (N, H, W, C) uint8 batch. The
+# resize is a separable Lanczos (a=3) resample whose kernels are computed
+# exactly as Pillow computes them (same support, centering, normalization
+# and 22-bit fixed-point weights) and applied the same way: a horizontal
+# pass rounded to uint8, then a vertical pass. Each pass is one sparse int32
+# matrix product over all lines of a frame; the kernel matrices are cached
+# per (input, output) size, so a batch pays for them once. For RGB input
+# the result matches canonicalize_frame_bytes(..., target_size) bit for
+# bit; the documented tolerance is at most 1 per channel value. RGBA input is
+# normalized to RGB *before* resizing (as extract_frames always did), so it
+# differs from Pillow's premultiplied-alpha RGBA resize where alpha < 255.
+
+PRECISION_BITS = 32 - 8 - 2  # Pillow's 8-bit resample precision
+LANCZOS_SUPPORT = 3.0
+BATCH_TOLERANCE = 1
+
+
+def normalize_channels(frames: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Return (N, H, W, 3) RGB from (N, H, W), (N, H, W, 1|3|4) uint8 frames.
+
+    Grayscale is replicated to three channels and alpha is dropped. Already
+    RGB input is returned as is unless `out` is given.
+    """
+    if frames.ndim == 3:
+        frames = frames[..., None]
+    if frames.ndim != 4 or frames.shape[-1] not in (1, 3, 4):
+        raise ValueError(f"expected (N, H, W[, 1|3|4]) frames, got {frames.shape}")
+    if frames.shape[-1] == 3 and out is None:
+        return frames
+    if out is None:
+        out = np.empty(frames.shape[:3] + (3,), dtype=np.uint8)
+    # (…, 1) broadcasts across RGB; (…, 4) drops alpha
+    np.copyto(out, frames[..., :3] if frames.shape[-1] != 1 else frames)
+    return out
+
+
+def _lanczos(x: float) -> float:
+    def sinc(v: float) -> float:
+        if v == 0.0:
+            return 1.0
+        v = v * math.pi
+        return math.sin(v) / v
+
+    if -LANCZOS_SUPPORT <= x < LANCZOS_SUPPORT:
+        return sinc(x) * sinc(x / 3)
+    return 0.0
+
+
+@lru_cache(maxsize=32)
+def lanczos_kernel(in_size: int, out_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(indexes, weights), each (out_size, taps): the fixed-point Lanczos
+    kernel Pillow uses to resample a line of in_size pixels to out_size."""
+    scale = in_size / out_size
+    filterscale = max(scale, 1.0)
+    support = LANCZOS_SUPPORT * filterscale
+    taps = int(math.ceil(support)) * 2 + 1
+
+    indexes = np.zeros((out_size, taps), dtype=np.intp)
+    weights = np.zeros((out_size, taps), dtype=np.int32)
+    for xx in range(out_size):
+        center = (xx + 0.5) * scale
+        xmin = max(int(center - support + 0.5), 0)
+        xmax = min(int(center + support + 0.5), in_size) - xmin
+        k = [_lanczos((x + xmin - center + 0.5) / filterscale) for x in range(xmax)]
+        ww = 0.0
+        for w in k:
+            ww += w
+        for x, w in enumerate(k):
+            w = w / ww if ww != 0.0 else w
+            weights[xx, x] = int(w * (1 << PRECISION_BITS) + (0.5 if w >= 0 else -0.5))
+            indexes[xx, x] = xmin + x
+        indexes[xx, xmax:] = xmin
+    return indexes, weights
+
+
+@lru_cache(maxsize=32)
+def _kernel_matrix(in_size: int, out_size: int, channels: int = 1) -> sparse.csr_matrix:
+    """lanczos_kernel() as an int32 sparse matrix over interleaved lines.
+
+    With channels=c the matrix maps lines of in_size * c values (pixel-major,
+    channel-minor) to out_size * c, applying the kernel to each channel.
+    """
+    indexes, weights = lanczos_kernel(in_size, out_size)
+    rows = np.repeat(np.arange(out_size), indexes.shape[1])
+    # padding taps (weight 0) are summed into real ones and then dropped
+    matrix = sparse.csr_matrix(
+        (weights.ravel(), (rows, indexes.ravel())),
+        shape=(out_size, in_size),
+        dtype=np.int32,
+    )
+    if channels > 1:
+        identity = sparse.identity(channels, dtype=np.int32)
+        matrix = sparse.kron(matrix, identity, format="csr")
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def _resample(
+    lines: np.ndarray, out_size: int, channels: int = 1, out: np.ndarray = None
+) -> np.ndarray:
+    """Resample the first axis of a 2-D uint8 array to out_size pixels.
+
+    Every column is one line; all of them go through a single sparse int32
+    product followed by Pillow's rounding and clamping.
+    """
+    in_size = lines.shape[0] // channels
+    acc = _kernel_matrix(in_size, out_size, channels) @ lines
+    acc += 1 << (PRECISION_BITS - 1)
+    acc >>= PRECISION_BITS
+    np.clip(acc, 0, 255, out=acc)
+    if out is None:
+        return acc.astype(np.uint8)
+    np.copyto(out, acc, casting="unsafe")
+    return out
+
+
+def _resize_frame(frame: np.ndarray, out: np.ndarray) -> None:
+    """Resize one (H, W, 3) frame into `out` (H', W', 3): horizontal pass
+    first, then vertical, as Pillow does."""
+    h, w, c = frame.shape
+    th, tw = out.shape[:2]
+    rows = frame.reshape(h, w * c)
+    if tw != w:
+        # one (W * C) line per image row; transposed so lines are columns
+        columns = np.ascontiguousarray(rows.T)
+        rows = np.ascontiguousarray(_resample(columns, tw, c).T)
+    if th != h:
+        _resample(rows, th, out=out.reshape(th, tw * c))
+    else:
+        np.copyto(out.reshape(th, tw * c), rows)
+
+
+def canonicalize_frames(
+    frames: np.ndarray,
+    target_size: Tuple[int, int] = None,
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Canonicalize a batch of frames to (N, H', W', 3) uint8 RGB.
+
+    `frames` is (N, H, W) or (N, H, W, 1|3|4) uint8. If target_size (H', W')
+    is given, frames are Lanczos-resized (see BATCH_TOLERANCE). The result
+    is written into `out` when provided (C-contiguous (N, H', W', 3) uint8),
+    so a caller processing many batches can reuse one buffer.
+    """
+    frames = np.asarray(frames)
+    if frames.dtype != np.uint8:
+        raise ValueError(f"expected uint8 frames, got {frames.dtype}")
+    n, h, w = frames.shape[:3]
+    th, tw = target_size if target_size else (h, w)
+    if out is not None and (
+        out.shape != (n, th, tw, 3)
+        or out.dtype != np.uint8
+        or not out.flags.c_contiguous
+    ):
+        raise ValueError(f"out must be contiguous uint8 {(n, th, tw, 3)}")
+
+    if (th, tw) == (h, w):
+        rgb = normalize_channels(frames, out)
+        return np.ascontiguousarray(rgb) if out is None else out
+
+    if out is None:
+        out = np.empty((n, th, tw, 3), dtype=np.uint8)
+    rgb = normalize_channels(frames)
+    for i in range(n):
+        _resize_frame(rgb[i], out[i])
+    return out
+
+
+def iter_canonical_batches(
+    frames: Iterable[np.ndarray],
+    batch_size: int,
+    target_size: Tuple[int, int] = None,
+) -> Iterator[np.ndarray]:
+    """Group same-shape frames into batches and canonicalize each one.
+
+    The stacking and output buffers are reused between batches: a yielded
+    batch is only valid until the next one is requested (copy to keep it).
+    """
+    stack = out = None
+    count = 0
+
+    def flush():
+        return canonicalize_frames(stack[:count], target_size, out[:count])
+
+    for frame in frames:
+        frame = np.asarray(frame)
+        if stack is not None and frame.shape != stack.shape[1:]:
+            if count:
+                yield flush()
+            stack = out = None
+            count = 0
+        if stack is None:
+            stack = np.empty((batch_size,) + frame.shape, dtype=np.uint8)
+            h, w = target_size if target_size else frame.shape[:2]
+            out = np.empty((batch_size, h, w, 3), dtype=np.uint8)
+        stack[count] = frame
+        count += 1
+        if count == batch_size:
+            yield flush()
+            count = 0
+    if count:
+        yield flush()
@@ -1,13 +1,37 @@
 # app/engine/visual/frame_hashing.py
-"""Frame hashing utilities used to create frame chains."""
+"""Frame hashing utilities used to create frame chains.
+
+Frames may be given as bytes or as numpy arrays; arrays are hashed through
+the buffer protocol, so a C-contiguous uint8 frame is never copied and
+hashes exactly like its tobytes().
+"""
 import hashlib
-from typing import Iterable, List
+from typing import Iterable, List, Union
+
+import numpy as np
+
+Frame = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def frame_buffer(frame: Frame):
+    """Return a buffer hashlib can read without copying where possible."""
+    if isinstance(frame, np.ndarray):
+        if not frame.flags["C_CONTIGUOUS"]:
+            # e.g. an RGB view of an RGBA frame: one copy is unavoidable
+            frame = np.ascontiguousarray(frame)
+        return memoryview(frame).cast("B")
+    return frame
 
 
-def hash_frame_bytes(frame_bytes: bytes) -> str:
+def hash_frame_digest(frame: Frame) -> bytes:
+    """Return the raw 32-byte SHA256 digest of a frame."""
+    return hashlib.sha256(frame_buffer(frame)).digest()
+
+
+def hash_frame_bytes(frame_bytes: Frame) -> str:
     """Return SHA256 hex digest of frame bytes."""
     h = hashlib.sha256()
-    h.update(frame_bytes)
+    h.update(frame_buffer(frame_bytes))
     return h.hexdigest()
 
 
@@ -23,6 +47,11 @@ def build_frame_chain_hash(frame_hashes: Iterable[str]) -> str:
     return running.hexdigest()
 
 
-def hash_all_frames(frames: Iterable[bytes]) -> List[str]:
-    """Hash many raw frames and return list of hex digests."""
+def hash_all_frames(frames: Iterable[Frame]) -> List[str]:
+    """Hash many raw frames and return list of hex digests.
+
+    Holds every digest in memory; for long videos use
+    frame_stream.hash_frames, which folds digests into the chain hash as
+    it goes.
+    """
     return [hash_frame_bytes(f) for f in frames]
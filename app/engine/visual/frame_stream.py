@@ -0,0 +1,287 @@
+# app/engine/visual/frame_stream.py
+"""Streaming frame-chain hashing for long videos.
+
+decode -> hash -> fold into the frame chain hash in a single pass. Only the
+frame being hashed is held; frames are hashed straight from the decoder's
+numpy buffer and their digests folded into the running chain hash, so the
+result equals
+
+    build_frame_chain_hash(hash_all_frames(frames))
+
+without building either list.
+
+The chain hash is SHA256 over the concatenated 32-byte frame digests, so
+the digests themselves are a complete, resumable record of the running
+state. With a journal path, each digest is appended to the journal as it
+is produced, and checkpoint() flushes it together with a small JSON sidecar
+(source identity, frame count, chain hash so far). FrameChainState.resume()
+replays the journal and the job continues after the last journaled frame.
+
+Hashing is spread over a thread pool (hashlib releases the GIL on large
+buffers) while the decoder runs ahead on its own producer thread. Digests
+are folded strictly in frame order, and at most `max_in_flight` decoded
+frames are alive at any time, so memory stays bounded whatever the length.
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TypeVar
+
+from app.core import config
+from app.engine.visual.frame_extractor import iter_frame_arrays
+from app.engine.visual.frame_hashing import Frame, hash_frame_digest
+
+DIGEST_SIZE = 32
+JOURNAL_VERSION = 1
+
+T = TypeVar("T")
+
+
+def _sidecar(journal: Path) -> Path:
+    return journal.with_name(journal.name + ".json")
+
+
+class FrameChainState:
+    """Running frame chain hash, optionally journaled for resume."""
+
+    def __init__(
+        self, journal: Optional[Path] = None, source: Optional[Dict[str, Any]] = None
+    ):
+        self._running = hashlib.sha256()
+        self.frames = 0
+        self.source = source or {}
+        self.journal = Path(journal) if journal else None
+        self._file = None
+        if self.journal is not None:
+            self.journal.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.journal.open("ab")
+
+    @classmethod
+    def resume(
+        cls, journal: Path, source: Optional[Dict[str, Any]] = None
+    ) -> "FrameChainState":
+        """
+        Rebuild the state from a journal (a missing journal starts fresh).
+        Raises ValueError if the journal was written for a different source
+        or does not match its own checkpoint.
+        """
+        journal = Path(journal)
+        meta = {}
+        if _sidecar(journal).exists():
+            meta = json.loads(_sidecar(journal).read_text(encoding="utf-8"))
+            if source is not None and meta.get("source") != source:
+                raise ValueError(f"journal {journal} belongs to a different source")
+
+        data = journal.read_bytes() if journal.exists() else b""
+        whole = len(data) - len(data) % DIGEST_SIZE
+        if whole != len(data):
+            # drop a digest torn by the interruption
+            with journal.open("rb+") as f:
+                f.truncate(whole)
+
+        checkpointed = meta.get("frames", 0) * DIGEST_SIZE
+        if checkpointed > whole or (
+            meta
+            and hashlib.sha256(data[:checkpointed]).hexdigest() != meta["chain_hash"]
+        ):
+            raise ValueError(f"journal {journal} does not match its checkpoint")
+
+        state = cls(journal, source if source is not None else meta.get("source"))
+        state._running.update(memoryview(data)[:whole])
+        state.frames = whole // DIGEST_SIZE
+        return state
+
+    def update(self, digest: bytes) -> None:
+        """Fold the next frame digest into the chain."""
+        self._running.update(digest)
+        self.frames += 1
+        if self._file is not None:
+            self._file.write(digest)
+
+    def add_frame(self, frame: Frame) -> bytes:
+        digest = hash_frame_digest(frame)
+        self.update(digest)
+        return digest
+
+    @property
+    def chain_hash(self) -> str:
+        """Chain hash of the frames folded so far."""
+        return self._running.hexdigest()
+
+    def checkpoint(self) -> None:
+        """Make every folded frame durable in the journal."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        meta = {
+            "version": JOURNAL_VERSION,
+            "source": self.source,
+            "frames": self.frames,
+            "chain_hash": self.chain_hash,
+        }
+        sidecar = _sidecar(self.journal)
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, sidecar)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+
+
+def iter_frame_digests(
+    frames: Iterable[Frame],
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the 32-byte digest of every frame, in input order.
+
+    Frames are hashed on `workers` threads; at most `max_in_flight` frames
+    (default 2 per worker) are submitted and not yet yielded. workers <= 1
+    hashes inline.
+    """
+    workers = workers or config.FRAME_HASH_WORKERS
+    if workers <= 1:
+        for frame in frames:
+            yield hash_frame_digest(frame)
+        return
+
+    max_in_flight = max_in_flight or config.FRAME_HASH_MAX_IN_FLIGHT or 2 * workers
+    pending = deque()
+    with ThreadPoolExecutor(workers, thread_name_prefix="frame-hash") as pool:
+        try:
+            for frame in frames:
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(hash_frame_digest, frame))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+_DONE = object()
+
+
+def prefetch(items: Iterable[T], depth: Optional[int] = None) -> Iterator[T]:
+    """
+    Run `items` (e.g. a decoder) on a producer thread, at most `depth`
+    items ahead of the consumer. Exceptions are re-raised in the consumer;
+    closing the returned iterator stops the producer.
+    """
+    depth = depth or config.FRAME_DECODE_PREFETCH
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((True, item)):
+                    return
+            put((True, _DONE))
+        except BaseException as e:
+            put((False, e))
+        finally:
+            # runs the decoder's own cleanup (e.g. closing the reader)
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="frame-decode", daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, item = buffer.get()
+            if not ok:
+                raise item
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def hash_frames(
+    frames: Iterable[Frame],
+    state: Optional[FrameChainState] = None,
+    checkpoint_every: Optional[int] = None,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> FrameChainState:
+    """Hash frames and fold them, in order, into `state` (a new one by default)."""
+    state = state if state is not None else FrameChainState()
+    for digest in iter_frame_digests(frames, workers, max_in_flight):
+        state.update(digest)
+        if checkpoint_every and state.frames % checkpoint_every == 0:
+            state.checkpoint()
+    return state
+
+
+def source_identity(path: str, target_fps: Optional[float] = None) -> Dict[str, Any]:
+    """What a journal must match to be resumed: file, size, mtime, sampling."""
+    st = os.stat(path)
+    return {
+        "path": str(Path(path).resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "target_fps": target_fps,
+    }
+
+
+def hash_video(
+    path: str,
+    target_fps: Optional[float] = None,
+    journal: Optional[Path] = None,
+    resume: bool = False,
+    checkpoint_every: int = 256,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Decode, hash and chain a video in one pass.
+
+    Returns {"frames": n, "chain_hash": hex, "resumed_from": k}. With a
+    journal the state is checkpointed every `checkpoint_every` frames; with
+    resume=True a matching journal is continued instead of started over.
+    Decoding runs on a producer thread, hashing on `workers` threads.
+    """
+    source = source_identity(path, target_fps)
+    if journal is not None and resume:
+        state = FrameChainState.resume(journal, source)
+    else:
+        if journal is not None:
+            Path(journal).unlink(missing_ok=True)
+            _sidecar(Path(journal)).unlink(missing_ok=True)
+        state = FrameChainState(journal, source)
+
+    resumed_from = state.frames
+    try:
+        decoded = iter_frame_arrays(path, target_fps, resumed_from)
+        frames = prefetch(arr for _, arr in decoded)
+        hash_frames(frames, state, checkpoint_every, workers, max_in_flight)
+    finally:
+        state.close()
+    return {
+        "frames": state.frames,
+        "chain_hash": state.chain_hash,
+        "resumed_from": resumed_from,
+    }
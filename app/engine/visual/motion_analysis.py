@@ -3,12 +3,75 @@
 
 This is intentionally a lightweight, dependency-friendly baseline. It produces
 motion vectors and a simple motion signature useful for physics checks.
+
+Two modes:
+
+    reference  full-resolution TV-L1 on every consecutive frame pair
+    fast       iterative Lucas-Kanade (ILK) on grayscale frames downscaled
+               to at most `max_side` pixels, optionally on every `stride`-th
+               frame only
+
+Every frame is converted to grayscale (and downscaled) once, however many
+pairs it belongs to. Fast-mode flow is scaled back to full-resolution
+pixels per frame step, so both modes report magnitudes in the same units;
+benchmark() reports how far fast mode drifts from the reference.
 """
-from typing import Dict, List
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 from skimage.color import rgb2gray
-from skimage.registration import optical_flow_tvl1
+from skimage.registration import optical_flow_ilk, optical_flow_tvl1
+from skimage.transform import resize
+
+from app.core import config
+
+MODES = ("reference", "fast")
+
+# ILK window radius used in fast mode
+ILK_RADIUS = 5
+
+Scale = Tuple[float, float]  # (vertical, horizontal) full / downscaled size
+
+
+def to_gray(frame: np.ndarray) -> np.ndarray:
+    """float32 grayscale of an RGB(A) or already-gray frame."""
+    if frame.ndim == 2:
+        gray = frame.astype("float32")
+        return gray / 255.0 if frame.dtype == np.uint8 else gray
+    return rgb2gray(frame[..., :3]).astype("float32")
+
+
+def downscale_gray(gray: np.ndarray, max_side: int) -> Tuple[np.ndarray, Scale]:
+    """Anti-aliased downscale so the longer side is at most max_side."""
+    h, w = gray.shape
+    factor = max(h, w) / max_side if max_side else 1.0
+    if factor <= 1.0:
+        return gray, (1.0, 1.0)
+    size = (max(1, round(h / factor)), max(1, round(w / factor)))
+    small = resize(gray, size, anti_aliasing=True).astype("float32")
+    return small, (h / size[0], w / size[1])
+
+
+def flow_from_gray(
+    prev_gray: np.ndarray, next_gray: np.ndarray, mode: str = "reference"
+) -> np.ndarray:
+    """(H, W, 2) float32 flow (u, v) between two grayscale frames."""
+    if mode == "reference":
+        v, u = optical_flow_tvl1(prev_gray, next_gray)
+    elif mode == "fast":
+        v, u = optical_flow_ilk(prev_gray, next_gray, radius=ILK_RADIUS)
+    else:
+        raise ValueError(f"unknown motion mode {mode!r} (expected one of {MODES})")
+    # the registration functions return (v, u): v vertical, u horizontal
+    return np.stack([u, v], axis=-1).astype("float32")
 
 
 def compute_dense_optical_flow(
@@ -18,12 +81,7 @@ def compute_dense_optical_flow(
 
     Returns a float32 array shape (H, W, 2) containing flow vectors.
     """
-    prev_gray = rgb2gray(prev_frame).astype("float32")
-    next_gray = rgb2gray(next_frame).astype("float32")
-    v, u = optical_flow_tvl1(prev_gray, next_gray)
-    # optical_flow_tvl1 returns (v, u) where v is vertical, u is horizontal displacement
-    flow = np.stack([u, v], axis=-1).astype("float32")
-    return flow
+    return flow_from_gray(to_gray(prev_frame), to_gray(next_frame))
 
 
 def summarize_flow_magnitude(flow: np.ndarray) -> float:
@@ -32,25 +90,305 @@ def summarize_flow_magnitude(flow: np.ndarray) -> float:
     return float(np.mean(mag))
 
 
-def motion_signature_from_frames(frames: List[np.ndarray]) -> Dict[str, float]:
+def pair_magnitude(
+    prev_gray: np.ndarray,
+    next_gray: np.ndarray,
+    mode: str = "reference",
+    scale: Scale = (1.0, 1.0),
+    stride: int = 1,
+) -> float:
+    """Mean flow magnitude of one pair, in full-resolution pixels per frame."""
+    flow = flow_from_gray(prev_gray, next_gray, mode)
+    if scale != (1.0, 1.0):
+        flow[..., 0] *= scale[1]
+        flow[..., 1] *= scale[0]
+    return summarize_flow_magnitude(flow) / stride
+
+
+def _settings(
+    mode: Optional[str], max_side: Optional[int], stride: Optional[int]
+) -> Tuple[str, int, int]:
+    mode = mode or config.MOTION_MODE
+    if mode not in MODES:
+        raise ValueError(f"unknown motion mode {mode!r} (expected one of {MODES})")
+    if mode == "reference":
+        return mode, 0, 1
+    max_side = config.MOTION_FAST_MAX_SIDE if max_side is None else max_side
+    stride = max(1, stride or config.MOTION_FAST_STRIDE)
+    return mode, max_side, stride
+
+
+def iter_grays(
+    frames: Iterable[np.ndarray], max_side: int = 0
+) -> Iterator[Tuple[np.ndarray, Scale]]:
+    """Grayscale (and downscale) each frame, once."""
+    for frame in frames:
+        yield downscale_gray(to_gray(frame), max_side)
+
+
+def _signature(magnitudes: List[float]) -> Dict[str, float]:
+    if not magnitudes:
+        return {"mean_magnitude": 0.0, "std_magnitude": 0.0, "peak": 0.0}
+    return {
+        "mean_magnitude": float(np.mean(magnitudes)),
+        "std_magnitude": float(np.std(magnitudes)),
+        "peak": float(np.max(magnitudes)),
+    }
+
+
+def _serial_magnitudes(
+    grays: Iterator[Tuple[np.ndarray, Scale]], mode: str, stride: int
+) -> List[float]:
+    magnitudes = []
+    prev = None
+    for gray, scale in grays:
+        if prev is not None:
+            magnitudes.append(pair_magnitude(prev, gray, mode, scale, stride))
+        prev = gray
+    return magnitudes
+
+
+def motion_signature_from_frames(
+    frames: List[np.ndarray],
+    mode: Optional[str] = None,
+    max_side: Optional[int] = None,
+    stride: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, float]:
     """Compute a lightweight motion signature for a sequence of frames.
 
+    mode is "reference" or "fast" (default config.MOTION_MODE); max_side and
+    stride apply to fast mode only (defaults from config). With workers > 1
+    (default config.MOTION_WORKERS) and at least
+    config.MOTION_MIN_PARALLEL_PAIRS pairs, the pairs are spread over a
+    process pool that stays up between calls; the result is identical to
+    the serial path.
+
     Output example:
     {"mean_magnitude": 1.2, "std_magnitude": 0.3, "peak": 4.5}
     """
+    mode, max_side, stride = _settings(mode, max_side, stride)
     if not frames or len(frames) < 2:
-        return {"mean_magnitude": 0.0, "std_magnitude": 0.0, "peak": 0.0}
+        return _signature([])
 
-    magnitudes = []
-    for i in range(len(frames) - 1):
-        prev = frames[i]
-        nxt = frames[i + 1]
-        flow = compute_dense_optical_flow(prev, nxt)
-        mag = np.sqrt(flow[..., 0] ** 2 + flow[..., 1] ** 2)
-        magnitudes.append(float(np.mean(mag)))
-
-    mean = float(np.mean(magnitudes))
-    std = float(np.std(magnitudes))
-    peak = float(np.max(magnitudes))
-
-    return {"mean_magnitude": mean, "std_magnitude": std, "peak": peak}
+    sampled = frames[::stride]
+    if len(sampled) < 2:
+        # stride skipped past every later frame: pair the first and last
+        sampled, stride = [frames[0], frames[-1]], len(frames) - 1
+
+    workers = workers or config.MOTION_WORKERS
+    grays = iter_grays(sampled, max_side)
+    pairs = len(sampled) - 1
+    if workers > 1 and pairs > 1 and pairs >= config.MOTION_MIN_PARALLEL_PAIRS:
+        magnitudes = _parallel_magnitudes(grays, len(sampled), mode, stride, workers)
+    else:
+        magnitudes = _serial_magnitudes(grays, mode, stride)
+    return _signature(magnitudes)
+
+
+# ------------------------------------------------------------
+# Process pool over frame pairs
+# ------------------------------------------------------------
+#
+# The pool is spawned once per worker count and kept. Grayscale frames are
+# written, a block at a time, into one shared-memory buffer of
+# (block + 1, H, W) float32 per call; each task carries only the buffer's
+# name and a pair index, and a worker attaches to a buffer the first time
+# it sees it, so no frame is ever pickled. The last frame of a block is
+# carried over as the first of the next, so every frame is still
+# converted once. Magnitudes come back through an ordered map, and since
+# each pair is computed by the same function on the same values as in the
+# serial path, the signature is identical.
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+_worker_grays: Optional[np.ndarray] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn: forking a threaded server process is not safe
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def shutdown_pools() -> None:
+    """Stop all motion workers (app shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _attach_frames(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """The worker's view of the call's buffer, replacing the previous call's."""
+    global _worker_grays, _worker_shm
+    if _worker_shm is None or _worker_shm.name != name:
+        if _worker_shm is not None:
+            _worker_grays = None
+            _worker_shm.close()
+        _worker_shm = shared_memory.SharedMemory(name=name)
+        _worker_grays = np.ndarray(shape, dtype=np.float32, buffer=_worker_shm.buf)
+    return _worker_grays
+
+
+def _shared_pair_magnitude(
+    name: str, shape: Tuple[int, ...], slot: int, mode: str, scale: Scale, stride: int
+) -> float:
+    grays = _attach_frames(name, shape)
+    return pair_magnitude(grays[slot], grays[slot + 1], mode, scale, stride)
+
+
+def _parallel_magnitudes(
+    grays: Iterator[Tuple[np.ndarray, Scale]],
+    count: int,
+    mode: str,
+    stride: int,
+    workers: int,
+) -> List[float]:
+    first, scale = next(grays)
+    block = min(count - 1, workers * config.MOTION_PAIRS_PER_WORKER)
+    shape = (block + 1,) + first.shape
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        buffer[0] = first
+        magnitudes: List[float] = []
+        pool = _get_pool(workers)
+        pair = partial(_shared_pair_magnitude, shm.name, shape)
+        filled = 1
+        for gray, scale in grays:
+            buffer[filled] = gray
+            filled += 1
+            if filled == block + 1:
+                magnitudes.extend(_run_block(pool, pair, filled, mode, scale, stride))
+                buffer[0] = buffer[filled - 1]
+                filled = 1
+        if filled > 1:
+            magnitudes.extend(_run_block(pool, pair, filled, mode, scale, stride))
+        del buffer
+        return magnitudes
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run_block(
+    pool, pair, filled: int, mode: str, scale: Scale, stride: int
+) -> List[float]:
+    """Magnitudes of the pairs in buffer slots 0..filled-1, in order."""
+    slots = range(filled - 1)
+    n = len(slots)
+    return list(pool.map(pair, slots, [mode] * n, [scale] * n, [stride] * n))
+
+
+# ------------------------------------------------------------
+# Fast mode accuracy benchmark
+# ------------------------------------------------------------
+
+
+def synthetic_benchmark_set(
+    shape: Tuple[int, int] = (360, 640), frames: int = 4, seed: int = 0
+) -> Dict[str, List[np.ndarray]]:
+    """Clips of a smooth random texture under known motion (RGB uint8)."""
+    from scipy import ndimage
+
+    rng = np.random.default_rng(seed)
+    texture = ndimage.gaussian_filter(rng.random(shape), 3)
+    texture = (texture - texture.min()) / (texture.max() - texture.min())
+
+    def clip(dy: float, dx: float, zoom: float = 1.0) -> List[np.ndarray]:
+        out = []
+        for t in range(frames):
+            matrix = np.eye(2) / zoom**t
+            center = np.array(shape) / 2
+            offset = center - matrix @ center - np.array([dy, dx]) * t
+            moved = ndimage.affine_transform(
+                texture, matrix, offset, order=1, mode="reflect"
+            )
+            out.append(np.repeat((moved * 255).astype(np.uint8)[..., None], 3, -1))
+        return out
+
+    return {
+        "static": clip(0.0, 0.0),
+        "pan_1px": clip(0.0, 1.0),
+        "pan_4px": clip(1.5, 4.0),
+        "zoom": clip(0.0, 0.0, zoom=1.02),
+    }
+
+
+def benchmark(
+    clips: Dict[str, List[np.ndarray]],
+    max_side: Optional[int] = None,
+    stride: Optional[int] = None,
+) -> Dict[str, Dict]:
+    """Fast mode against the TV-L1 reference on each clip.
+
+    Per clip: both signatures, their timings, and the delta of every field
+    (fast - reference, and relative to the reference where it is non-zero).
+    Both modes run serially (workers=1), so the timings compare the flow
+    algorithms alone, without pool startup or dispatch.
+    Run `python -m app.engine.visual.motion_analysis [videos...]` for a report.
+    """
+    report = {}
+    for name, frames in clips.items():
+        runs = {}
+        for mode in MODES:
+            started = time.perf_counter()
+            signature = motion_signature_from_frames(
+                frames, mode, max_side, stride, workers=1
+            )
+            runs[mode] = (signature, time.perf_counter() - started)
+        (ref, ref_s), (fast, fast_s) = runs["reference"], runs["fast"]
+        report[name] = {
+            "reference": ref,
+            "fast": fast,
+            "delta": {k: fast[k] - ref[k] for k in ref},
+            "relative_delta": {k: (fast[k] - ref[k]) / ref[k] for k in ref if ref[k]},
+            "reference_seconds": ref_s,
+            "fast_seconds": fast_s,
+            "speedup": ref_s / fast_s if fast_s else None,
+        }
+    return report
+
+
+def _load_clip(path: str, max_frames: int) -> List[np.ndarray]:
+    from app.engine.visual.frame_extractor import iter_frame_arrays
+
+    frames = []
+    for _, arr in iter_frame_arrays(path):
+        frames.append(np.array(arr))
+        if len(frames) >= max_frames:
+            break
+    return frames
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark fast motion signatures against TV-L1"
+    )
+    parser.add_argument(
+        "videos", nargs="*", help="clips to benchmark (default: synthetic set)"
+    )
+    parser.add_argument("--max-frames", type=int, default=8)
+    parser.add_argument("--max-side", type=int, default=None)
+    parser.add_argument("--stride", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.videos:
+        clips = {path: _load_clip(path, args.max_frames) for path in args.videos}
+    else:
+        clips = synthetic_benchmark_set()
+    print(json.dumps(benchmark(clips, args.max_side, args.stride), indent=2))
+
+
+if __name__ == "__main__":
+    main()
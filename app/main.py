@@ -1,7 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.v1.router import router as api_v1_router
+from app.core import key_registry
+from app.core.offload import shutdown_executors
+from app.engine.anchor.anchor_service import AnchorService
+from app.engine.anchor.merkle import get_merkle_tree
+from app.engine.ingest.pipeline import get_pipeline
+from app.engine.search.search_index import save_search_index
+from app.engine.validation.validator import shutdown_pools
+from app.engine.visual.motion_analysis import shutdown_pools as shutdown_motion_pools
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the signing key once; a missing key only fails /events/create.
+    try:
+        key_registry.load_signing_key()
+    except Exception:
+        pass
+    # attach the Merkle tree so every append extends it
+    await asyncio.to_thread(get_merkle_tree)
+    await get_pipeline().start()
+    anchor_service = AnchorService()
+    await anchor_service.start()
+    yield
+    await anchor_service.stop()
+    # drain queued writes before anything else goes away
+    await get_pipeline().stop()
+    shutdown_pools()
+    shutdown_motion_pools()
+    shutdown_executors()
+    save_search_index()
+
 
-app = FastAPI(title="TrueTrace Engine")
+app = FastAPI(title="TrueTrace Engine", lifespan=lifespan)
 
 app.include_router(api_v1_router)
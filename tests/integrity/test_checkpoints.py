@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from app.engine.state.chain_store import ChainStore
+from app.engine.state.checkpoints import (
+    advance_checkpoint,
+    load_checkpoints,
+    resume_point,
+)
+from app.engine.validation.validator import EventValidator
+
+
+def _chain(helpers, sign_fn, pubkey_hex, n, prev_hash=""):
+    hv = helpers["hash_validation"]
+    chain = []
+    for i in range(n):
+        evt = {
+            "event_id": f"evt-cp-{i:03d}",
+            "event_version": "1.5",
+            "timestamp": 1700000000 + i,
+            "event_type": "checkpoint",
+            "payload": {"i": i},
+            "prev_hash": prev_hash,
+            "origin": "test",
+            "trace_id": f"cp-{i}",
+        }
+        evt["signature"] = sign_fn(hv.canonical_event_bytes(evt))
+        evt["pubkey"] = pubkey_hex
+        evt["hash"] = hv.compute_event_hash(evt)
+        chain.append(evt)
+        prev_hash = evt["hash"]
+    return chain
+
+
+@pytest.mark.integration
+def test_incremental_verification_resumes_after_checkpoint(
+    tmp_path, helpers, sign_fn, pubkey_hex
+):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    cp_file = tmp_path / "checkpoints.jsonl"
+    validator = EventValidator(workers=1)
+
+    store.append_many(_chain(helpers, sign_fn, pubkey_hex, 5))
+    checkpoint, start = resume_point(store, path=cp_file)
+    assert (checkpoint, start) == (None, 0)
+
+    events = list(store.iter_events(start=start))
+    cp = advance_checkpoint(
+        start, events, validator.validate_many(events), path=cp_file
+    )
+    assert cp["last_index"] == 4
+    assert cp["tail_hash"] == events[-1]["hash"]
+
+    checkpoint, start = resume_point(store, path=cp_file)
+    assert checkpoint == cp
+    assert start == 5
+    assert list(store.iter_events(start=start)) == []
+
+    # full=true always audits from genesis
+    assert resume_point(store, full=True, path=cp_file) == (None, 0)
+
+
+@pytest.mark.integration
+def test_checkpoint_stops_at_first_issue(tmp_path, helpers, sign_fn, pubkey_hex):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    cp_file = tmp_path / "checkpoints.jsonl"
+    chain = _chain(helpers, sign_fn, pubkey_hex, 6)
+    chain[3]["prev_hash"] = "deadbeef"
+    store.append_many(chain)
+
+    events = list(store.iter_events())
+    results = EventValidator(workers=1).validate_many(events)
+    cp = advance_checkpoint(0, events, results, path=cp_file)
+    assert cp["last_index"] == 2
+
+
+@pytest.mark.integration
+def test_forged_or_stale_checkpoints_are_ignored(
+    tmp_path, helpers, sign_fn, pubkey_hex
+):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    cp_file = tmp_path / "checkpoints.jsonl"
+    store.append_many(_chain(helpers, sign_fn, pubkey_hex, 3))
+
+    events = list(store.iter_events())
+    results = EventValidator(workers=1).validate_many(events)
+    advance_checkpoint(0, events, results, path=cp_file)
+
+    forged = dict(load_checkpoints(cp_file)[-1], last_index=1)
+    with cp_file.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(forged) + "\n")
+    assert resume_point(store, path=cp_file)[1] == 3
+
+    # chain rewritten underneath: the tail hash no longer matches
+    store.replace(_chain(helpers, sign_fn, pubkey_hex, 4, prev_hash="x"))
+    assert resume_point(store, path=cp_file) == (None, 0)
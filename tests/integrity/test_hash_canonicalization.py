@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 import pytest
 
 
@@ -28,3 +31,74 @@ def test_canonicalization_is_deterministic(helpers):
     bb = hv.canonical_event_bytes(fb)
 
     assert ba == bb, "Canonical bytes should be identical irrespective of key order"
+
+
+def _reference_bytes(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"b": 2, "a": 1, "nested": {"z": [3, 2, 1], "y": None}},
+        {"text": "héllo wörld ✓ 😀", "quote": 'a"b\\c', "ctl": "\n\t\x00"},
+        {"floats": [0.1, 1e300, -2.5, 1.0], "ints": [0, -1, 2**70]},
+        {"flags": [True, False, None], "empty": {"list": [], "obj": {}}},
+        {"nan": float("nan"), "inf": float("inf")},
+        {"10": "x", "9": "y", "ß": 1, "Z": 2, "a": 3},
+    ],
+)
+def test_canonical_encoder_matches_json_dumps(helpers, payload):
+    """The shared encoder must be byte-identical to json.dumps."""
+    hv = helpers["hash_validation"]
+    event = {
+        "event_id": "evt-canon",
+        "event_version": "1.5",
+        "timestamp": 1700000000,
+        "event_type": "canon",
+        "payload": payload,
+        "prev_hash": "",
+        "hash": "ignored",
+        "signature": "ignored",
+        "pubkey": "ignored",
+    }
+    expected = _reference_bytes(hv.filtered_for_hash(event))
+
+    assert hv.canonical_json_bytes(hv.filtered_for_hash(event)) == expected
+    assert hv.canonical_event_bytes(event) == expected
+    assert hv.CanonicalEvent(event).bytes == expected
+    assert hv.compute_event_hash(event) == hashlib.sha256(expected).hexdigest()
+
+
+def test_validate_canonicalizes_once(helpers, sign_fn, pubkey_hex, monkeypatch):
+    """Hash and signature checks share one canonicalization per event."""
+    hv = helpers["hash_validation"]
+    event = {
+        "event_id": "evt-once",
+        "event_version": "1.5",
+        "timestamp": 1,
+        "event_type": "t",
+        "payload": {"a": 1},
+        "prev_hash": "",
+    }
+    event["hash"] = hv.compute_event_hash(event)
+    event["signature"] = sign_fn(hv.canonical_event_bytes(event))
+    event["pubkey"] = pubkey_hex
+
+    calls = []
+    original = hv.canonical_event_bytes
+
+    def counting(evt):
+        calls.append(1)
+        return original(evt)
+
+    from app.engine.validation import signature_validation
+    from app.engine.validation.validator import EventValidator
+
+    monkeypatch.setattr(hv, "canonical_event_bytes", counting)
+    monkeypatch.setattr(signature_validation, "canonical_event_bytes", counting)
+
+    is_valid, result = EventValidator().validate(event)
+    assert is_valid, result
+    assert len(calls) == 1
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+from nacl.signing import SigningKey
+
+from app.engine.diagnostics.analysis import ChainAnalyzer
+from app.engine.ingest.pipeline import build_event
+from app.engine.state.chain_store import ChainStore
+from app.engine.validation.validator import EventValidator
+
+_key = SigningKey.generate()
+
+
+def _events(n, prev="", tamper=()):
+    events = []
+    for i in range(n):
+        event = build_event("analysis", {"n": i}, prev, _key).event
+        prev = event["hash"]
+        if i in tamper:
+            event["payload"] = {"n": -1}
+        events.append(event)
+    return events
+
+
+def _analyzer(tmp_path, events):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(events)
+    analyzer = ChainAnalyzer(
+        store=store,
+        validator=EventValidator(workers=1),
+        checkpoint_path=tmp_path / "checkpoints.jsonl",
+    )
+    return store, analyzer
+
+
+@pytest.mark.unit
+def test_results_match_per_event_validation(tmp_path):
+    events = _events(12, tamper={4})
+    store, analyzer = _analyzer(tmp_path, events)
+    analysis = analyzer.analyze(full=True)
+
+    validator = EventValidator(workers=1)
+    for index, event, result in analyzer.iter_results(analysis):
+        assert result == validator.validate(event)
+    assert analysis.issue_indexes() == [4, 5]
+    assert analysis.issues(5)[0].startswith("chain_link_mismatch")
+    assert analysis.clean_through == 3
+    assert analysis.checkpoint["last_index"] == 3
+
+
+@pytest.mark.unit
+def test_unchanged_chain_is_served_from_cache(tmp_path):
+    store, analyzer = _analyzer(tmp_path, _events(10))
+    first = analyzer.analyze()
+    assert analyzer.analyze() is first
+    assert analyzer.analyze(full=True) is first
+    assert analyzer.passes == 1
+
+
+@pytest.mark.unit
+def test_growth_analyzes_only_new_events(tmp_path):
+    events = _events(10)
+    store, analyzer = _analyzer(tmp_path, events)
+    analyzer.analyze()
+
+    more = _events(3, prev=events[-1]["hash"], tamper={1})
+    store.append_many(more)
+
+    seen = []
+    validate = analyzer.validator.validate
+
+    def counting(event, canonical=None):
+        seen.append(event["event_id"])
+        return validate(event, canonical)
+
+    analyzer.validator.validate = counting
+    analysis = analyzer.analyze()
+    assert seen == [e["event_id"] for e in more]
+    assert analysis.length == 13
+    assert analysis.issue_indexes() == [11, 12]
+    assert analysis.checkpoint["last_index"] == 10
+
+
+@pytest.mark.unit
+def test_rewritten_chain_is_reanalyzed(tmp_path):
+    store, analyzer = _analyzer(tmp_path, _events(6))
+    first = analyzer.analyze(full=True)
+    store.replace(_events(4))
+    second = analyzer.analyze(full=True)
+    assert second.length == 4
+    assert second.base == 0
+    assert second is not first
+
+
+@pytest.mark.unit
+def test_concurrent_callers_share_one_pass(tmp_path):
+    store, analyzer = _analyzer(tmp_path, _events(200))
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(analyzer.analyze()))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert analyzer.passes == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.integration
+def test_diagnostics_repeat_uses_cached_analysis(client):
+    first = client.get("/api/v1/diagnostics/diagnostics").json()
+    second = client.get("/api/v1/diagnostics/diagnostics").json()
+    assert second["analyzed_at"] == first["analyzed_at"]
+    assert second["details"] == first["details"]
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import multiprocessing
+
+import pytest
+
+from app.engine.anchor.anchor_log import AnchorLog
+from app.engine.anchor.anchor_service import AnchorService
+from app.engine.anchor.merkle import MerkleTree
+
+
+def _log(tmp_path):
+    return AnchorLog(tmp_path / "anchors.jsonl", tmp_path / "anchors.idx")
+
+
+@pytest.mark.unit
+def test_append_and_query(tmp_path):
+    log = _log(tmp_path)
+    assert log.latest() is None
+
+    for n in range(10):
+        log.append(tree_size=(n + 1) * 10, root=f"{n:064x}", timestamp=1000 + n * 60)
+
+    assert len(log) == 10
+    assert log.latest()["tree_size"] == 100
+    assert log.get(3) == {
+        "seq": 3,
+        "tree_size": 40,
+        "root": f"{3:064x}",
+        "timestamp": 1180,
+    }
+    assert [a["seq"] for a in log.query(since=1120, until=1300)] == [2, 3, 4, 5]
+    assert [a["seq"] for a in log.query(min_height=35, max_height=60)] == [3, 4, 5]
+    assert [a["seq"] for a in log.query(offset=8)] == [8, 9]
+    assert [a["seq"] for a in log.query(limit=2, offset=1)] == [1, 2]
+
+    # event 39 is first covered by the tree of size 40
+    assert log.covering(39)["tree_size"] == 40
+    assert log.covering(40)["tree_size"] == 50
+    assert log.covering(100) is None
+
+    with pytest.raises(ValueError):
+        log.append(tree_size=5, root="00" * 32)
+
+
+@pytest.mark.unit
+def test_reopen_recovers_torn_tail_and_index(tmp_path):
+    log = _log(tmp_path)
+    for n in range(4):
+        log.append(tree_size=n + 1, root=f"{n:064x}", timestamp=2000 + n)
+
+    with (tmp_path / "anchors.jsonl").open("ab") as f:
+        f.write(b'{"seq":4,"tree_si')
+    (tmp_path / "anchors.idx").write_bytes(b"garbage")
+
+    reopened = _log(tmp_path)
+    assert len(reopened) == 4
+    assert reopened.latest()["seq"] == 3
+    assert [a["seq"] for a in reopened.query(since=2002)] == [2, 3]
+    assert reopened.append(tree_size=9, root="ff" * 32)["seq"] == 4
+    assert len(_log(tmp_path)) == 5
+
+
+@pytest.mark.unit
+def test_handles_on_one_file_share_the_sequence(tmp_path):
+    a, b = _log(tmp_path), _log(tmp_path)
+    assert a.append(tree_size=1, root="aa" * 32)["seq"] == 0
+    assert b.latest()["seq"] == 0
+    assert b.append(tree_size=2, root="bb" * 32)["seq"] == 1
+    assert a.append(tree_size=3, root="cc" * 32)["seq"] == 2
+    with pytest.raises(ValueError):
+        b.append(tree_size=2, root="dd" * 32)  # below a's anchor
+
+    assert [a.get(n)["seq"] for n in range(3)] == [0, 1, 2]
+    assert [x["tree_size"] for x in b.query()] == [1, 2, 3]
+    assert len(_log(tmp_path)) == 3
+
+
+@pytest.mark.unit
+def test_writer_repairs_an_index_a_peer_left_short(tmp_path):
+    log = _log(tmp_path)
+    log.append(tree_size=1, root="aa" * 32, timestamp=10)
+    # a peer wrote its log line, then died before the index entry
+    line = {"seq": 1, "tree_size": 2, "root": "bb" * 32, "timestamp": 11}
+    with (tmp_path / "anchors.jsonl").open("a") as f:
+        f.write(json.dumps(line) + "\n")
+
+    assert log.append(tree_size=3, root="cc" * 32)["seq"] == 2
+    assert (tmp_path / "anchors.idx").stat().st_size == 3 * 24
+    assert log.covering(1)["seq"] == 1
+    assert _log(tmp_path)._load_index()
+
+
+def _anchor_from_process(tmp_path, count):
+    log = _log(tmp_path)
+    for _ in range(count):
+        log.append(tree_size=1, root="ab" * 32)
+
+
+@pytest.mark.unit
+def test_concurrent_appends_from_processes(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_anchor_from_process, args=(tmp_path, 10)) for _ in range(3)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0, 0, 0]
+
+    log = _log(tmp_path)
+    assert [a["seq"] for a in log.query()] == list(range(30))
+
+
+@pytest.mark.unit
+def test_anchor_service_records_tree_head(tmp_path):
+    log = _log(tmp_path)
+    tree = MerkleTree(tmp_path / "merkle")
+    service = AnchorService(log=log, tree=tree)
+
+    assert asyncio.run(service.perform_anchor()) is None  # empty chain
+
+    for n in range(5):
+        tree.append(f"{n:064x}")
+    anchor = asyncio.run(service.perform_anchor())
+    assert anchor["tree_size"] == 5
+    assert anchor["root"] == tree.root().hex()
+
+    # no growth, no new anchor
+    assert asyncio.run(service.perform_anchor()) is None
+    tree.append(f"{5:064x}")
+    assert asyncio.run(service.perform_anchor())["seq"] == 1
+
+
+@pytest.mark.integration
+def test_anchor_endpoints(client):
+    from app.engine.anchor.anchor_log import get_anchor_log
+
+    resp = client.get("/api/v1/anchors/latest")
+    if len(get_anchor_log()) == 0:
+        assert resp.status_code == 404
+
+    client.post("/api/v1/events/create", json={"event_type": "anchor", "payload": {}})
+    anchor = AnchorService().anchor_now()
+    assert anchor is not None
+
+    assert client.get("/api/v1/anchors/latest").json() == anchor
+    body = client.get("/api/v1/anchors", params={"min_height": anchor["tree_size"]})
+    assert body.status_code == 200
+    assert body.json()["anchors"][-1] == anchor
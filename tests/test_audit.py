@@ -0,0 +1,214 @@
+import io
+import json
+
+import pytest
+from nacl.signing import SigningKey
+
+from app.engine.diagnostics import audit
+from app.engine.diagnostics.audit import Progress, load_state, run_audit
+from app.engine.ingest.pipeline import build_event
+from app.engine.state.chain_store import ChainStore
+
+
+def _chain(tmp_path, n, tamper=(), unlink=()):
+    key = SigningKey.generate()
+    events, prev = [], ""
+    for i in range(n):
+        # a broken link that is still correctly hashed and signed
+        link = "0" * 64 if i in unlink else prev
+        event = build_event("audit", {"n": i}, link, key).event
+        prev = event["hash"]
+        if i in tamper:
+            event["payload"] = {"n": -1}
+        events.append(event)
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(events)
+    return store
+
+
+def _run(store, tmp_path, **kwargs):
+    kwargs.setdefault("checkpoint_path", tmp_path / "checkpoints.jsonl")
+    return run_audit(store=store, executor="thread", **kwargs)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("workers", [1, 4])
+def test_clean_chain(tmp_path, workers):
+    store = _chain(tmp_path, 50)
+    summary = _run(store, tmp_path, workers=workers, chunk_size=7)
+    assert summary["status"] == "ok"
+    assert summary["audited"] == 50
+    assert summary["issues"] == []
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("workers", [1, 4])
+def test_issues_are_reported_in_order(tmp_path, workers):
+    # 14 starts a chunk, so its broken link is only visible across chunks
+    store = _chain(tmp_path, 40, tamper={3}, unlink={14, 20})
+    seen = []
+    summary = _run(store, tmp_path, workers=workers, chunk_size=7, on_issue=seen.append)
+
+    assert summary["status"] == "issues_detected"
+    indexes = [i["index"] for i in summary["issues"]]
+    assert seen == summary["issues"]
+    # tampering 3 breaks its own hash and the link from 4 to it
+    assert indexes == [3, 4, 14, 20]
+    assert any(e.startswith("hash_mismatch") for e in summary["issues"][0]["errors"])
+    for issue in summary["issues"][1:]:
+        assert any(e.startswith("linkage_mismatch") for e in issue["errors"])
+
+
+@pytest.mark.unit
+def test_range_links_to_the_event_before_it(tmp_path):
+    store = _chain(tmp_path, 30, unlink={10})
+    summary = _run(store, tmp_path, workers=2, chunk_size=4, start=10, stop=20)
+    assert (summary["from"], summary["to"], summary["audited"]) == (10, 20, 10)
+    assert [i["index"] for i in summary["issues"]] == [10]
+
+
+@pytest.mark.unit
+def test_resume_continues_from_saved_state(tmp_path, monkeypatch):
+    store = _chain(tmp_path, 30, tamper={2})
+    state_path = tmp_path / "audit_state.json"
+
+    merge = audit._merge_chunk
+    calls = []
+
+    def interrupted(state, chunk):
+        issues = merge(state, chunk)
+        calls.append(chunk["start"])
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return issues
+
+    monkeypatch.setattr(audit, "_merge_chunk", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        _run(store, tmp_path, workers=1, chunk_size=5, state_path=state_path)
+    # interrupted before the second chunk was saved
+    assert load_state(state_path)["next"] == 5
+    monkeypatch.setattr(audit, "_merge_chunk", merge)
+
+    summary = _run(
+        store, tmp_path, workers=1, chunk_size=5, state_path=state_path, resume=True
+    )
+    assert summary["audited"] == 30
+    assert [i["index"] for i in summary["issues"]] == [2, 3]
+    assert not state_path.exists()
+    assert not audit.issues_path(state_path).exists()
+
+
+def _interrupt_after(monkeypatch, chunks):
+    merge = audit._merge_chunk
+    calls = []
+
+    def interrupted(state, chunk):
+        issues = merge(state, chunk)
+        calls.append(chunk["start"])
+        if len(calls) == chunks:
+            raise KeyboardInterrupt
+        return issues
+
+    monkeypatch.setattr(audit, "_merge_chunk", interrupted)
+    return merge
+
+
+@pytest.mark.unit
+def test_resume_keeps_its_range_when_the_chain_grows(tmp_path, monkeypatch):
+    store = _chain(tmp_path, 20, tamper={2})
+    state_path = tmp_path / "audit_state.json"
+
+    merge = _interrupt_after(monkeypatch, 3)
+    with pytest.raises(KeyboardInterrupt):
+        _run(store, tmp_path, workers=1, chunk_size=5, state_path=state_path)
+    monkeypatch.setattr(audit, "_merge_chunk", merge)
+
+    # the state keeps only the cursor; issues live in the sidecar
+    state = load_state(state_path)
+    assert "issues" not in state and state["issues_found"] == 2
+    store.append_many(list(_chain(tmp_path / "more", 1).iter_events()))
+
+    summary = _run(
+        store, tmp_path, workers=1, chunk_size=5, state_path=state_path, resume=True
+    )
+    assert (summary["from"], summary["to"], summary["audited"]) == (0, 20, 20)
+    assert [i["index"] for i in summary["issues"]] == [2, 3]
+
+
+@pytest.mark.unit
+def test_resume_rejects_another_range(tmp_path, monkeypatch):
+    store = _chain(tmp_path, 20)
+    state_path = tmp_path / "audit_state.json"
+
+    _interrupt_after(monkeypatch, 2)
+    with pytest.raises(KeyboardInterrupt):
+        _run(store, tmp_path, workers=1, chunk_size=5, state_path=state_path)
+
+    with pytest.raises(ValueError):
+        _run(store, tmp_path, state_path=state_path, resume=True, stop=15)
+    with pytest.raises(ValueError):
+        _run(store, tmp_path, state_path=state_path, resume=True, start=5)
+    # naming the saved range is fine
+    summary = _run(
+        store, tmp_path, workers=1, state_path=state_path, resume=True, start=0, stop=20
+    )
+    assert summary["audited"] == 20
+
+
+@pytest.mark.unit
+def test_issues_of_an_unsaved_chunk_are_dropped_on_resume(tmp_path, monkeypatch):
+    store = _chain(tmp_path, 20, tamper={2, 7})
+    state_path = tmp_path / "audit_state.json"
+
+    save = audit.save_state
+    saves = []
+
+    def crashing(path, state):
+        saves.append(state["next"])
+        if len(saves) == 2:
+            raise KeyboardInterrupt
+        save(path, state)
+
+    monkeypatch.setattr(audit, "save_state", crashing)
+    with pytest.raises(KeyboardInterrupt):
+        _run(store, tmp_path, workers=1, chunk_size=5, state_path=state_path)
+    monkeypatch.setattr(audit, "save_state", save)
+    # the second chunk's issues reached the sidecar, its state did not
+    assert len(audit.issues_path(state_path).read_text().splitlines()) == 4
+
+    summary = _run(
+        store, tmp_path, workers=1, chunk_size=5, state_path=state_path, resume=True
+    )
+    assert [i["index"] for i in summary["issues"]] == [2, 3, 7, 8]
+
+
+@pytest.mark.unit
+def test_ndjson_report(tmp_path, monkeypatch):
+    store = _chain(tmp_path, 12, unlink={5})
+    monkeypatch.setattr(audit, "get_store", lambda: store)
+    out = tmp_path / "report.ndjson"
+
+    status = audit.main(
+        [
+            "--workers", "1",
+            "--format", "ndjson",
+            "--output", str(out),
+            "--state", str(tmp_path / "state.json"),
+            "--quiet",
+        ]
+    )  # fmt: skip
+
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert status == 1
+    assert [line["type"] for line in lines] == ["issue", "summary"]
+    assert lines[0]["index"] == 5
+    assert lines[1]["issues_found"] == 1
+
+
+@pytest.mark.unit
+def test_progress_line():
+    stream = io.StringIO()
+    progress = Progress(100, stream=stream)
+    progress.update(50, 1, final=True)
+    assert "50/100" in stream.getvalue()
+    assert "ETA" in stream.getvalue()
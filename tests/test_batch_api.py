@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.mark.integration
+def test_batch_creates_linked_events(client):
+    before = client.get("/api/v1/events/latest").json()
+    items = [{"event_type": "batch", "payload": {"n": n}} for n in range(5)]
+
+    resp = client.post("/api/v1/events/batch", json={"events": items})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["status"] == "created"
+    assert body["created"] == 5
+    assert [r["index"] for r in body["results"]] == list(range(5))
+
+    events = [r["event"] for r in body["results"]]
+    assert [e["payload"]["n"] for e in events] == list(range(5))
+    assert events[0]["prev_hash"] == (before or {}).get("hash", "")
+    for prev, event in zip(events, events[1:]):
+        assert event["prev_hash"] == prev["hash"]
+
+    latest = client.get("/api/v1/events/latest").json()
+    assert latest["event_id"] == events[-1]["event_id"]
+
+
+@pytest.mark.integration
+def test_batch_reports_malformed_items(client):
+    items = [
+        {"event_type": "batch", "payload": {"n": 1}},
+        {"event_type": "batch", "payload": "not-an-object"},
+    ]
+
+    resp = client.post("/api/v1/events/batch", json={"events": items})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["status"] == "partial"
+    assert body["created"] == 1
+    assert body["results"][1]["status"] == "rejected"
+    assert body["results"][1]["errors"][0].startswith("invalid_item:payload")
+
+
+@pytest.mark.integration
+def test_atomic_batch_writes_nothing_on_error(client):
+    latest = client.get("/api/v1/events/latest").json()
+    items = [
+        {"event_type": "batch", "payload": {"n": 1}},
+        {"payload": {"n": 2}},
+    ]
+
+    resp = client.post("/api/v1/events/batch", json={"events": items, "atomic": True})
+    assert resp.status_code == 400
+    detail = resp.json()["detail"]
+    assert detail["rejected"] == 2
+    assert detail["results"][0]["errors"] == ["batch_aborted"]
+
+    assert client.get("/api/v1/events/latest").json() == latest
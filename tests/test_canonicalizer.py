@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.engine.visual.canonicalizer import (
+    BATCH_TOLERANCE,
+    canonicalize_frame_bytes,
+    canonicalize_frames,
+    iter_canonical_batches,
+    normalize_channels,
+)
+
+
+def _frames(n, shape=(37, 53, 3)):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (n,) + shape, dtype=np.uint8)
+
+
+def _reference(frames, target_size):
+    return np.stack(
+        [canonicalize_frame_bytes(f.tobytes(), f.shape, target_size) for f in frames]
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("target_size", [(10, 20), (80, 100), (37, 12), (20, 53)])
+def test_batch_resize_matches_pillow(target_size):
+    frames = _frames(3)
+    batch = canonicalize_frames(frames, target_size)
+    expected = _reference(frames, target_size)
+    diff = np.abs(batch.astype(int) - expected.astype(int))
+    assert batch.shape == expected.shape
+    assert diff.max() <= BATCH_TOLERANCE
+    assert np.array_equal(batch, expected)  # RGB is in fact bit-exact
+
+
+@pytest.mark.unit
+def test_output_buffer_is_reused():
+    frames = _frames(4)
+    out = np.empty((4, 16, 24, 3), np.uint8)
+    assert canonicalize_frames(frames, (16, 24), out) is out
+    assert np.array_equal(out, _reference(frames, (16, 24)))
+    with pytest.raises(ValueError):
+        canonicalize_frames(frames, (16, 25), out)
+
+
+@pytest.mark.unit
+def test_gray_and_rgba_are_normalized_to_rgb():
+    gray = _frames(2, (5, 7))
+    rgba = _frames(2, (5, 7, 4))
+    assert np.array_equal(normalize_channels(gray), np.stack([gray] * 3, axis=-1))
+    assert np.array_equal(normalize_channels(rgba), rgba[..., :3])
+    assert canonicalize_frames(gray[..., None]).shape == (2, 5, 7, 3)
+    rgb = _frames(2, (5, 7, 3))
+    assert normalize_channels(rgb) is rgb
+
+
+@pytest.mark.unit
+def test_batches_follow_shape_changes():
+    frames = list(_frames(5)) + list(_frames(2, (20, 30, 3)))
+    batches = [
+        b.copy() for b in iter_canonical_batches(iter(frames), 2, target_size=(8, 8))
+    ]
+    assert [len(b) for b in batches] == [2, 2, 1, 2]
+    assert np.array_equal(np.concatenate(batches), _reference(frames, (8, 8)))
@@ -0,0 +1,431 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from app.engine.state.chain_store import ChainStore
+
+
+def _event(i, prev_hash=""):
+    return {
+        "event_id": f"evt-store-{i:04d}",
+        "event_version": "1.5",
+        "timestamp": 1700000000 + i,
+        "event_type": "store",
+        "payload": {"i": i, "text": "héllo"},
+        "prev_hash": prev_hash,
+        "hash": f"{i:064x}",
+    }
+
+
+@pytest.mark.unit
+def test_append_tail_and_reopen(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    assert len(store) == 0
+    assert store.tail() is None
+
+    for i in range(10):
+        store.append(_event(i))
+
+    assert len(store) == 10
+    assert store.tail() == _event(9)
+    store.close()
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert len(reopened) == 10
+    assert reopened.tail() == _event(9)
+    assert list(reopened.iter_events()) == [_event(i) for i in range(10)]
+
+
+@pytest.mark.unit
+def test_segments_rotate(tmp_path):
+    store = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    store.append_many(_event(i) for i in range(20))
+    for i in range(20, 40):
+        store.append(_event(i))
+
+    segments = sorted((tmp_path / "store").glob("*.seg"))
+    assert len(segments) > 1
+    assert [e["event_id"] for e in store.iter_events()] == [
+        _event(i)["event_id"] for i in range(40)
+    ]
+
+    reopened = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    assert len(reopened) == 40
+    assert reopened.tail() == _event(39)
+
+
+@pytest.mark.unit
+def test_torn_group_is_truncated(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append(_event(0))
+    store.append_many([_event(1), _event(2)])
+    store.close()
+
+    segment = next((tmp_path / "store").glob("*.seg"))
+    data = segment.read_bytes()
+    # chop into the middle of the last record: the whole group must vanish
+    segment.write_bytes(data[:-5])
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert len(reopened) == 1
+    assert reopened.tail() == _event(0)
+
+    reopened.append(_event(1))
+    assert [e["event_id"] for e in reopened.iter_events()] == [
+        "evt-store-0000",
+        "evt-store-0001",
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("layout", ["list", "dict"])
+def test_legacy_chain_migrates_once(tmp_path, layout):
+    events = [_event(i) for i in range(3)]
+    legacy = tmp_path / "event_chain.json"
+    legacy.write_text(
+        json.dumps(events if layout == "list" else {"events": events}),
+        encoding="utf-8",
+    )
+
+    store = ChainStore(tmp_path / "store", legacy_file=legacy, fsync=False)
+    assert list(store.iter_events()) == events
+    store.append(_event(3))
+    store.close()
+
+    reopened = ChainStore(tmp_path / "store", legacy_file=legacy, fsync=False)
+    assert len(reopened) == 4
+
+
+@pytest.mark.unit
+def test_replace_rewrites_store(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(5))
+
+    store.replace([_event(7), _event(8)])
+    assert len(store) == 2
+    assert store.tail() == _event(8)
+
+    store.append(_event(9))
+    assert [e["event_id"] for e in store.iter_events()][-1] == "evt-store-0009"
+
+
+@pytest.mark.unit
+def test_head_pointer_tracks_appends(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    assert store.head.last_hash == ""
+    assert store.head.length == 0
+
+    store.append(_event(0))
+    store.append(_event(1, prev_hash=_event(0)["hash"]))
+    head = store.head
+    assert head.last_hash == _event(1)["hash"]
+    assert head.last_index == 1
+
+    sidecar = json.loads((tmp_path / "store" / "HEAD").read_text())
+    assert sidecar == head.to_json()
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert reopened.head == head
+
+
+@pytest.mark.unit
+def test_stale_head_sidecar_is_rebuilt(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(3))
+    store.close()
+
+    (tmp_path / "store" / "HEAD").write_text(
+        json.dumps({"last_hash": "bogus", "last_index": 7, "segment": 0, "offset": 0})
+    )
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert reopened.head.last_hash == _event(2)["hash"]
+    assert reopened.head.last_index == 2
+
+
+@pytest.mark.unit
+def test_iter_from_start_and_get(tmp_path):
+    store = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    for i in range(30):
+        store.append(_event(i))
+
+    assert [e["event_id"] for e in store.iter_events(start=25)] == [
+        _event(i)["event_id"] for i in range(25, 30)
+    ]
+    assert list(store.iter_events(start=30)) == []
+    assert list(store.iter_events(start=5, stop=8)) == [_event(i) for i in (5, 6, 7)]
+    assert store.get(0) == _event(0)
+    assert store.get(13) == _event(13)
+    assert store.get(-1) == _event(29)
+    assert store.get(30) is None
+
+
+@pytest.mark.unit
+def test_offset_and_id_indexes(tmp_path):
+    store = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    store.append_many(_event(i) for i in range(25))
+
+    assert store.find("evt-store-0017") == 17
+    assert store.get_by_id("evt-store-0003") == _event(3)
+    assert store.find("evt-missing") is None
+
+    store.append(_event(25))
+    assert store.find("evt-store-0025") == 25
+    store.close()
+
+    # lose the derived indexes entirely: they are rebuilt on open / lookup
+    for path in (tmp_path / "store").glob("*.idx"):
+        path.unlink()
+    reopened = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    assert reopened.get(11) == _event(11)
+    assert reopened.find("evt-store-0022") == 22
+
+
+@pytest.mark.unit
+def test_repeated_event_id_finds_the_latest(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many([_event(0), _event(1)])
+    assert store.find("evt-store-0000") == 0  # builds the id table
+    assert store.append(dict(_event(0), payload={"again": True})) == 2
+    assert store.find("evt-store-0000") == 2
+    store.close()
+
+    # read back from the id table, and followed from another handle
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert reopened.find("evt-store-0000") == 2
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append(_event(1))
+    assert reopened.find("evt-store-0001") == 3
+
+
+@pytest.mark.unit
+def test_id_table_grows_and_is_shared_between_handles(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append(_event(0))
+    assert store.find("evt-store-0000") == 0
+    other = ChainStore(tmp_path / "store", fsync=False)
+    assert other.find("evt-store-0000") == 0  # maps the same file
+
+    # past the first capacity: rewritten into a larger file
+    store.append_many(_event(i) for i in range(1, 1500))
+    table = tmp_path / "store" / "ids.tbl"
+    assert table.stat().st_size > 1024 * 24
+    assert other.find("evt-store-1499") == 1499
+    assert other.find("evt-store-0700") == 700
+    assert other.find("evt-missing") is None
+
+
+@pytest.mark.unit
+def test_id_table_replaces_the_text_index(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(5))
+    store.close()
+    (tmp_path / "store" / "ids.tbl").unlink(missing_ok=True)
+    (tmp_path / "store" / "ids.idx").write_text('0\t"evt-store-0000"\n')
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert not (tmp_path / "store" / "ids.idx").exists()
+    assert reopened.find("evt-store-0003") == 3
+    # an unreadable table is rebuilt from the chain
+    (tmp_path / "store" / "ids.tbl").write_bytes(b"junk")
+    assert ChainStore(tmp_path / "store", fsync=False).find("evt-store-0004") == 4
+
+
+@pytest.mark.unit
+def test_mapped_reads_follow_appends(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append(_event(0))
+    assert store.get(0) == _event(0)
+
+    # the active segment grows past its existing map
+    for i in range(1, 50):
+        store.append(_event(i))
+        assert store.get(i - 1) == _event(i - 1)
+    assert [e["event_id"] for e in store.iter_events(start=45)] == [
+        _event(i)["event_id"] for i in range(45, 50)
+    ]
+
+
+@pytest.mark.unit
+def test_record_views_check_stored_hash(tmp_path):
+    from app.engine.validation.hash_validation import (
+        canonical_event_bytes,
+        compute_event_hash,
+    )
+
+    store = ChainStore(tmp_path / "store", segment_max_bytes=512, fsync=False)
+    events = []
+    for i in range(12):
+        evt = _event(i)
+        evt["hash"] = compute_event_hash(evt)
+        events.append(evt)
+    events[7]["hash"] = "0" * 64
+    store.append_many(events)
+
+    record = store.record(3)
+    assert isinstance(record.canonical, memoryview)
+    assert bytes(record.canonical) == canonical_event_bytes(events[3])
+    assert record.event() == events[3]
+    assert store.record(-1).event() == events[-1]
+    assert store.record(12) is None
+
+    assert [i for i, r in enumerate(store.iter_records()) if not r.hash_ok()] == [7]
+
+
+@pytest.mark.unit
+def test_corrupt_record_is_detected(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(3))
+    store.close()
+
+    seg = next((tmp_path / "store").glob("*.seg"))
+    data = bytearray(seg.read_bytes())
+    data[40] ^= 0xFF  # inside the first record body
+    seg.write_bytes(bytes(data))
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert reopened.get(2) == _event(2)
+    with pytest.raises(ValueError):
+        reopened.get(0)
+
+
+@pytest.mark.unit
+def test_failed_append_is_rolled_back(tmp_path, monkeypatch):
+    store = ChainStore(tmp_path / "store", fsync=True)
+    store.append_many(_event(i) for i in range(3))
+
+    real_fsync = os.fsync
+    calls = []
+
+    def failing_fsync(fd):
+        calls.append(fd)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        store.append_many([_event(3), _event(4)])
+    monkeypatch.setattr(os, "fsync", real_fsync)
+
+    assert len(store) == 3
+    store.append(_event(5))
+    assert [e["event_id"] for e in store.iter_events()] == [
+        _event(i)["event_id"] for i in (0, 1, 2, 5)
+    ]
+    store.close()
+
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert len(reopened) == 4
+    assert reopened.get(2) == _event(2)
+    assert reopened.tail() == _event(5)
+
+
+@pytest.mark.unit
+def test_append_refused_when_rollback_fails(tmp_path, monkeypatch):
+    store = ChainStore(tmp_path / "store", fsync=True)
+    store.append(_event(0))
+
+    def broken(*args):
+        raise OSError("I/O error")
+
+    monkeypatch.setattr(os, "fsync", broken)
+    monkeypatch.setattr(os, "ftruncate", broken)
+    with pytest.raises(OSError):
+        store.append(_event(1))
+    monkeypatch.undo()
+
+    with pytest.raises(OSError, match="reopen"):
+        store.append(_event(2))
+    store.close()
+
+    # recovery keeps what reached the segment intact and drops the rest
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    kept = [e["event_id"] for e in reopened.iter_events()]
+    assert kept == [_event(i)["event_id"] for i in range(len(kept))]
+    reopened.append(_event(2))
+    assert reopened.tail() == _event(2)
+    assert reopened.get(len(kept)) == _event(2)
+
+
+def _append_from_process(directory, worker, count):
+    store = ChainStore(directory, fsync=False)
+    for i in range(count):
+        with store.lock:
+            store.append(_event(worker * 1000 + i, store.head.last_hash))
+    store.close()
+
+
+@pytest.mark.unit
+def test_store_handles_follow_each_other(tmp_path):
+    # two handles on one directory behave like two worker processes
+    a = ChainStore(tmp_path / "store", segment_max_bytes=1024, fsync=False)
+    a.append_many(_event(i) for i in range(3))
+    b = ChainStore(tmp_path / "store", segment_max_bytes=1024, fsync=False)
+    assert b.find(_event(2)["event_id"]) == 2
+
+    a.append_many(_event(i) for i in range(3, 20))  # rotates segments
+    assert len(b) == 20
+    assert b.tail() == _event(19)
+    assert b.get(10) == _event(10)
+    assert b.find(_event(15)["event_id"]) == 15
+
+    b.append(_event(20))
+    a.append(_event(21))
+    for store in (a, b):
+        assert [e["event_id"] for e in store.iter_events()] == [
+            _event(i)["event_id"] for i in range(22)
+        ]
+    a.close()
+    b.close()
+    assert len(ChainStore(tmp_path / "store", fsync=False)) == 22
+
+
+@pytest.mark.unit
+def test_writer_cuts_a_group_torn_by_another_process(tmp_path):
+    a = ChainStore(tmp_path / "store", fsync=False)
+    a.append_many(_event(i) for i in range(3))
+    b = ChainStore(tmp_path / "store", fsync=False)
+
+    # a peer died halfway through writing its group
+    seg = next((tmp_path / "store").glob("*.seg"))
+    with seg.open("ab") as f:
+        f.write(b"TT\x01\x00 half a record")
+
+    b.append(_event(3))
+    a.append(_event(4))
+    reopened = ChainStore(tmp_path / "store", fsync=False)
+    assert list(reopened.iter_events()) == [_event(i) for i in range(5)]
+
+
+@pytest.mark.integration
+def test_concurrent_appends_from_processes(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    directory = tmp_path / "store"
+    ChainStore(directory, fsync=False).close()
+    procs = [
+        ctx.Process(target=_append_from_process, args=(directory, w, 25))
+        for w in (1, 2, 3)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0, 0, 0]
+
+    store = ChainStore(directory, fsync=False)
+    ids = [e["event_id"] for e in store.iter_events()]
+    assert len(ids) == 75
+    assert sorted(ids) == sorted(
+        _event(w * 1000 + i)["event_id"] for w in (1, 2, 3) for i in range(25)
+    )
+    # each worker's own events stay in order
+    for w in (1, 2, 3):
+        mine = [i for i in ids if i.startswith(f"evt-store-{w}")]
+        assert mine == sorted(mine)
+    assert store.find(ids[40]) == 40
+    # store.lock spans processes: every event links to its real predecessor
+    events = list(store.iter_events())
+    assert [e["prev_hash"] for e in events[1:]] == [e["hash"] for e in events[:-1]]
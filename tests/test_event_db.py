@@ -0,0 +1,134 @@
+import pytest
+from sqlalchemy import text
+
+from app.db.event_db import EventDB
+from app.engine.state.chain_store import ChainStore
+
+
+def _event(i, event_type="test", trace_id=None):
+    return {
+        "event_id": f"evt-{i:04d}",
+        "event_type": event_type,
+        "timestamp": 1_700_000_000 + i,
+        "trace_id": trace_id or f"trace-{i % 3}",
+        "payload": {"n": i},
+        "hash": f"{i:064x}",
+    }
+
+
+@pytest.mark.unit
+def test_lookups_and_queries(tmp_path):
+    db = EventDB(tmp_path / "events.db")
+    events = [_event(i, "a" if i % 2 else "b") for i in range(20)]
+    assert db.add_many(enumerate(events), batch_size=7) == 20
+
+    assert db.count() == 20
+    assert db.max_index() == 19
+    assert db.latest() == events[-1]
+    assert db.get("evt-0005") == events[5]
+    assert db.get("missing") is None
+    assert db.get_index(3) == events[3]
+    assert db.range(5, 3) == events[5:8]
+    assert db.query(event_type="a", limit=3) == [events[1], events[3], events[5]]
+    assert db.query(trace_id="trace-1", since=1_700_000_010) == [
+        e for e in events[10:] if e["trace_id"] == "trace-1"
+    ]
+
+    # re-adding an index replaces its row
+    db.add(_event(19, "c"), 19)
+    assert db.count() == 20
+    assert db.latest()["event_type"] == "c"
+    db.close()
+
+
+@pytest.mark.unit
+def test_wal_and_indexed_plans(tmp_path):
+    db = EventDB(tmp_path / "events.db")
+    with db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        for column in ("event_id", "event_type", "timestamp", "trace_id"):
+            plan = conn.execute(
+                text(f"EXPLAIN QUERY PLAN SELECT body FROM events WHERE {column} = 1")
+            ).fetchall()
+            assert "USING INDEX" in " ".join(row[-1] for row in plan)
+    db.close()
+
+
+@pytest.mark.unit
+def test_legacy_jsonl_file_is_moved_aside(tmp_path):
+    path = tmp_path / "truetrace.db"
+    path.write_text('{"event_id": "old"}\n')
+
+    db = EventDB(path)
+    assert db.count() == 0
+    assert (tmp_path / "truetrace.db.jsonl").read_text() == '{"event_id": "old"}\n'
+    db.close()
+
+    # an existing SQLite database is left alone
+    EventDB(path).close()
+    assert not (tmp_path / "truetrace.db.1.jsonl").exists()
+
+
+@pytest.mark.unit
+def test_rebuild_and_catch_up_from_chain(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(10))
+    db = EventDB(tmp_path / "events.db")
+
+    assert db.rebuild_from_chain(store) == 10
+    store.append_many(_event(i) for i in range(10, 13))
+    assert db.catch_up(store) == 3
+    assert db.catch_up(store) == 0
+    assert db.list_all() == list(store.iter_events())
+
+    db.clear()
+    db.add(_event(99), 0)
+    assert db.rebuild_from_chain(store) == 13
+    assert db.get("evt-0099") is None
+    db.close()
+
+
+@pytest.mark.unit
+def test_repeated_event_id_keeps_every_row(tmp_path):
+    db = EventDB(tmp_path / "events.db")
+    first, again = _event(1), dict(_event(1), payload={"n": 2})
+    db.add_many([(0, first), (1, again)])
+
+    assert db.count() == 2
+    assert db.get_index(0) == first
+    assert db.get("evt-0001") == again
+    db.close()
+
+
+@pytest.mark.unit
+def test_catch_up_fills_gaps(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(12))
+    db = EventDB(tmp_path / "events.db")
+    # rows lost to failed writes: a leading hole and two inner ones
+    db.add_many((i, _event(i)) for i in (2, 3, 5, 9))
+
+    assert db.gaps() == [(0, 2), (4, 5), (6, 9)]
+    assert db.catch_up(store) == 8
+    assert db.gaps() == []
+    assert db.list_all() == list(store.iter_events())
+    db.close()
+
+
+@pytest.mark.unit
+def test_older_schema_is_replaced(tmp_path):
+    path = tmp_path / "events.db"
+    db = EventDB(path)
+    with db.engine.begin() as conn:
+        conn.execute(text("DROP TABLE events"))
+        conn.execute(text("CREATE TABLE events (idx INTEGER PRIMARY KEY, body TEXT)"))
+        conn.execute(text("PRAGMA user_version = 1"))
+    db.close()
+
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(_event(i) for i in range(3))
+    db = EventDB(path)
+    assert db.count() == 0
+    assert db.catch_up(store) == 3
+    assert db.get_index(2) == _event(2)
+    db.close()
@@ -0,0 +1,152 @@
+import imageio
+import numpy as np
+import pytest
+
+from app.engine.visual.frame_extractor import extract_frames
+from app.engine.visual.frame_hashing import (
+    build_frame_chain_hash,
+    hash_all_frames,
+    hash_frame_bytes,
+)
+from app.engine.visual.frame_stream import FrameChainState, hash_frames, hash_video
+
+
+def _frames(n, shape=(12, 16, 3)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(n)]
+
+
+def _video(tmp_path, n=9):
+    path = tmp_path / "clip.gif"
+    imageio.mimwrite(path, [np.full((12, 16, 3), i * 20, np.uint8) for i in range(n)])
+    return path
+
+
+@pytest.mark.unit
+def test_arrays_hash_like_their_bytes():
+    frame = _frames(1, (6, 8, 4))[0]
+    rgb = frame[..., :3]  # non-contiguous view
+    assert hash_frame_bytes(frame) == hash_frame_bytes(frame.tobytes())
+    assert hash_frame_bytes(rgb) == hash_frame_bytes(rgb.tobytes())
+
+
+@pytest.mark.unit
+def test_streaming_chain_matches_list_based_chain():
+    frames = _frames(7)
+    expected = build_frame_chain_hash(hash_all_frames(f.tobytes() for f in frames))
+    state = hash_frames(iter(frames))
+    assert state.frames == 7
+    assert state.chain_hash == expected
+    assert FrameChainState().chain_hash == build_frame_chain_hash([])
+
+
+@pytest.mark.unit
+def test_journal_resumes_after_interruption(tmp_path):
+    frames = _frames(10)
+    journal = tmp_path / "job.digests"
+
+    state = FrameChainState(journal, {"id": "clip"})
+    hash_frames(frames[:6], state, checkpoint_every=4)
+    state.close()
+    with journal.open("ab") as f:
+        f.write(b"\x00" * 5)  # torn write
+
+    resumed = FrameChainState.resume(journal, {"id": "clip"})
+    assert resumed.frames == 6
+    hash_frames(frames[6:], resumed)
+    resumed.close()
+    assert resumed.chain_hash == hash_frames(frames).chain_hash
+
+    with pytest.raises(ValueError):
+        FrameChainState.resume(journal, {"id": "other"})
+
+
+@pytest.mark.unit
+def test_hash_video_matches_extract_frames(tmp_path):
+    path = _video(tmp_path)
+    expected = build_frame_chain_hash(
+        hash_all_frames(frame for _, frame in extract_frames(str(path)))
+    )
+
+    result = hash_video(str(path))
+    assert result == {"frames": 9, "chain_hash": expected, "resumed_from": 0}
+
+    journal = tmp_path / "clip.digests"
+    hash_video(str(path), journal=journal)
+    # keep only the first 4 digests, as if the job had stopped there
+    with journal.open("rb+") as f:
+        f.truncate(4 * 32)
+    (tmp_path / "clip.digests.json").unlink()
+    result = hash_video(str(path), journal=journal, resume=True)
+    assert result == {"frames": 9, "chain_hash": expected, "resumed_from": 4}
+
+
+@pytest.mark.unit
+def test_parallel_digests_keep_frame_order_and_bound_in_flight(monkeypatch):
+    import threading
+    import time
+
+    from app.engine.visual import frame_stream
+
+    frames = _frames(40)
+    alive = []
+    lock = threading.Lock()
+    peak = [0]
+
+    def counted():
+        for frame in frames:
+            with lock:
+                alive.append(1)
+                peak[0] = max(peak[0], len(alive))
+            yield frame
+
+    digest = frame_stream.hash_frame_digest
+
+    def slow_digest(frame):
+        time.sleep(0.001 * (int(frame[0, 0, 0]) % 3))  # finish out of order
+        return digest(frame)
+
+    monkeypatch.setattr(frame_stream, "hash_frame_digest", slow_digest)
+    digests = []
+    for d in frame_stream.iter_frame_digests(counted(), workers=4, max_in_flight=6):
+        digests.append(d)
+        with lock:
+            alive.pop()
+
+    assert digests == [digest(f) for f in frames]
+    assert peak[0] <= 7  # in flight + the frame being submitted
+
+
+@pytest.mark.unit
+def test_prefetch_forwards_items_errors_and_stops_early():
+    from app.engine.visual.frame_stream import prefetch
+
+    assert list(prefetch(iter(range(10)), depth=2)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise RuntimeError("decode failed")
+
+    with pytest.raises(RuntimeError, match="decode failed"):
+        list(prefetch(failing()))
+
+    closed = []
+
+    def decoder():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.append(True)
+
+    it = prefetch(decoder(), depth=2)
+    assert next(it) == 0
+    it.close()
+    assert closed == [True]
+
+
+@pytest.mark.unit
+def test_parallel_hash_video_matches_serial(tmp_path):
+    path = _video(tmp_path, n=12)
+    serial = hash_video(str(path), workers=1)
+    assert hash_video(str(path), workers=4, max_in_flight=3) == serial
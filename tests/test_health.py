@@ -0,0 +1,55 @@
+import pytest
+
+from app.api.v1.endpoints import health
+
+
+@pytest.mark.integration
+def test_live_and_ready(client):
+    resp = client.get("/api/v1/health/live")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+    resp = client.get("/api/v1/health/ready")
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["chain_store"] == "ok"
+
+
+@pytest.mark.integration
+def test_health_validates_tail_once_per_head(client, monkeypatch):
+    calls = []
+    original = health.validator.validate
+
+    def counting(event, *args, **kwargs):
+        calls.append(event.get("event_id"))
+        return original(event, *args, **kwargs)
+
+    monkeypatch.setattr(health.validator, "validate", counting)
+    monkeypatch.setattr(health, "_tail_check", None)
+
+    created = client.post(
+        "/api/v1/events/create", json={"event_type": "health", "payload": {}}
+    ).json()["event"]
+
+    for _ in range(3):
+        body = client.get("/api/v1/health/").json()
+        assert body["status"] == "ok"
+    assert calls == [created["event_id"]]
+
+    metrics = body["metrics"]
+    assert metrics["chain_height"] >= 1
+    assert metrics["last_append_latency_ms"] is not None
+    assert metrics["writer_queue_depth"] == 0
+
+    client.post("/api/v1/events/create", json={"event_type": "health", "payload": {}})
+    client.get("/api/v1/health/")
+    assert len(calls) == 2
+
+
+@pytest.mark.integration
+def test_health_reports_full_verify_age(client):
+    client.get("/api/v1/events/verify", params={"full": True})
+    metrics = client.get("/api/v1/health/").json()["metrics"]
+    assert metrics["last_full_verify_age_s"] is not None
+    assert metrics["last_verify_age_s"] <= metrics["last_full_verify_age_s"] + 1
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.offload import crypto_executor
+from app.engine.ingest.pipeline import EventRejected, IngestPipeline
+from app.engine.state.chain_store import ChainStore
+from app.engine.validation.validator import EventValidator
+
+
+class _RejectBad(EventValidator):
+    def validate(self, event, canonical=None):
+        ok, result = super().validate(event, canonical)
+        if event["event_type"] == "bad":
+            result["errors"].append("policy:bad")
+            return False, result
+        return ok, result
+
+
+def _pipeline(tmp_path, **kwargs):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    return store, IngestPipeline(store=store, validator=_RejectBad(), **kwargs)
+
+
+@pytest.mark.unit
+def test_concurrent_submits_are_group_committed(tmp_path):
+    store, pipeline = _pipeline(tmp_path, max_batch_size=64, max_linger_ms=20)
+
+    async def run():
+        events = await asyncio.gather(
+            *(pipeline.submit("ingest", {"n": n}) for n in range(50))
+        )
+        await pipeline.stop()
+        return events
+
+    events = asyncio.run(run())
+
+    assert len(store) == 50
+    assert pipeline.events_committed == 50
+    assert pipeline.batches_committed < 50
+
+    chain = list(store.iter_events())
+    assert [e["event_id"] for e in chain] == [e["event_id"] for e in events]
+    assert chain[0]["prev_hash"] == ""
+    for prev, event in zip(chain, chain[1:]):
+        assert event["prev_hash"] == prev["hash"]
+
+    validator = EventValidator()
+    assert all(ok for ok, _ in validator.validate_many(chain))
+
+
+@pytest.mark.unit
+def test_rejected_event_is_not_written(tmp_path):
+    store, pipeline = _pipeline(tmp_path, max_linger_ms=20)
+
+    async def run():
+        results = await asyncio.gather(
+            pipeline.submit("good", {"n": 1}),
+            pipeline.submit("bad", {"n": 2}),
+            pipeline.submit("good", {"n": 3}),
+            return_exceptions=True,
+        )
+        await pipeline.stop()
+        return results
+
+    first, rejected, third = asyncio.run(run())
+
+    assert isinstance(rejected, EventRejected)
+    assert "policy:bad" in rejected.errors
+    assert len(store) == 2
+    assert third["prev_hash"] == first["hash"]
+    assert store.head.last_hash == third["hash"]
+
+
+@pytest.mark.unit
+def test_pipeline_follows_the_running_loop(tmp_path):
+    store, pipeline = _pipeline(tmp_path, max_linger_ms=0)
+
+    # each asyncio.run() is a fresh loop, like one TestClient request
+    for n in range(3):
+        asyncio.run(pipeline.submit("ingest", {"n": n}))
+
+    assert len(store) == 3
+    assert pipeline.queue_depth() == 0
+
+
+@pytest.mark.unit
+def test_submit_many_atomic_writes_nothing_on_rejection(tmp_path):
+    store, pipeline = _pipeline(tmp_path)
+    items = [("good", {"n": 1}), ("bad", {"n": 2}), ("good", {"n": 3})]
+
+    outcomes = asyncio.run(pipeline.submit_many(items, atomic=True))
+    assert all(isinstance(o, EventRejected) for o in outcomes)
+    assert outcomes[0].errors == ["batch_aborted"]
+    assert "policy:bad" in outcomes[1].errors
+    assert len(store) == 0
+
+    outcomes = asyncio.run(pipeline.submit_many(items))
+    assert isinstance(outcomes[1], EventRejected)
+    assert len(store) == 2
+    assert outcomes[2]["prev_hash"] == outcomes[0]["hash"]
+
+
+@pytest.mark.unit
+def test_indexed_results_carry_chain_indexes(tmp_path):
+    store, pipeline = _pipeline(tmp_path, max_linger_ms=50)
+    items = [("good", {"n": 1}), ("bad", {"n": 2}), ("good", {"n": 3})]
+
+    async def run():
+        results = await asyncio.gather(
+            pipeline.submit("good", {"n": 0}, indexed=True),
+            pipeline.submit_many(items, indexed=True),
+        )
+        await pipeline.stop()
+        return results
+
+    (index, event), indexed = asyncio.run(run())
+    assert store.get(index) == event
+    assert indexed[1][0] is None and isinstance(indexed[1][1], EventRejected)
+    for chain_index, outcome in (indexed[0], indexed[2]):
+        assert store.get(chain_index) == outcome
+    assert sorted([index, indexed[0][0], indexed[2][0]]) == [0, 1, 2]
+
+
+@pytest.mark.unit
+def test_commits_do_not_wait_for_the_crypto_pool(tmp_path):
+    store, pipeline = _pipeline(tmp_path, max_linger_ms=0)
+    crypto = crypto_executor()
+    release = threading.Event()
+
+    async def run():
+        busy = [
+            asyncio.create_task(crypto.run(release.wait, 10))
+            for _ in range(crypto.workers + 1)
+        ]
+        try:
+            return await asyncio.wait_for(pipeline.submit("ingest", {"n": 1}), 5)
+        finally:
+            release.set()
+            await asyncio.gather(*busy)
+            await pipeline.stop()
+
+    event = asyncio.run(run())
+    assert store.get(0)["event_id"] == event["event_id"]
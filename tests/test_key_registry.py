@@ -0,0 +1,37 @@
+import pytest
+from nacl.signing import SigningKey
+
+from app.core import key_registry
+from app.engine.validation.signature_validation import verify_ed25519
+
+
+@pytest.mark.unit
+def test_verify_keys_are_cached():
+    signing_key = SigningKey.generate()
+    pubkey_hex = signing_key.verify_key.encode().hex()
+    key_registry.get_verify_key.cache_clear()
+
+    msg = b"truetrace"
+    sig = signing_key.sign(msg).signature.hex()
+
+    for _ in range(5):
+        assert verify_ed25519(sig, msg, pubkey_hex) is True
+
+    stats = key_registry.key_cache_stats()
+    assert stats["verify_key_misses"] == 1
+    assert stats["verify_key_hits"] == 4
+    assert stats["verify_key_cached"] == 1
+
+
+@pytest.mark.unit
+def test_malformed_pubkey_is_not_cached():
+    key_registry.get_verify_key.cache_clear()
+    assert verify_ed25519("00" * 64, b"x", "not-hex") is False
+    assert key_registry.key_cache_stats()["verify_key_cached"] == 0
+
+
+@pytest.mark.unit
+def test_signing_key_loaded_once():
+    first = key_registry.get_signing_key()
+    assert key_registry.get_signing_key() is first
+    assert key_registry.key_cache_stats()["signing_key_loaded"] is True
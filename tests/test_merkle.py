@@ -0,0 +1,194 @@
+import threading
+import time
+
+import pytest
+
+from app.engine.anchor.merkle import (
+    EMPTY_ROOT,
+    MerkleTree,
+    leaf_hash,
+    node_hash,
+    verify_consistency,
+    verify_inclusion,
+)
+from app.engine.state.chain_store import ChainStore
+
+
+def _mth(leaves):
+    """Reference RFC 6962 Merkle tree hash."""
+    n = len(leaves)
+    if n == 0:
+        return EMPTY_ROOT
+    if n == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < n:
+        k *= 2
+    return node_hash(_mth(leaves[:k]), _mth(leaves[k:]))
+
+
+def _hashes(n):
+    return [f"{i:064x}" for i in range(n)]
+
+
+@pytest.mark.unit
+def test_roots_match_reference(tmp_path):
+    tree = MerkleTree(tmp_path / "merkle")
+    assert tree.root() == EMPTY_ROOT
+
+    hashes = _hashes(40)
+    leaves = [leaf_hash(h) for h in hashes]
+    for n, h in enumerate(hashes, 1):
+        tree.append(h)
+        assert tree.root() == _mth(leaves[:n])
+
+    for size in range(41):
+        assert tree.root(size) == _mth(leaves[:size])
+
+
+@pytest.mark.unit
+def test_inclusion_proofs_verify(tmp_path):
+    tree = MerkleTree(tmp_path / "merkle")
+    hashes = _hashes(21)
+    for h in hashes:
+        tree.append(h)
+
+    for size in (1, 2, 7, 8, 13, 21):
+        root = tree.root(size)
+        for index in range(size):
+            proof = tree.inclusion_proof(index, size)
+            leaf = leaf_hash(hashes[index])
+            assert verify_inclusion(leaf, index, size, proof, root)
+            assert not verify_inclusion(leaf_hash("x"), index, size, proof, root)
+            if size > 1:
+                assert not verify_inclusion(leaf, (index + 1) % size, size, proof, root)
+
+
+@pytest.mark.unit
+def test_consistency_proofs_verify(tmp_path):
+    tree = MerkleTree(tmp_path / "merkle")
+    for h in _hashes(17):
+        tree.append(h)
+
+    for second in range(1, 18):
+        for first in range(0, second + 1):
+            proof = tree.consistency_proof(first, second)
+            r1, r2 = tree.root(first), tree.root(second)
+            assert verify_consistency(first, second, r1, r2, proof), (first, second)
+            if 0 < first < second:
+                assert not verify_consistency(first, second, r2, r2, proof)
+
+
+@pytest.mark.unit
+def test_tree_reopens_and_repairs(tmp_path):
+    tree = MerkleTree(tmp_path / "merkle")
+    for h in _hashes(11):
+        tree.append(h)
+    root = tree.root()
+    tree.close()
+
+    # torn write: half a leaf on level 0, upper level missing entirely
+    with (tmp_path / "merkle" / "level_00.bin").open("ab") as f:
+        f.write(b"\x00" * 10)
+    (tmp_path / "merkle" / "level_01.bin").unlink()
+
+    reopened = MerkleTree(tmp_path / "merkle")
+    assert reopened.size == 11
+    assert reopened.root() == root
+    reopened.append(f"{11:064x}")
+    assert reopened.root() == _mth([leaf_hash(h) for h in _hashes(12)])
+
+
+@pytest.mark.unit
+def test_tree_follows_store(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    tree = MerkleTree(tmp_path / "merkle")
+    store.add_listener(tree.on_append)
+
+    def event(i):
+        return {"event_id": f"evt-{i}", "payload": {}, "hash": f"{i:064x}"}
+
+    store.append_many(event(i) for i in range(5))
+    store.append(event(5))
+    assert tree.size == 6
+    assert tree.root() == _mth([leaf_hash(h) for h in _hashes(6)])
+
+    # chain rewritten behind the tree's back: catch_up rebuilds
+    store.replace(event(i + 100) for i in range(3))
+    tree.catch_up(store)
+    assert tree.size == 3
+    assert tree.root() == _mth([leaf_hash(f"{i + 100:064x}") for i in range(3)])
+
+
+@pytest.mark.unit
+def test_catch_up_does_not_deadlock_with_a_commit(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(
+        {"event_id": f"evt-{i}", "payload": {}, "hash": f"{i:064x}"} for i in range(4)
+    )
+    tree = MerkleTree(tmp_path / "merkle")  # behind: catch_up reads the store
+    store.add_listener(tree.on_append)
+    holding, go = threading.Event(), threading.Event()
+
+    def writer():
+        with store.lock:
+            holding.set()
+            go.wait()
+            time.sleep(0.2)  # let catch_up reach the store
+            store.append({"event_id": "evt-4", "payload": {}, "hash": f"{4:064x}"})
+
+    threads = [
+        threading.Thread(target=writer, daemon=True),
+        threading.Thread(target=tree.catch_up, args=(store,), daemon=True),
+    ]
+    threads[0].start()
+    holding.wait()
+    threads[1].start()
+    go.set()
+    for t in threads:
+        t.join(5)
+    assert not any(t.is_alive() for t in threads)
+
+    tree.catch_up(store)
+    assert tree.size == 5
+    assert tree.root() == _mth([leaf_hash(h) for h in _hashes(5)])
+
+
+@pytest.mark.integration
+def test_proof_endpoints(client):
+    created = client.post(
+        "/api/v1/events/create", json={"event_type": "merkle", "payload": {"n": 1}}
+    ).json()["event"]
+    client.post(
+        "/api/v1/events/create", json={"event_type": "merkle", "payload": {"n": 2}}
+    )
+
+    resp = client.get(f"/api/v1/events/{created['event_id']}/proof")
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["leaf_hash"] == leaf_hash(created["hash"]).hex()
+    assert verify_inclusion(
+        bytes.fromhex(body["leaf_hash"]),
+        body["index"],
+        body["tree_size"],
+        [bytes.fromhex(p) for p in body["proof"]],
+        bytes.fromhex(body["root"]),
+    )
+    root = client.get("/api/v1/events/merkle/root").json()
+    assert root == {"tree_size": body["tree_size"], "root": body["root"]}
+
+    first = body["index"] + 1
+    resp = client.get("/api/v1/events/merkle/consistency", params={"first": first})
+    assert resp.status_code == 200, resp.text
+    c = resp.json()
+    assert verify_consistency(
+        c["first"],
+        c["second"],
+        bytes.fromhex(c["first_root"]),
+        bytes.fromhex(c["second_root"]),
+        [bytes.fromhex(p) for p in c["proof"]],
+    )
+
+    assert client.get("/api/v1/events/evt-missing/proof").status_code == 404
+    too_big = {"size": body["tree_size"] + 5}
+    assert client.get("/api/v1/events/merkle/root", params=too_big).status_code == 400
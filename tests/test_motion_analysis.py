@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from app.engine.visual import motion_analysis
+from app.engine.visual.motion_analysis import (
+    benchmark,
+    compute_dense_optical_flow,
+    motion_signature_from_frames,
+    summarize_flow_magnitude,
+    synthetic_benchmark_set,
+)
+
+
+@pytest.fixture(scope="module")
+def clips():
+    return synthetic_benchmark_set(shape=(60, 80), frames=4)
+
+
+@pytest.mark.unit
+def test_reference_mode_matches_pairwise_tvl1(clips):
+    frames = clips["pan_1px"]
+    expected = [
+        summarize_flow_magnitude(compute_dense_optical_flow(a, b))
+        for a, b in zip(frames, frames[1:])
+    ]
+    sig = motion_signature_from_frames(frames, mode="reference")
+    assert sig["mean_magnitude"] == float(np.mean(expected))
+    assert sig["peak"] == float(np.max(expected))
+
+
+@pytest.mark.unit
+def test_fast_mode_reports_full_resolution_pixels_per_frame(clips):
+    frames = clips["pan_4px"]
+    reference = motion_signature_from_frames(frames, mode="reference")
+    fast = motion_signature_from_frames(frames, mode="fast", max_side=40)
+    strided = motion_signature_from_frames(clips["pan_1px"], mode="fast", stride=3)
+    # 4px horizontal + 1.5px vertical per frame
+    assert reference["mean_magnitude"] == pytest.approx(4.27, rel=0.05)
+    assert fast["mean_magnitude"] == pytest.approx(4.27, rel=0.1)
+    # one pair 3 frames apart, reported per frame
+    assert strided["mean_magnitude"] == pytest.approx(1.0, rel=0.05)
+
+
+@pytest.mark.unit
+def test_modes_are_validated(clips):
+    with pytest.raises(ValueError):
+        motion_signature_from_frames(clips["static"], mode="quick")
+    assert motion_signature_from_frames(clips["static"][:1], mode="fast") == {
+        "mean_magnitude": 0.0,
+        "std_magnitude": 0.0,
+        "peak": 0.0,
+    }
+
+
+@pytest.mark.unit
+def test_benchmark_reports_delta_against_reference(clips):
+    report = benchmark({"pan": clips["pan_1px"]}, max_side=40)
+    entry = report["pan"]
+    assert set(entry) >= {"reference", "fast", "delta", "relative_delta", "speedup"}
+    delta = entry["fast"]["mean_magnitude"] - entry["reference"]["mean_magnitude"]
+    assert entry["delta"]["mean_magnitude"] == delta
+    assert abs(entry["relative_delta"]["mean_magnitude"]) < 0.1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("mode", ["reference", "fast"])
+def test_process_pool_matches_serial_path(clips, monkeypatch, mode):
+    from app.core import config
+
+    # 2 workers x 1 pair per block: several blocks, carried-over frames
+    monkeypatch.setattr(config, "MOTION_PAIRS_PER_WORKER", 1)
+    monkeypatch.setattr(config, "MOTION_MIN_PARALLEL_PAIRS", 2)
+    frames = clips["zoom"] + clips["pan_1px"][::-1]
+    serial = motion_signature_from_frames(frames, mode=mode, workers=1)
+    parallel = motion_signature_from_frames(frames, mode=mode, workers=2)
+    assert parallel == serial
+
+
+@pytest.mark.unit
+def test_pool_is_kept_between_calls(clips, monkeypatch):
+    from app.core import config
+
+    monkeypatch.setattr(config, "MOTION_MIN_PARALLEL_PAIRS", 2)
+    frames = clips["pan_1px"]
+    first = motion_signature_from_frames(frames, mode="fast", workers=2)
+    pool = motion_analysis._pools[2]
+    assert motion_signature_from_frames(frames, mode="fast", workers=2) == first
+    assert motion_analysis._pools[2] is pool
+    motion_analysis.shutdown_pools()
+    assert not motion_analysis._pools
+
+
+@pytest.mark.unit
+def test_short_clips_and_benchmark_stay_serial(clips, monkeypatch):
+    def no_pool(*args):
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(motion_analysis, "_parallel_magnitudes", no_pool)
+    monkeypatch.setattr(motion_analysis.config, "MOTION_MIN_PARALLEL_PAIRS", 8)
+    # 3 pairs
+    motion_signature_from_frames(clips["pan_1px"], mode="fast", workers=4)
+    benchmark({"pan": clips["pan_1px"]}, max_side=40)
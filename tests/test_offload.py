@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.core.offload import OffloadExecutor, crypto_executor
+from app.engine.diagnostics import analysis
+from app.main import app
+
+
+@pytest.mark.unit
+def test_queue_depth_counts_waiting_calls():
+    executor = OffloadExecutor("test", workers=1)
+    release = threading.Event()
+
+    async def run():
+        tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+        while executor.stats()["running"] < 1:
+            await asyncio.sleep(0.01)
+        depth = executor.queue_depth()
+        release.set()
+        await asyncio.gather(*tasks)
+        return depth
+
+    assert asyncio.run(run()) == 2
+    assert executor.stats() == {"workers": 1, "queued": 0, "running": 0, "completed": 3}
+    executor.shutdown()
+
+
+@pytest.mark.unit
+def test_cancelled_waiting_call_leaves_the_queue():
+    executor = OffloadExecutor("test", workers=1)
+    release = threading.Event()
+
+    async def run():
+        busy = asyncio.create_task(executor.run(release.wait))
+        waiting = asyncio.create_task(executor.run(time.sleep, 0))
+        while executor.queue_depth() < 1:
+            await asyncio.sleep(0.01)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        depth = executor.queue_depth()
+        release.set()
+        await busy
+        return depth
+
+    assert asyncio.run(run()) == 0
+    executor.shutdown()
+
+
+class _GatedPool(ThreadPoolExecutor):
+    """A pool whose worker holds each call at a gate before running it."""
+
+    def __init__(self, gate: threading.Event):
+        super().__init__(max_workers=1)
+        self.gate = gate
+
+    def submit(self, fn, *args, **kwargs):
+        def gated():
+            self.gate.wait(10)
+            return fn(*args, **kwargs)
+
+        return super().submit(gated)
+
+
+@pytest.mark.unit
+def test_cancel_as_a_worker_starts_the_call_counts_it_once():
+    executor = OffloadExecutor("test", workers=1)
+    gate, ran = threading.Event(), threading.Event()
+    executor._pool = _GatedPool(gate)
+
+    async def run():
+        task = asyncio.create_task(executor.run(ran.set))
+        # the worker has taken the call (too late to cancel the pool future)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        gate.set()
+        await asyncio.to_thread(executor.shutdown)
+
+    asyncio.run(run())
+    assert executor.stats() == {"workers": 1, "queued": 0, "running": 0, "completed": 0}
+    assert not ran.is_set()  # nobody was waiting for it
+
+
+@pytest.mark.integration
+def test_health_and_latest_answer_while_verify_runs(monkeypatch):
+    release = threading.Event()
+    analyzer = analysis.get_analyzer()
+    analyze = analyzer.analyze
+
+    def slow_analyze(*args, **kwargs):
+        release.wait(10)
+        return analyze(*args, **kwargs)
+
+    monkeypatch.setattr(analyzer, "analyze", slow_analyze)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            verify = asyncio.create_task(c.get("/api/v1/events/verify"))
+            while crypto_executor().stats()["running"] < 1:
+                await asyncio.sleep(0.01)
+
+            health = await asyncio.wait_for(c.get("/api/v1/health/"), 5)
+            latest = await asyncio.wait_for(c.get("/api/v1/events/latest"), 5)
+            assert not verify.done()
+
+            release.set()
+            return health, latest, await verify
+
+    health, latest, verify = asyncio.run(run())
+    assert health.status_code == 200
+    assert "crypto_queue_depth" in health.json()["metrics"]
+    assert latest.status_code == 200
+    assert verify.status_code == 200
@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.mark.integration
+def test_event_by_id_and_range(client):
+    created = client.post(
+        "/api/v1/events/create", json={"event_type": "read", "payload": {"n": 1}}
+    ).json()["event"]
+
+    resp = client.get(f"/api/v1/events/{created['event_id']}")
+    assert resp.status_code == 200
+    assert resp.json()["hash"] == created["hash"]
+
+    assert client.get("/api/v1/events/evt-does-not-exist").status_code == 404
+
+    length = client.get("/api/v1/events/range?start=0&limit=1").json()["chain_length"]
+    page = client.get(f"/api/v1/events/range?start={length - 1}&limit=10").json()
+    assert page["count"] == 1
+    assert page["events"][0]["event_id"] == created["event_id"]
+
+
+@pytest.mark.integration
+def test_cursor_pagination_walks_whole_chain(client):
+    everything = client.get("/api/v1/events/all").json()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/events/all", params=params).json()
+        seen.extend(page["events"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == everything
+    assert client.get("/api/v1/events/all?cursor=-3").status_code == 400
+
+
+@pytest.mark.integration
+def test_fixed_event_routes_not_shadowed(client):
+    assert "results" in client.get("/api/v1/events/verify").json()
+    assert "chain" in client.get("/api/v1/events/chain").json()
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from app.engine.search.search_index import SearchIndex
+from app.engine.state.chain_store import ChainStore
+
+
+def _event(i, event_type, payload):
+    return {
+        "event_id": f"evt-search-{i:03d}",
+        "timestamp": 1700000000 + i * 10,
+        "event_type": event_type,
+        "origin": "system" if i % 2 else "camera",
+        "trace_id": f"trace-{i}",
+        "payload": payload,
+        "prev_hash": "",
+        "hash": f"{i:064x}",
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChainStore(tmp_path / "store", fsync=False)
+    store.append_many(
+        [
+            _event(0, "upload", {"camera": {"id": "cam-7"}, "tags": ["night", "gate"]}),
+            _event(1, "upload", {"camera": {"id": "cam-9"}, "tags": ["day"]}),
+            _event(2, "login", {"user": "alice", "ok": True}),
+            _event(3, "upload", {"camera": {"id": "cam-7"}, "note": "Hello World"}),
+        ]
+    )
+    return store
+
+
+@pytest.mark.unit
+def test_field_text_and_time_filters(store):
+    index = SearchIndex()
+    index.catch_up(store)
+
+    assert index.search(filters={"event_type": "upload"}) == [0, 1, 3]
+    assert index.search(filters={"payload.camera.id": "cam-7"}) == [0, 3]
+    assert index.search(filters={"payload.tags": "gate"}) == [0]
+    assert index.search(filters={"payload.ok": "true"}) == [2]
+    assert index.search(filters={"origin": "camera", "event_type": "upload"}) == [0]
+    assert index.search(text="hello") == [3]
+    assert index.search(text="ALICE login") == [2]
+    assert index.search(text="gat*") == [0]
+    assert index.search(text="cam*") == [0, 1, 2, 3]  # also origin "camera"
+    assert index.search(since=1700000010, until=1700000020) == [1, 2]
+    assert index.search(text="nothing-here") == []
+
+
+@pytest.mark.unit
+def test_follows_appends_and_snapshots(store, tmp_path):
+    index = SearchIndex()
+    index.catch_up(store)
+    store.add_listener(index.on_append)
+
+    store.append(_event(4, "login", {"user": "bob"}))
+    assert index.height == 5
+    assert index.search(text="bob") == [4]
+
+    index.save(tmp_path / "index.json")
+    restored = SearchIndex()
+    assert restored.load(tmp_path / "index.json")
+    assert restored.search(filters={"event_type": "login"}) == [2, 4]
+
+    store.replace([_event(9, "other", {})])
+    restored.catch_up(store)
+    assert restored.height == 1
+    assert restored.search(filters={"event_type": "login"}) == []
+
+
+@pytest.mark.unit
+def test_catch_up_does_not_deadlock_with_a_commit(store):
+    index = SearchIndex()  # behind the store: catch_up has to read it
+    store.add_listener(index.on_append)
+    holding, go = threading.Event(), threading.Event()
+
+    def writer():
+        with store.lock:
+            holding.set()
+            go.wait()
+            time.sleep(0.2)  # let catch_up reach the store
+            store.append(_event(4, "login", {"user": "bob"}))
+
+    threads = [
+        threading.Thread(target=writer, daemon=True),
+        threading.Thread(target=index.catch_up, args=(store,), daemon=True),
+    ]
+    threads[0].start()
+    holding.wait()
+    threads[1].start()
+    go.set()
+    for t in threads:
+        t.join(5)
+    assert not any(t.is_alive() for t in threads)
+
+    index.catch_up(store)
+    assert index.height == 5
+    assert index.search(text="bob") == [4]
+
+
+@pytest.mark.integration
+def test_search_endpoint(client):
+    client.post(
+        "/api/v1/events/create",
+        json={"event_type": "search-test", "payload": {"color": "vermilion"}},
+    )
+    resp = client.get(
+        "/api/v1/events/search",
+        params={"q": "vermilion", "event_type": "search-test", "limit": 1},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] >= 1
+    assert body["results"][0]["payload"]["color"] == "vermilion"
+
+    resp = client.get("/api/v1/events/search", params={"payload": "color=vermilion"})
+    assert resp.json()["total"] == body["total"]
+    assert client.get("/api/v1/events/search?payload=oops").status_code == 400
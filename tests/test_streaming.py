@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+
+def _ndjson(resp):
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+@pytest.mark.integration
+def test_stream_all_matches_all(client):
+    resp = client.get("/api/v1/events/all/stream")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert _ndjson(resp) == client.get("/api/v1/events/all").json()
+
+
+@pytest.mark.integration
+def test_stream_chain_and_verify(client):
+    chain = client.get("/api/v1/events/chain").json()
+    rows = _ndjson(client.get("/api/v1/events/chain/stream"))
+    assert [r["event"] for r in rows] == [c["event"] for c in chain["chain"]]
+    assert [r["valid"] for r in rows] == [c["valid"] for c in chain["chain"]]
+
+    rows = _ndjson(client.get("/api/v1/events/verify/stream?full=true"))
+    assert [r["index"] for r in rows] == list(range(chain["chain_length"]))
@@ -0,0 +1,55 @@
+import pytest
+from nacl.signing import SigningKey
+
+from app.engine.validation.hash_validation import (
+    canonical_event_bytes,
+    compute_event_hash,
+)
+from app.engine.validation.validator import EventValidator
+
+
+def _signed_chain(n):
+    signing_key = SigningKey.generate()
+    pubkey = signing_key.verify_key.encode().hex()
+    chain = []
+    prev_hash = ""
+    for i in range(n):
+        evt = {
+            "event_id": f"evt-many-{i:05d}",
+            "event_version": "1.5",
+            "timestamp": 1650000000 + i,
+            "event_type": "many",
+            "payload": {"i": i},
+            "prev_hash": prev_hash,
+            "origin": "test",
+            "trace_id": f"many-{i}",
+        }
+        evt["signature"] = signing_key.sign(canonical_event_bytes(evt)).signature.hex()
+        evt["pubkey"] = pubkey
+        evt["hash"] = compute_event_hash(evt)
+        chain.append(evt)
+        prev_hash = evt["hash"]
+    return chain
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_validate_many_matches_serial_order(executor):
+    chain = _signed_chain(60)
+    chain[17]["payload"]["i"] = "tampered"
+    chain[42]["signature"] = "00" * 64
+
+    serial = [EventValidator().validate(e) for e in chain]
+    parallel = EventValidator(
+        workers=2, executor=executor, chunk_size=7, serial_threshold=0
+    ).validate_many(chain)
+
+    assert parallel == serial
+    assert [i for i, (ok, _) in enumerate(parallel) if not ok] == [17, 42]
+
+
+@pytest.mark.unit
+def test_validate_many_small_chain_runs_serially():
+    chain = _signed_chain(3)
+    validator = EventValidator(workers=8, serial_threshold=100)
+    assert all(ok for ok, _ in validator.validate_many(iter(chain)))
@@ -1,5 +1,3 @@
-import json
-import os
 import sys
 from pathlib import Path
 
@@ -12,8 +10,9 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 # Now safe to import app modules
-from app.core.paths import CHAIN_FILE
-from app.engine.state.event_chain import get_all_events
+from app.core.files import write_json
+from app.core.paths import CHAIN_FILE, STORE_DIR
+from app.engine.state.event_chain import get_all_events, save_chain
 from app.engine.validation.hash_validation import (
     canonical_event_bytes,
     compute_event_hash,
@@ -89,7 +88,7 @@ def resign_chain():
     backup_path = CHAIN_FILE.with_suffix(".json.bak")
 
     if not backup_path.exists():
-        os.rename(CHAIN_FILE, backup_path)
+        write_json(backup_path, events)
         print(f"\nBackup created: {backup_path}")
     else:
         print(f"\nBackup already exists at: {backup_path}")
@@ -97,11 +96,10 @@ def resign_chain():
     # ---------------------------------------------------------
     # Write updated chain
     # ---------------------------------------------------------
-    with open(CHAIN_FILE, "w") as f:
-        json.dump(new_events, f, indent=2)
+    save_chain(new_events)
 
     print("\n=== Re-Signing Complete ===")
-    print(f"Updated chain saved to: {CHAIN_FILE}")
+    print(f"Updated chain saved to: {STORE_DIR}")
     print("Backup preserved.\n")
 
 
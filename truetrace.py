@@ -1,4 +1,23 @@
+import argparse
+import sys
+
+from app.engine.diagnostics.audit import add_arguments, run_audit_cli
 from app.engine.diagnostics.cli import run_cli_diagnostics
 
 if __name__ == "__main__":
-    run_cli_diagnostics()
+    parser = argparse.ArgumentParser(description="TrueTrace local diagnostics")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore verification checkpoints and audit from genesis",
+    )
+    commands = parser.add_subparsers(dest="command")
+    add_arguments(
+        commands.add_parser(
+            "audit", help="parallel, resumable audit with a JSON/NDJSON report"
+        )
+    )
+    args = parser.parse_args()
+    if args.command == "audit":
+        sys.exit(run_audit_cli(args))
+    run_cli_diagnostics(full=args.full)